@@ -0,0 +1,271 @@
+"""
+관리용 CLI
+    python -m app.cli db-migrate
+    python -m app.cli geocache-warm places.txt
+    python -m app.cli geocache-stats
+    python -m app.cli gazetteer-build cities500.txt gazetteer.idx
+    python -m app.cli search-reindex
+    python -m app.cli facts-backfill
+    python -m app.cli charts-import births.csv --workers 4
+    python -m app.cli charts-recompute --workers 4
+    python -m app.cli ephemeris-table-build ephemeris.tbl
+    python -m app.cli charts-compact --vacuum
+    python -m app.cli static-build
+    python -m app.cli charts-export archive.parquet --sun-sign Leo
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def cmd_db_migrate(args):
+    """테이블·컬럼·인덱스 생성 + 전문 검색 인덱스 준비 (앱 기동 전 1회)"""
+    from app.database import ensure_schema
+    from app.services.search import ensure_search_index
+
+    ensure_schema()
+    ensure_search_index()
+    print(json.dumps({"migrated": True}))
+
+
+def cmd_geocache_warm(args):
+    """장소 목록 파일(한 줄에 하나)로 지오코딩 캐시 워밍업"""
+    from app.utils.geocoding import warm_cache
+
+    with open(args.file, encoding="utf-8") as f:
+        counts = warm_cache(f, delay=args.delay)
+    print(json.dumps(counts, ensure_ascii=False))
+
+
+def cmd_geocache_stats(args):
+    """지오코딩 캐시 통계 출력"""
+    from app.utils.geocache import place_cache
+
+    print(json.dumps(place_cache.stats(), ensure_ascii=False, indent=2))
+
+
+def cmd_gazetteer_build(args):
+    """GeoNames TSV 로 오프라인 지명 인덱스 생성"""
+    from app.utils.gazetteer import build_index
+
+    with open(args.tsv, encoding="utf-8") as f:
+        info = build_index(f, args.out, include_alternates=not args.no_alternates)
+    print(json.dumps(info, ensure_ascii=False))
+
+
+def cmd_search_reindex(args):
+    """검색 요약 컬럼 백필 + 전문 검색 인덱스 재구성"""
+    from app.database import SessionLocal, ensure_schema
+    from app.services.search import backfill_summaries, ensure_search_index, rebuild_search_index
+
+    ensure_schema()
+    ensure_search_index()
+    db = SessionLocal()
+    try:
+        updated = backfill_summaries(db)
+    finally:
+        db.close()
+    rebuild_search_index()
+    print(json.dumps({"backfilled": updated}))
+
+
+def cmd_facts_backfill(args):
+    """chart_facts 가 없는 기존 레코드 채우기"""
+    from app.database import SessionLocal, ensure_schema
+    from app.services.facts import backfill_facts
+
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        done = backfill_facts(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps({"backfilled": done}))
+
+
+def cmd_charts_import(args):
+    """CSV/JSONL 출생 데이터 대량 적재 (진행 파일로 재개)"""
+    from app.database import SessionLocal, ensure_schema
+    from app.services.bulk import import_records
+    from app.services.search import ensure_search_index
+
+    ensure_schema()
+    ensure_search_index()
+    db = SessionLocal()
+    try:
+        stats = import_records(db, args.file, workers=args.workers, chunk_size=args.chunk_size,
+                               progress_path=args.progress, restart=args.restart)
+    finally:
+        db.close()
+    print(json.dumps(stats.as_dict(), ensure_ascii=False, indent=2))
+
+
+def cmd_charts_recompute(args):
+    """계산 버전이 다른 기존 레코드 재계산"""
+    from app.database import SessionLocal, ensure_schema
+    from app.services.bulk import recompute_records
+
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        stats = recompute_records(db, workers=args.workers, chunk_size=args.chunk_size, recompute_all=args.all)
+    finally:
+        db.close()
+    print(json.dumps(stats.as_dict(), ensure_ascii=False, indent=2))
+
+
+def cmd_charts_compact(args):
+    """이중 인코딩 JSON 레코드를 압축 저장 형식으로 변환"""
+    from sqlalchemy import text
+
+    from app.database import SessionLocal, engine, ensure_schema
+    from app.services.chart_codec import compact_records
+
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        counts = compact_records(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    if args.vacuum and engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+    print(json.dumps(counts))
+
+
+def cmd_ephemeris_table_build(args):
+    """7행성 + 평균 노드 사전 계산 천문력 표 생성"""
+    from app.services.ephemeris_table import build_table
+
+    info = build_table(args.out, start_year=args.start, end_year=args.end, step=args.step)
+    print(json.dumps(info, ensure_ascii=False))
+
+
+def cmd_charts_export(args):
+    """보관소 내보내기 (NDJSON, CSV, Parquet, Arrow, 확장자로 형식 추정)"""
+    import time
+
+    from app.database import SessionLocal
+    from app.services.export import EXPORT_FORMATS, ExportError, export_stream
+    from app.services.search import SearchFilters
+
+    fmt = args.format
+    if fmt is None:
+        ext = os.path.splitext(args.out)[1].lstrip(".").lower()
+        fmt = next((name for name, (_, e) in EXPORT_FORMATS.items() if e == ext or name == ext), "ndjson")
+    filters = SearchFilters(q=args.q, sun_sign=args.sun_sign, moon_sign=args.moon_sign, asc_sign=args.asc_sign,
+                            sect=args.sect, domicile=args.domicile, date_from=args.date_from, date_to=args.date_to)
+
+    started = time.perf_counter()
+    written = 0
+    db = SessionLocal()
+    try:
+        try:
+            chunks = export_stream(db, fmt, filters, batch_size=args.batch_size)
+        except ExportError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+    print(json.dumps({"format": fmt, "bytes": written, "seconds": round(time.perf_counter() - started, 2)}),
+          file=sys.stderr)
+
+
+def cmd_static_build(args):
+    """정적 파일 사전 압축본(.gz / .br) 생성"""
+    from app.utils.static_assets import build_precompressed
+
+    print(json.dumps(build_precompressed(args.dir)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Ephe 관리 명령")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("db-migrate", help="DB 스키마 생성/보정 (EPHE_AUTO_SCHEMA=0 으로 기동할 때)")
+    p.set_defaults(func=cmd_db_migrate)
+
+    p = sub.add_parser("geocache-warm", help="장소 목록으로 지오코딩 캐시 채우기")
+    p.add_argument("file", help="장소 이름 목록 파일 (한 줄에 하나)")
+    p.add_argument("--delay", type=float, default=1.0, help="네트워크 조회 간 대기(초)")
+    p.set_defaults(func=cmd_geocache_warm)
+
+    p = sub.add_parser("geocache-stats", help="지오코딩 캐시 통계")
+    p.set_defaults(func=cmd_geocache_stats)
+
+    p = sub.add_parser("gazetteer-build", help="GeoNames TSV → 오프라인 지명 인덱스")
+    p.add_argument("tsv", help="GeoNames 덤프 (예: cities500.txt)")
+    p.add_argument("out", nargs="?", default="gazetteer.idx", help="인덱스 파일 경로")
+    p.add_argument("--no-alternates", action="store_true", help="다국어 별칭 제외 (인덱스 축소)")
+    p.set_defaults(func=cmd_gazetteer_build)
+
+    p = sub.add_parser("search-reindex", help="검색 요약 컬럼 백필 및 전문 검색 인덱스 재구성")
+    p.set_defaults(func=cmd_search_reindex)
+
+    p = sub.add_parser("facts-backfill", help="천체별 정규화 테이블(chart_facts) 백필")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.set_defaults(func=cmd_facts_backfill)
+
+    p = sub.add_parser("charts-import", help="CSV/JSONL 출생 데이터 대량 적재")
+    p.add_argument("file", help="CSV(헤더 포함) 또는 .jsonl 파일")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="계산 프로세스 수")
+    p.add_argument("--chunk-size", type=int, default=200, help="청크(트랜잭션) 당 행 수")
+    p.add_argument("--progress", help="진행 파일 경로 (기본: <file>.progress)")
+    p.add_argument("--restart", action="store_true", help="진행 파일 무시하고 처음부터")
+    p.set_defaults(func=cmd_charts_import)
+
+    p = sub.add_parser("charts-recompute", help="계산 로직 변경 후 기존 레코드 재계산")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="계산 프로세스 수")
+    p.add_argument("--chunk-size", type=int, default=200, help="청크(트랜잭션) 당 행 수")
+    p.add_argument("--all", action="store_true", help="현재 버전 레코드도 모두 재계산")
+    p.set_defaults(func=cmd_charts_recompute)
+
+    p = sub.add_parser("charts-compact", help="기존 레코드를 압축 저장 형식으로 변환")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--vacuum", action="store_true", help="변환 후 SQLite 파일 크기 회수 (VACUUM)")
+    p.set_defaults(func=cmd_charts_compact)
+
+    p = sub.add_parser("ephemeris-table-build", help="사전 계산 천문력 표 생성 (트랜짓·연구용 배치)")
+    p.add_argument("out", nargs="?", default="ephemeris.tbl", help="표 파일 경로")
+    p.add_argument("--start", type=int, default=1800, help="시작 연도 (1월 1일)")
+    p.add_argument("--end", type=int, default=2200, help="끝 연도 (1월 1일)")
+    p.add_argument("--step", type=float, default=1.0, help="표본 간격(일)")
+    p.set_defaults(func=cmd_ephemeris_table_build)
+
+    p = sub.add_parser("charts-export", help="보관소 내보내기 (NDJSON, CSV, Parquet, Arrow)")
+    p.add_argument("out", help="출력 파일 경로 (- 이면 표준 출력)")
+    p.add_argument("--format", choices=["ndjson", "csv", "parquet", "arrow"], help="형식 (기본: 확장자로 추정)")
+    p.add_argument("--batch-size", type=int, default=1000, help="한 번에 읽을 레코드 수")
+    p.add_argument("--q", help="이름/장소 검색어")
+    p.add_argument("--sun-sign")
+    p.add_argument("--moon-sign")
+    p.add_argument("--asc-sign")
+    p.add_argument("--sect", choices=["day", "night"])
+    p.add_argument("--domicile", help="도미사일에 있는 행성")
+    p.add_argument("--from", dest="date_from", help="출생일 시작 (YYYY-MM-DD)")
+    p.add_argument("--to", dest="date_to", help="출생일 끝 (YYYY-MM-DD)")
+    p.set_defaults(func=cmd_charts_export)
+
+    p = sub.add_parser("static-build", help="정적 파일 사전 압축본(.gz, brotli 설치 시 .br) 생성")
+    p.add_argument("--dir", default="public", help="정적 파일 디렉터리")
+    p.set_defaults(func=cmd_static_build)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
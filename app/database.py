@@ -1,6 +1,6 @@
 """데이터베이스 설정 (SQLite 또는 PostgreSQL)"""
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -10,21 +10,83 @@ DATABASE_URL = os.getenv(
     "sqlite:///./ephe.db"  # 개발용 SQLite
 )
 
-# SQLite 연결 설정
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# 커넥션 풀 설정 (recycle/pre-ping 은 PostgreSQL 등 서버 DB 만)
+DB_POOL_SIZE = int(os.getenv("EPHE_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("EPHE_DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("EPHE_DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("EPHE_DB_POOL_RECYCLE", "1800"))
+
+# SQLite 설정 (WAL: 읽기가 쓰기를 기다리지 않음, NORMAL: 커밋마다 fsync 하지 않음 - WAL 에서는 안전)
+SQLITE_JOURNAL_MODE = os.getenv("EPHE_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("EPHE_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("EPHE_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:")
+
+if IS_SQLITE:
+    # 메모리 DB 는 SQLAlchemy 가 스레드별 단일 커넥션 풀을 쓰므로 풀 크기 설정 없음
+    pool_args = {} if IS_MEMORY else {
+        "pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT
+    }
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **pool_args
+    )
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        if not IS_MEMORY:
+            cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
 def get_db():
-    """FastAPI 의존성 주입용 DB 세션"""
+    """
+    FastAPI 의존성 주입용 DB 세션
+    async 라우터에서는 세션 작업을 run_db 로 DB 스레드 풀에서 실행함 (이벤트 루프 블로킹 방지)
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def ensure_schema():
+    """
+    테이블 생성 + 기존 테이블에 없는 컬럼/인덱스 추가 (간이 마이그레이션)
+    새 컬럼은 nullable 로 추가됨
+    """
+    from app import models  # noqa: F401 (모델 등록)
+
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    ddl = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {ddl}"))
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(bind=conn)
@@ -1,13 +1,16 @@
 """
 Dependencies - FastAPI 의존성 주입
 """
+from fastapi import HTTPException, Request
 from fastapi.templating import Jinja2Templates
 from app.database import SessionLocal
 from app.constants import ZODIAC_SIGNS, ZODIAC_SYMBOLS
+from app.utils.static_assets import static_url
 
 # 템플릿 설정
 templates = Jinja2Templates(directory="app/templates")
 templates.env.add_extension("jinja2.ext.do")
+templates.env.globals["static_url"] = static_url
 
 # 템플릿에서 사용할 상수 (하위호환)
 CONFIG_signs = ZODIAC_SIGNS
@@ -21,3 +24,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def require_login(request: Request):
+    """로그인한 세션만 허용 (관리용 엔드포인트)"""
+    if not request.session.get("authenticated"):
+        raise HTTPException(status_code=401, detail="Login required")
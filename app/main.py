@@ -1,18 +1,24 @@
 from fastapi import FastAPI, Request, Form, Response
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import HTMLResponse, RedirectResponse, PlainTextResponse
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.routing import Mount
+from contextlib import asynccontextmanager
 import os
 
-from app.database import engine
-from app import models
-from app.routers import pages, partials, api
+from app.database import ensure_schema
+from app.routers import pages, partials, api, admin
+from app.services.search import ensure_search_index
 from app.dependencies import templates
+from app.utils.concurrency import shutdown_executor
+from app.utils.geocoding import close_async_geolocator
+from app.utils.metrics import ENABLED as METRICS_ENABLED, MetricsMiddleware, authorized, render_metrics
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.static_assets import STATIC_DIR, AssetStaticFiles, StaticShortcutMiddleware
+from app.utils.timezone import TZ_WARM, warm_up
 
-# DB 테이블 생성
-models.Base.metadata.create_all(bind=engine)
+# 시작 시 스키마 보정 여부 (배포 단계에서 python -m app.cli db-migrate 를 실행했다면 0 으로 꺼서 워커 기동 단축)
+AUTO_SCHEMA = os.getenv("EPHE_AUTO_SCHEMA", "1") != "0"
 
 # 비밀번호 설정 (환경변수 또는 기본값)
 AUTH_USERNAME = os.getenv("EPHE_USER", "admin")
@@ -20,40 +26,72 @@ AUTH_PASSWORD = os.getenv("EPHE_PASS", "q1w2e3r4")
 SECRET_KEY = os.getenv("SECRET_KEY", "ephe-secret-key-change-me")
 
 
-class SessionAuthMiddleware(BaseHTTPMiddleware):
-    """세션 기반 인증 미들웨어"""
-    
-    ALLOWED_PATHS = ["/ephe/", "/ephe/login", "/ephe/static"]
-    
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        
-        # 허용된 경로는 통과
-        for allowed in self.ALLOWED_PATHS:
-            if path.startswith(allowed) or path == "/ephe":
-                return await call_next(request)
-        
-        # 세션 확인
-        if request.session.get("authenticated"):
-            return await call_next(request)
-        
+class SessionAuthMiddleware:
+    """
+    세션 기반 인증 미들웨어 (순수 ASGI)
+    공개 경로는 정확히 일치하는 경로 집합과 접두어 튜플로 한 번에 판별함
+    """
+
+    PUBLIC_PATHS = frozenset({"/ephe", "/ephe/", "/ephe/login", "/ephe/metrics"})
+    PUBLIC_PREFIXES = ("/ephe/static/",)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
+        # 공개 경로 또는 로그인한 세션은 통과
+        if path in self.PUBLIC_PATHS or path.startswith(self.PUBLIC_PREFIXES) \
+                or scope["session"].get("authenticated"):
+            await self.app(scope, receive, send)
+            return
+
         # 인증 안 됨 -> 로그인 페이지로
-        return RedirectResponse(url="/ephe/", status_code=303)
+        await RedirectResponse(url="/ephe/", status_code=303)(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # DB 테이블 생성 (누락된 컬럼/인덱스 추가 포함) - import 시점이 아니라 기동 시 1회
+    if AUTO_SCHEMA:
+        ensure_schema()
+        ensure_search_index()
+    # 첫 요청이 타임존 조회기 초기화 비용을 떠안지 않도록 미리 준비
+    if TZ_WARM != "off":
+        warm_up(background=TZ_WARM == "background")
+    yield
+    # 종료 시 공유 자원 정리
+    await close_async_geolocator()
+    shutdown_executor()
 
 
 app = FastAPI(
     title="Ephe",
     description="Advanced Astrology Calculation Service with HTMX Dashboard",
     version="2.0.0",
-    root_path="/ephe"
+    root_path="/ephe",
+    lifespan=lifespan
 )
 
 # 인증 미들웨어 (먼저 추가 = 안쪽에서 실행)
 app.add_middleware(SessionAuthMiddleware)
 
+# 요청 단위 프로파일러 (세션을 봐야 하므로 세션 미들웨어 안쪽, 로그인 + X-Ephe-Profile 헤더일 때만 동작)
+app.add_middleware(ProfilerMiddleware)
+
 # 세션 미들웨어 (나중에 추가 = 바깥쪽에서 먼저 실행되어 세션 설정)
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
+# 정적 파일 (세션 미들웨어 바깥에서 세션·인증 없이 바로 응답, 해시 파일명 + 사전 압축본)
+static_mount = Mount("/static", AssetStaticFiles(directory=STATIC_DIR), name="static")
+app.router.routes.append(static_mount)
+app.add_middleware(StaticShortcutMiddleware, mount=static_mount)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -63,8 +101,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 정적 파일 마운트
-app.mount("/static", StaticFiles(directory="public"), name="static")
+# 요청 지표 (가장 바깥에서 전체 소요 시간 기록, EPHE_METRICS_TOKEN 이 없으면 그대로 통과)
+app.add_middleware(MetricsMiddleware)
 
 
 # 로그인 페이지 (랜딩 페이지 대체)
@@ -96,10 +134,21 @@ async def logout(request: Request):
     return RedirectResponse(url="/ephe/", status_code=303)
 
 
+# Prometheus 지표 (세션 대신 Bearer 토큰으로 보호, 수집이 꺼져 있으면 404)
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if not METRICS_ENABLED:
+        return Response(status_code=404)
+    if not authorized(request.headers.get("authorization", "")):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # 라우터 등록
 app.include_router(pages.router)
 app.include_router(partials.router)
 app.include_router(api.router)
+app.include_router(admin.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,5 +1,6 @@
 """SQLAlchemy 데이터베이스 모델"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Boolean, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -13,18 +14,69 @@ class ChartRecord(Base):
     # 기본 정보
     name = Column(String, index=True, default="Unknown")
     gender = Column(String, default="unknown")
-    birth_date = Column(String(10), nullable=False)  # YYYY-MM-DD
+    birth_date = Column(String(10), nullable=False, index=True)  # YYYY-MM-DD
     birth_time = Column(String(8), nullable=False)   # HH:MM:SS
     place_name = Column(String(200), nullable=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     timezone = Column(String(50), nullable=False)
     
-    # 계산된 차트 데이터 (JSON)
-    chart_data = Column(JSON, nullable=False)
+    # 계산된 차트 데이터
+    # chart_blob: 압축 저장 형식 (chart_codec, 표시 필드는 읽을 때 복원)
+    # chart_data: 이전 형식 JSON (압축 형식 레코드는 JSON null)
+    chart_blob = Column(LargeBinary, nullable=True)
+    chart_data = Column(JSON, nullable=True)
+    
+    # 검색용 차트 요약 (chart_data 에서 추출, 인덱스)
+    sun_sign = Column(String(12), index=True, nullable=True)
+    moon_sign = Column(String(12), index=True, nullable=True)
+    asc_sign = Column(String(12), index=True, nullable=True)
+    is_day = Column(Boolean, index=True, nullable=True)
+    domicile_mask = Column(Integer, nullable=True)  # 도미사일 행성 비트 (DOMICILE_BITS)
+    
+    # 결과 캐시 키 (정규화된 입력 해시) 및 계산 규칙 버전
+    input_hash = Column(String(64), index=True, nullable=True)
+    calc_version = Column(String(16), nullable=True)
     
     # AI 프롬프트
     summary_prompt = Column(Text, nullable=True)
     
     # 메타데이터
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    # 천체별 정규화 데이터 (레코드 삭제 시 함께 삭제)
+    facts = relationship("ChartFact", back_populates="chart", cascade="all, delete-orphan")
+
+
+class ChartFact(Base):
+    """차트 × 천체 단위 정규화 데이터 (분석 쿼리용)"""
+    __tablename__ = "chart_facts"
+
+    id = Column(Integer, primary_key=True)
+    chart_id = Column(Integer, ForeignKey("chart_records.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # 천체 (행성 7개, ASC, MC, Fortuna, Spirit)
+    body = Column(String(16), nullable=False)
+    position = Column(Float, nullable=False)  # 황경 0-360
+    sign = Column(String(12), nullable=False)
+    degree = Column(Float, nullable=False)    # 사인 내 도수 0-30
+    
+    # 하우스
+    wsh = Column(Integer, nullable=True)
+    porphyry = Column(Integer, nullable=True)
+    
+    # 행성 상태 (행성만 해당)
+    dignity = Column(String(12), nullable=True)
+    in_sect = Column(Boolean, nullable=True)
+    sun_relation = Column(String(16), nullable=True)
+    retrograde = Column(Boolean, nullable=True)
+    
+    chart = relationship("ChartRecord", back_populates="facts")
+
+    __table_args__ = (
+        Index("ix_chart_facts_body_sign_wsh", "body", "sign", "wsh"),
+        Index("ix_chart_facts_body_wsh", "body", "wsh"),
+        Index("ix_chart_facts_body_porphyry", "body", "porphyry"),
+        Index("ix_chart_facts_body_dignity", "body", "dignity"),
+        Index("ix_chart_facts_body_sun_relation", "body", "sun_relation"),
+    )
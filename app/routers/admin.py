@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.dependencies import require_login, templates
+from app.utils.profiler import PROFILE_KEEP, list_profiles, profile_path, profile_summary
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_login)])
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+
+@router.get("/profiles")
+async def profiles_page(request: Request):
+    """최근 요청 프로파일 목록"""
+    return templates.TemplateResponse("admin/profiles.html", {
+        "request": request,
+        "profiles": list_profiles(),
+        "keep": PROFILE_KEEP
+    })
+
+
+@router.get("/profiles/{profile_id}")
+def profile_detail(profile_id: str, sort: str = "cumulative"):
+    """pstats 요약 (sort: cumulative | tottime | ncalls)"""
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+    summary = profile_summary(profile_id, sort)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(summary)
+
+
+@router.get("/profiles/{profile_id}/download/{kind}")
+def profile_download(profile_id: str, kind: str):
+    """원본 파일 (pstats: python -m pstats / snakeviz, folded: flamegraph.pl / speedscope)"""
+    path = profile_path(profile_id, f".{kind}") if kind in ("pstats", "folded") else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=f"{profile_id}.{kind}")
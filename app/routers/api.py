@@ -1,10 +1,197 @@
-from fastapi import APIRouter, Query
-from app.utils.geocoding import search_places
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.dependencies import get_db, require_login
+from app.models import ChartRecord
+from app.utils.geocoding import search_places_async
+from app.utils.geocache import place_cache
+from app.utils.timezone import timezone_stats
+from app.services import ephemeris
+from app.services.chart_cache import chart_lru
+from app.services.chart_service import ChartError
+from app.services.export import EXPORT_FORMATS, ExportError, export_stream
+from app.services.search import SearchFilters, search_charts
+from app.services.facts import FactQuery, query_facts
+from app.services.fragment_cache import fragment_cache
+from app.services.rectification import MAX_WINDOW_HOURS, rectify_place
+from app.services.records import load_chart_data
+from app.services.svg_render import HOUSE_SYSTEMS, render_cache, render_key, render_version
+from app.utils.concurrency import run_db
 
 router = APIRouter(prefix="/api/v1", tags=["API"])
 
 @router.get("/search-place")
-def search_place_api(query: str = Query(..., min_length=2)):
+async def search_place_api(query: str = Query(..., min_length=2)):
     """장소 검색 API (Nominatim)"""
-    results = search_places(query)
+    results = await search_places_async(query)
     return {"results": results}
+
+
+@router.get("/charts/search")
+def search_charts_api(filters: SearchFilters = Depends(), db: Session = Depends(get_db)):
+    """보관소 검색 API (이름/장소 전문 검색 + 차트 요소 필터)"""
+    rows = search_charts(db, filters)
+    return {"results": [
+        {"id": r.id, "name": r.name, "birth_date": r.birth_date, "place_name": r.place_name,
+         "created_at": r.created_at.isoformat() if r.created_at else None}
+        for r in rows
+    ]}
+
+
+@router.get("/charts/export", dependencies=[Depends(require_login)])
+async def export_charts_api(
+    format: str = Query("ndjson", pattern="^(" + "|".join(EXPORT_FORMATS) + ")$"),
+    filters: SearchFilters = Depends()
+):
+    """
+    보관소 내보내기 (NDJSON, CSV, Parquet, Arrow, 검색 API 와 같은 필터)
+    청크 단위 전송 - 서버 측 커서로 배치씩 읽어 바로 보내므로 레코드 수와 무관하게 메모리 일정
+    """
+    db = SessionLocal()
+    try:
+        chunks = export_stream(db, format, filters)
+    except ExportError as e:
+        db.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def body():
+        try:
+            while True:
+                chunk = await run_db(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            await run_db(chunks.close)
+            await run_db(db.close)
+
+    media_type, ext = EXPORT_FORMATS[format]
+    filename = f"ephe-export-{date.today():%Y%m%d}.{ext}"
+    return StreamingResponse(body(), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.post("/facts/query")
+def facts_query_api(fact_query: FactQuery, db: Session = Depends(get_db)):
+    """
+    천체 조건 조회 API (chart_facts 인덱스 사용)
+    예) {"conditions": [{"body": "Mars", "sign": "Capricorn", "wsh": 10}]}
+    """
+    count, rows = query_facts(db, fact_query)
+    return {"count": count, "results": [
+        {"id": r.id, "name": r.name, "birth_date": r.birth_date, "place_name": r.place_name}
+        for r in rows
+    ]}
+
+
+@router.get("/charts/{chart_hash}/{version}.svg")
+def chart_svg_api(
+    request: Request,
+    chart_hash: str,
+    version: str,
+    house: str = Query("WSH"),
+    terms: bool = False,
+    decans: bool = False
+):
+    """
+    차트 휠 SVG (서버 렌더, 렌더 캐시 사용)
+    주소가 내용 해시 + 렌더러 버전이므로 immutable 로 캐시하고, ETag 일치 시 304 반환
+    이전 렌더러 버전 주소(배포 전에 받은 페이지)는 현재 렌더 결과를 no-cache 로 응답
+    """
+    if house not in HOUSE_SYSTEMS:
+        raise HTTPException(status_code=400, detail=f"house must be one of {HOUSE_SYSTEMS}")
+    etag = f'"{render_key(chart_hash, house, terms, decans)}"'
+    if version == render_version():
+        cache_control = "private, max-age=31536000, immutable"
+    else:
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    svg = render_cache.get_svg(chart_hash, house, terms, decans)
+    if svg is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    return Response(svg, media_type="image/svg+xml", headers=headers)
+
+
+@router.get("/charts/{chart_id}/transits")
+def chart_transits_api(
+    chart_id: int,
+    start: date,
+    end: date,
+    bodies: Optional[str] = Query(None, description="쉼표 구분 (예: Saturn,Jupiter)"),
+    db: Session = Depends(get_db)
+):
+    """
+    저장된 차트의 트랜짓 애스펙트 (정확/진입/이탈 시각, UTC)
+    NDJSON 으로 한 줄에 한 건씩 정확 시각순 스트리밍 (기간은 end 날짜 0시 UTC 까지)
+    """
+    import swisseph as swe
+    from app.services.transits import iter_transits  # NumPy 를 쓰므로 첫 호출 때 불러옴
+
+    record = db.query(ChartRecord).filter(ChartRecord.id == chart_id).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    chart_data = load_chart_data(record)
+
+    names = [b.strip() for b in bodies.split(",") if b.strip()] if bodies else None
+    try:
+        events = iter_transits(
+            chart_data,
+            swe.julday(start.year, start.month, start.day, 0.0),
+            swe.julday(end.year, end.month, end.day, 0.0),
+            names
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson():
+        # 한 줄씩 보내면 건마다 스레드 전환이 생기므로 여러 줄씩 묶어서 전송
+        lines = []
+        for event in events:
+            lines.append(json.dumps(event, ensure_ascii=False))
+            if len(lines) >= 500:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/rectify")
+async def rectify_api(
+    place_name: str = Query(..., min_length=2),
+    start: datetime = Query(..., description="현지 시각 (예: 1990-05-05T00:00)"),
+    end: datetime = Query(..., description=f"현지 시각, start 부터 최대 {MAX_WINDOW_HOURS}시간")
+):
+    """
+    출생 시각 보정 타임라인
+    구간 안에서 ASC/MC 사인, 행성 홀사인 하우스, 섹트가 바뀌는 순간(현지 시각, UTC)과 바뀐 항목만 반환
+    """
+    try:
+        return await rectify_place(place_name, start, end)
+    except ChartError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache-stats")
+def cache_stats_api():
+    """캐시 히트율 통계 (지오코딩, 타임존, 천문력, 차트 결과, 렌더, 차트 partial)"""
+    return {
+        "geocode": place_cache.stats(),
+        "timezone": timezone_stats(),
+        "ephemeris": ephemeris.cache_stats(),
+        "chart": chart_lru.stats(),
+        "render": render_cache.stats(),
+        "fragments": fragment_cache.stats()
+    }
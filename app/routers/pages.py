@@ -3,8 +3,13 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.dependencies import get_db, templates, CONFIG_signs, signSymbols
-from app.services.chart_service import create_chart, ChartError
-from app.models import ChartRecord
+from app.services.chart_service import ChartError
+from app.services.chart_cache import get_or_create_chart
+from app.services.history import fetch_history_page
+from app.services.svg_render import chart_svg_url
+from app.utils.concurrency import run_blocking, run_db
+from app.utils.metrics import CHART_ERRORS
+from app.utils.timing import stage
 
 router = APIRouter(tags=["Pages"])
 
@@ -35,9 +40,10 @@ async def dashboard(
     """메인 대시보드 (SSR + HTMX)"""
     
     # 1. Load History
-    history_list = db.query(ChartRecord).order_by(ChartRecord.created_at.desc()).all()
+    history_list, next_cursor = await run_db(fetch_history_page, db)
     
     chart_data = None
+    svg_url = None
     error_message = None
     input_data = {
         "name": name or "",
@@ -50,15 +56,18 @@ async def dashboard(
     # 2. SSR Calculation (If params provided)
     if birth_date and birth_time and place_name:
         try:
-            chart_data, _ = await create_chart(
+            chart_data, chart_input, _ = await get_or_create_chart(
+                db,
                 name or "Unknown",
                 birth_date,
                 birth_time,
-                place_name,
-                gender
+                place_name
             )
             chart_data['summary_prompt'] = ""
+            with stage(chart_input.timings, "svg"):
+                svg_url = await run_blocking(chart_svg_url, chart_data)
         except ChartError as e:
+            CHART_ERRORS.inc(e.code)
             error_message = e.message
         except Exception as e:
             error_message = f"차트 계산 중 오류: {str(e)}"
@@ -71,8 +80,10 @@ async def dashboard(
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "chart_data": chart_data,
+        "chart_svg_url": svg_url,
         "input_data": input_data,
         "history_list": history_list,
+        "next_cursor": next_cursor,
         "error_message": error_message,
         "seo_data": seo_data,
         "CONFIG_signs": CONFIG_signs,
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Request, Form, Depends
+from fastapi import APIRouter, Request, Form, Depends, Response
+from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
-import json
+from typing import Optional
 
 from app.dependencies import get_db, templates
-from app.services.chart_service import create_chart, ChartError
+from app.services.chart_service import ChartError
+from app.services.chart_cache import get_or_create_chart, input_hash, calculation_version
+from app.services.fragment_cache import ETAG_COLUMNS, TEMPLATE as FRAGMENT_TEMPLATE, fragment_cache, record_etag
+from app.services.records import build_record, delete_record, find_duplicate, load_chart_data, save_record
+from app.services.history import fetch_history_page
+from app.services.search import SearchFilters, search_charts
+from app.services.svg_render import chart_svg_url
+from app.utils.concurrency import run_blocking, run_db
 from app.models import ChartRecord
+from app.utils.metrics import CHART_ERRORS
+from app.utils.timing import server_timing_header, stage
 
 router = APIRouter(prefix="/partials", tags=["Partials"])
 
@@ -20,44 +30,45 @@ async def htmx_analyze(
 ):
     """차트 분석 (HTMX partial 반환 + 자동 저장)"""
     try:
-        chart_data, chart_input = await create_chart(name, birth_date, birth_time, place_name)
+        # 캐시 우선 조회 (저장된 동일 입력이 있으면 계산 생략)
+        chart_data, chart_input, existing = await get_or_create_chart(db, name, birth_date, birth_time, place_name)
         
+        timings = chart_input.timings
+
         # 중복 체크 (이름, 날짜, 시간, 장소 기반)
-        existing = db.query(ChartRecord).filter(
-            ChartRecord.name == name,
-            ChartRecord.birth_date == chart_input.birth_date,
-            ChartRecord.birth_time == chart_input.birth_time,
-            ChartRecord.place_name == place_name
-        ).first()
+        if existing is None:
+            with stage(timings, "dedupe"):
+                existing = await run_db(
+                    find_duplicate, db, name, chart_input.birth_date, chart_input.birth_time, place_name
+                )
 
         saved = False
         if not existing:
-            record = ChartRecord(
-                name=name,
-                birth_date=chart_input.birth_date,
-                birth_time=chart_input.birth_time,
-                place_name=place_name,
-                latitude=chart_input.lat,
-                longitude=chart_input.lon,
-                timezone=chart_input.tz,
-                gender="",
-                chart_data=json.dumps(chart_data)
-            )
-            db.add(record)
-            db.commit()
+            with stage(timings, "db_write"):
+                record = build_record(
+                    name, place_name, chart_data, chart_input,
+                    input_hash=input_hash(chart_input), calc_version=calculation_version()
+                )
+                await run_db(save_record, db, record)
             saved = True
 
-        response = templates.TemplateResponse("partials/chart_result.html", {
-            "request": request,
-            "chart_data": chart_data
-        })
+        with stage(timings, "svg"):
+            svg_url = await run_blocking(chart_svg_url, chart_data)
+        with stage(timings, "render"):
+            response = templates.TemplateResponse("partials/chart_result.html", {
+                "request": request,
+                "chart_data": chart_data,
+                "chart_svg_url": svg_url
+            })
         
         # 새로운 기록이 저장된 경우에만 목록 새로고침 트리거 발송
         if saved:
             response.headers["HX-Trigger"] = "historyUpdated"
+        response.headers["Server-Timing"] = server_timing_header(timings)
             
         return response
     except ChartError as e:
+        CHART_ERRORS.inc(e.code)
         return templates.TemplateResponse("partials/error.html", {
             "request": request,
             "error_message": e.message,
@@ -82,31 +93,25 @@ async def htmx_save(
 ):
     """차트 저장 (HTMX partial 반환)"""
     try:
-        chart_data, chart_input = await create_chart(name, birth_date, birth_time, place_name)
+        chart_data, chart_input, _ = await get_or_create_chart(db, name, birth_date, birth_time, place_name)
         
         # Save to DB
-        record = ChartRecord(
-            name=name,
-            birth_date=chart_input.birth_date,
-            birth_time=chart_input.birth_time,
-            place_name=place_name,
-            latitude=chart_input.lat,
-            longitude=chart_input.lon,
-            timezone=chart_input.tz,
-            gender="",
-            chart_data=json.dumps(chart_data)
-        )
-        db.add(record)
-        db.commit()
-        db.refresh(record)
+        with stage(chart_input.timings, "db_write"):
+            record = build_record(
+                name, place_name, chart_data, chart_input,
+                input_hash=input_hash(chart_input), calc_version=calculation_version()
+            )
+            await run_db(save_record, db, record)
         
         # Return updated list
-        history_list = db.query(ChartRecord).order_by(ChartRecord.created_at.desc()).all()
+        history_list, next_cursor = await run_db(fetch_history_page, db)
         return templates.TemplateResponse("partials/history_list.html", {
             "request": request,
-            "history_list": history_list
+            "history_list": history_list,
+            "next_cursor": next_cursor
         })
     except ChartError as e:
+        CHART_ERRORS.inc(e.code)
         return templates.TemplateResponse("partials/error.html", {
             "request": request,
             "error_message": e.message,
@@ -127,15 +132,14 @@ async def htmx_delete(
     db: Session = Depends(get_db)
 ):
     """차트 삭제 (HTMX partial 반환)"""
-    record = db.query(ChartRecord).filter(ChartRecord.id == chart_id).first()
-    if record:
-        db.delete(record)
-        db.commit()
+    await run_db(delete_record, db, chart_id)
+    fragment_cache.invalidate([chart_id])
         
-    history_list = db.query(ChartRecord).order_by(ChartRecord.created_at.desc()).all()
+    history_list, next_cursor = await run_db(fetch_history_page, db)
     return templates.TemplateResponse("partials/history_list.html", {
         "request": request,
-        "history_list": history_list
+        "history_list": history_list,
+        "next_cursor": next_cursor
     })
 
 
@@ -145,28 +149,74 @@ async def htmx_load(
     chart_id: int,
     db: Session = Depends(get_db)
 ):
-    """저장된 차트 로드 (HTMX partial 반환)"""
-    record = db.query(ChartRecord).filter(ChartRecord.id == chart_id).first()
-    if not record:
+    """저장된 차트 로드 (HTMX partial 반환, 렌더 결과 캐시 + ETag 재검증)"""
+    timings = {}
+    with stage(timings, "db_read"):
+        row = await run_db(lambda: db.query(*ETAG_COLUMNS).filter(ChartRecord.id == chart_id).first())
+    if not row:
         return templates.TemplateResponse("partials/error.html", {
             "request": request,
             "error_message": "해당 기록을 찾을 수 없습니다.",
             "error_code": "NOT_FOUND"
         })
-        
-    chart_data = json.loads(record.chart_data)
-    
-    return templates.TemplateResponse("partials/chart_result.html", {
+
+    # 저장된 차트는 바뀌지 않으므로 매번 재검증하되 같으면 본문 없이 304
+    etag = record_etag(row)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        fragment_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    html = fragment_cache.get(chart_id, etag)
+    if html is not None:
+        fragment_cache.hits += 1
+    else:
+        fragment_cache.misses += 1
+        with stage(timings, "db_read"):
+            record = await run_db(db.get, ChartRecord, chart_id)
+        if record is None:  # 두 조회 사이에 삭제됨
+            return templates.TemplateResponse("partials/error.html", {
+                "request": request,
+                "error_message": "해당 기록을 찾을 수 없습니다.",
+                "error_code": "NOT_FOUND"
+            })
+        with stage(timings, "decode"):
+            chart_data = await run_blocking(load_chart_data, record)
+        with stage(timings, "svg"):
+            svg_url = await run_blocking(chart_svg_url, chart_data)
+        with stage(timings, "render"):
+            html = templates.get_template(FRAGMENT_TEMPLATE).render({
+                "request": request,
+                "chart_data": chart_data,
+                "chart_svg_url": svg_url
+            })
+        fragment_cache.put(chart_id, etag, html)
+
+    headers["Server-Timing"] = server_timing_header(timings)
+    return HTMLResponse(html, headers=headers)
+
+
+@router.get("/history")
+async def htmx_history(request: Request, cursor: Optional[int] = None, db: Session = Depends(get_db)):
+    """차트 기록 목록 (HTMX partial 반환, cursor 지정 시 다음 페이지 행만 반환)"""
+    history_list, next_cursor = await run_db(fetch_history_page, db, cursor)
+    template = "partials/history_rows.html" if cursor is not None else "partials/history_list.html"
+    return templates.TemplateResponse(template, {
         "request": request,
-        "chart_data": chart_data
+        "history_list": history_list,
+        "next_cursor": next_cursor
     })
 
 
-@router.get("/history")
-async def htmx_history(request: Request, db: Session = Depends(get_db)):
-    """차트 기록 목록 (HTMX partial 반환)"""
-    history_list = db.query(ChartRecord).order_by(ChartRecord.created_at.desc()).all()
+@router.get("/search")
+async def htmx_search(request: Request, filters: SearchFilters = Depends(), db: Session = Depends(get_db)):
+    """보관소 검색 (HTMX partial 반환, 조건이 없으면 일반 목록)"""
+    if filters.is_empty():
+        history_list, next_cursor = await run_db(fetch_history_page, db)
+    else:
+        history_list, next_cursor = await run_db(search_charts, db, filters), None
     return templates.TemplateResponse("partials/history_list.html", {
         "request": request,
-        "history_list": history_list
+        "history_list": history_list,
+        "next_cursor": next_cursor
     })
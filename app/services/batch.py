@@ -0,0 +1,286 @@
+"""
+배치 차트 계산
+N건의 출생 데이터를 한 번에 계산해 (N × 천체) NumPy 배열로 보관하고,
+기존 compute_natal_chart 와 같은 dict 는 chart(i) 호출 시에만 만듦.
+보관소 백필, 연구용 대량 계산 전용.
+천체 위치는 기본적으로 swe 로 정확히 계산하고, use_table=True 일 때만 사전 계산 천문력 표 보간값을 씀
+(연구용 근사 계산 전용, 오차는 ephemeris_table 참고. 보관소에 저장하는 계산에는 쓰지 않음).
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+import swisseph as swe
+
+from .aspects import ASPECTS
+from .chart import SECT_PLANETS, SUN_RELATIONS, julian_day, resolve_dignity
+from .degrees import SIGNS, degree_indices, degree_info, vector_tables
+from .ephemeris import calc_positions
+from .planets import JOYS, PLANETS, calculate_lots, format_position
+
+BODY_IDS = list(PLANETS)
+BODY_NAMES = [PLANETS[pid][0] for pid in BODY_IDS]
+N_BODIES = len(BODY_IDS)
+
+# 천체 쌍 (calculate_aspects 와 같은 순서)
+PAIRS_I, PAIRS_J = np.triu_indices(N_BODIES, k=1)
+
+ASPECT_ANGLES = np.array([a["angle"] for a in ASPECTS], dtype=float)
+ASPECT_ORBS = np.array([a["orb"] for a in ASPECTS], dtype=float)
+
+DIGNITY_NAMES = ["None", "Domicile", "Exaltation", "Detriment", "Fall"]
+SUN_RELATION_NAMES = ["Free"] + [name for _, name in SUN_RELATIONS]
+SUN_RELATION_LIMITS = np.array([limit for limit, _ in SUN_RELATIONS])
+
+# (천체, 사인) → 위계 코드
+DIGNITY_TABLE = np.array([
+    [DIGNITY_NAMES.index(resolve_dignity(name, s[0])) for s in SIGNS]
+    for name in BODY_NAMES
+], dtype=np.int8)
+
+IN_SECT_TABLE = np.array([
+    [name in SECT_PLANETS[False] for name in BODY_NAMES],
+    [name in SECT_PLANETS[True] for name in BODY_NAMES],
+])
+
+JOY_HOUSES = np.array([JOYS.get(name, 0) for name in BODY_NAMES])
+
+# 하우스 번호(1-12) → 분류 (houses.calculate_houses_and_points 와 같은 규칙)
+HOUSE_CATEGORIES = [None] + ["Angular", "Succedent", "Cadent"] * 4
+HOUSE_FORTUNES = [None, "Good", "Neutral", "Neutral", "Neutral", "Good", "Bad",
+                  "Neutral", "Bad", "Neutral", "Good", "Good", "Bad"]
+
+
+@dataclass
+class BatchInput:
+    """배치 계산 입력 1건 (좌표, 시간대는 미리 확정된 값)"""
+    name: str
+    birth_date: str
+    birth_time: str
+    lat: float
+    lon: float
+    tz_str: str
+
+
+def house_numbers(longs: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+    """
+    get_house_number 의 배열 버전
+    longs: (N, K) 경도, cusps: (N, 12) 커스프 → (N, K) 하우스 번호 (해당 없으면 1)
+    """
+    start = cusps[:, None, :]
+    end = np.roll(cusps, -1, axis=1)[:, None, :]
+    x = longs[:, :, None]
+    inside = np.where(start < end, (start <= x) & (x < end), (x >= start) | (x < end))
+    return np.where(inside.any(axis=2), inside.argmax(axis=2) + 1, 1)
+
+
+def _divide_quadrant(start: np.ndarray, end: np.ndarray):
+    step = ((end - start) % 360) / 3
+    return (start + step) % 360, (start + 2 * step) % 360
+
+
+class ChartBatch:
+    """배치 계산 결과 (행 = 입력 순서, 열 = BODY_NAMES 순서)"""
+
+    def __init__(self, inputs: List[BatchInput], use_table: bool = False):
+        n = len(inputs)
+        self.inputs = inputs
+        self.jd = np.array([julian_day(ci.birth_date, ci.birth_time, ci.tz_str) for ci in inputs], dtype=float)
+
+        # 1. 천문 계산 (천체별로 전체 시각을 한 번에, 하우스는 1건씩)
+        self.positions = np.empty((n, N_BODIES))
+        self.speeds = np.empty((n, N_BODIES))
+        for col, pid in enumerate(BODY_IDS):
+            self.positions[:, col], self.speeds[:, col] = calc_positions(self.jd, pid, use_table)
+        self.asc = np.empty(n)
+        self.mc = np.empty(n)
+        for row, (jd, ci) in enumerate(zip(self.jd.tolist(), inputs)):
+            ascmc = swe.houses(jd, ci.lat, ci.lon, b'W')[1]
+            self.asc[row] = ascmc[0]
+            self.mc[row] = ascmc[1]
+
+        self._derive()
+
+    @classmethod
+    def from_positions(cls, inputs: List[BatchInput], positions, speeds, asc, mc) -> "ChartBatch":
+        """
+        저장된 천체 위치·속도 (N, 7), ASC, MC (N,) 로 생성 (천문 계산 생략)
+        압축 저장 형식(chart_codec)에서 표시용 dict 를 다시 만들 때 사용
+        """
+        batch = cls.__new__(cls)
+        n = len(inputs)
+        batch.inputs = inputs
+        batch.positions = np.asarray(positions, dtype=float).reshape(n, N_BODIES)
+        batch.speeds = np.asarray(speeds, dtype=float).reshape(n, N_BODIES)
+        batch.asc = np.asarray(asc, dtype=float).reshape(n)
+        batch.mc = np.asarray(mc, dtype=float).reshape(n)
+        batch._derive()
+        return batch
+
+    def _derive(self):
+        """천체 위치, ASC, MC → 하우스, 위계, 섹트, 랏, 애스펙트"""
+        n = len(self.inputs)
+
+        # 2. 하우스 커스프 (홀사인 & 포피리)
+        asc_sign_idx = (self.asc / 30).astype(int)
+        self.wsh_cusps = ((asc_sign_idx[:, None] + np.arange(12)) % 12) * 30
+        dsc = (self.asc + 180) % 360
+        ic = (self.mc + 180) % 360
+        cusps = np.empty((n, 12))
+        cusps[:, 0], cusps[:, 9], cusps[:, 6], cusps[:, 3] = self.asc, self.mc, dsc, ic
+        cusps[:, 10], cusps[:, 11] = _divide_quadrant(self.mc, self.asc)
+        cusps[:, 1], cusps[:, 2] = _divide_quadrant(self.asc, ic)
+        cusps[:, 4], cusps[:, 5] = _divide_quadrant(ic, dsc)
+        cusps[:, 7], cusps[:, 8] = _divide_quadrant(dsc, self.mc)
+        self.porphyry_cusps = cusps
+
+        # 3. 하우스 배치 & 섹트
+        self.wsh = house_numbers(self.positions, self.wsh_cusps)
+        self.porphyry = house_numbers(self.positions, self.porphyry_cusps)
+        self.is_day = self.wsh[:, 0] >= 7
+
+        # 4. 사인, 위계, 섹트 일치, 조이
+        self.sign_idx = vector_tables()["sign"][degree_indices(self.positions)]
+        self.dignity = DIGNITY_TABLE[np.arange(N_BODIES), self.sign_idx]
+        self.in_sect = IN_SECT_TABLE[self.is_day.astype(int)]
+        self.is_joy = self.wsh == JOY_HOUSES
+
+        # 5. 태양과의 관계 (태양 자신은 Free)
+        dist = np.abs(self.positions - self.positions[:, :1])
+        dist = np.where(dist > 180, 360 - dist, dist)
+        within = dist[:, :, None] <= SUN_RELATION_LIMITS
+        self.sun_relation = np.where(within.any(axis=2), within.argmax(axis=2) + 1, 0)
+        self.sun_relation[:, 0] = 0
+
+        # 6. 랏
+        sun, moon = self.positions[:, 0], self.positions[:, 1]
+        day_fortuna = (self.asc + moon - sun) % 360
+        night_fortuna = (self.asc + sun - moon) % 360
+        self.fortuna = np.where(self.is_day, day_fortuna, night_fortuna)
+        self.spirit = np.where(self.is_day, night_fortuna, day_fortuna)
+        lot_houses = house_numbers(np.stack([self.fortuna, self.spirit, self.mc, ic], axis=1), self.wsh_cusps)
+        self.fortuna_wsh, self.spirit_wsh, self.mc_wsh, self.ic_wsh = lot_houses.T
+
+        # 7. 애스펙트 (쌍별 첫 번째로 맞는 애스펙트, 없으면 -1)
+        diff = np.abs(self.positions[:, PAIRS_I] - self.positions[:, PAIRS_J])
+        diff = np.where(diff > 180, 360 - diff, diff)
+        orbs = np.abs(diff[:, :, None] - ASPECT_ANGLES)
+        matched = orbs <= ASPECT_ORBS
+        first = matched.argmax(axis=2)
+        self.aspect = np.where(matched.any(axis=2), first, -1)
+        self.aspect_orb = np.take_along_axis(orbs, first[:, :, None], axis=2)[:, :, 0]
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def chart(self, i: int) -> dict:
+        """i번째 결과를 compute_natal_chart 와 같은 dict 로 변환"""
+        ci = self.inputs[i]
+        positions = self.positions[i].tolist()
+        speeds = self.speeds[i].tolist()
+        wsh_row = self.wsh[i].tolist()
+        porphyry_row = self.porphyry[i].tolist()
+        is_day = bool(self.is_day[i])
+        wsh_data = _house_data(self.wsh_cusps[i].tolist())
+
+        planets = []
+        for col, pid in enumerate(BODY_IDS):
+            name, sym, ko = PLANETS[pid]
+            long, speed = positions[col], speeds[col]
+            info = degree_info(long)
+            wsh = wsh_row[col]
+            planets.append({
+                "id": pid, "name": name, "symbol": sym, "name_ko": ko,
+                "position": long, "speed": speed, "retrograde": speed < 0,
+                "sign": info.sign, "sign_symbol": info.symbol, "sign_ko": info.name_ko,
+                "element": info.element, "degree_f": format_position(long, info.symbol),
+                "wsh": wsh,
+                "porphyry": porphyry_row[col],
+                "category": wsh_data[wsh - 1]["category"],
+                "sun_relation": SUN_RELATION_NAMES[self.sun_relation[i, col]],
+                "dignity": DIGNITY_NAMES[self.dignity[i, col]],
+                "in_sect": bool(self.in_sect[i, col]),
+                "is_joy": bool(self.is_joy[i, col])
+            })
+
+        asc, mc = float(self.asc[i]), float(self.mc[i])
+        f_long, s_long = calculate_lots(asc, positions[0], positions[1], is_day)
+        lots = {
+            "Fortuna": _point("Fortuna", "⊗", f_long, int(self.fortuna_wsh[i])),
+            "Spirit": _point("Spirit", "⊕", s_long, int(self.spirit_wsh[i]))
+        }
+
+        aspects = []
+        for k, code in enumerate(self.aspect[i].tolist()):
+            if code < 0:
+                continue
+            p1, p2 = planets[PAIRS_I[k]], planets[PAIRS_J[k]]
+            aspect = ASPECTS[code]
+            aspects.append({
+                "planet1": p1["name"],
+                "planet1_ko": p1["name_ko"],
+                "planet2": p2["name"],
+                "planet2_ko": p2["name_ko"],
+                "type": aspect["name"],
+                "type_ko": aspect["name_ko"],
+                "angle": aspect["angle"],
+                "orb": round(float(self.aspect_orb[i, k]), 2)
+            })
+
+        dsc, ic = (asc + 180) % 360, (mc + 180) % 360
+        return {
+            "meta": {"name": ci.name, "date": ci.birth_date, "time": ci.birth_time, "is_day": is_day},
+            "planets": planets,
+            "houses": wsh_data,
+            "porphyry_cusps": self.porphyry_cusps[i].tolist(),
+            "angles": {
+                "asc": _angle(asc),
+                "dsc": _angle(dsc),
+                "mc": {**_angle(mc), "wsh": int(self.mc_wsh[i]), "porphyry": 10},
+                "ic": {**_angle(ic), "wsh": int(self.ic_wsh[i]), "porphyry": 4}
+            },
+            "lots": lots,
+            "aspects": aspects
+        }
+
+    def charts(self) -> Iterable[dict]:
+        for i in range(len(self)):
+            yield self.chart(i)
+
+
+def _house_data(wsh_cusps: List[int]) -> List[dict]:
+    wsh_data = []
+    for number, start_long in enumerate(wsh_cusps, start=1):
+        info = degree_info(start_long)
+        wsh_data.append({
+            "number": number,
+            "start_long": start_long,
+            "sign": info.sign,
+            "sign_symbol": info.symbol,
+            "ruler": info.ruler,
+            "category": HOUSE_CATEGORIES[number],
+            "fortune": HOUSE_FORTUNES[number]
+        })
+    return wsh_data
+
+
+def _angle(long: float) -> dict:
+    symbol = degree_info(long).symbol
+    return {"position": long, "degree_f": format_position(long, symbol), "symbol": symbol}
+
+
+def _point(name: str, symbol: str, long: float, wsh: int) -> dict:
+    sign_symbol = degree_info(long).symbol
+    return {"name": name, "symbol": symbol, "position": long, "wsh": wsh,
+            "degree_f": format_position(long, sign_symbol), "sign_symbol": sign_symbol}
+
+
+def compute_batch(inputs: Iterable[BatchInput], use_table: bool = False) -> Optional[ChartBatch]:
+    """
+    출생 데이터 목록 → ChartBatch (입력이 없으면 None)
+    use_table=True 는 천문력 표 보간 (근사값이므로 보관소 저장에는 쓰지 않음)
+    """
+    inputs = list(inputs)
+    if not inputs:
+        return None
+    return ChartBatch(inputs, use_table)
@@ -0,0 +1,339 @@
+"""
+차트 보관소 대량 적재 / 재계산
+CSV·JSONL 출생 데이터를 스트리밍으로 읽어 장소·타임존을 확정하고,
+프로세스 풀에서 배치 계산(compute_batch)한 뒤 청크 단위 트랜잭션으로 저장함.
+
+- 진행 상황: 청크마다 stderr 에 누적 건수와 처리율 출력
+- 재개: 커밋된 행 수를 진행 파일(<입력>.progress)에 기록, 다시 실행하면 이어서 처리
+  같은 입력·계산 버전의 레코드가 이미 있으면 건너뜀
+- 재계산: calc_version 이 현재 버전과 다른 기존 레코드를 다시 계산 (id 순, 중단 후 재실행 가능)
+"""
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import ChartFact, ChartRecord
+from app.services.batch import BatchInput, compute_batch
+from app.services.chart_cache import calculation_version, input_hash
+from app.services.chart_service import ChartInput, attach_metadata
+from app.services.fragment_cache import fragment_cache
+from app.services.records import fact_values, record_values, update_record
+from app.utils.geocoding import get_coordinates
+from app.utils.timezone import get_timezone
+from app.utils.timing import stage
+
+CHUNK_SIZE = 200
+
+
+@dataclass
+class BulkStats:
+    """처리 건수 + 단계별 누적 시간 (ms)"""
+    rows: int = 0
+    saved: int = 0
+    skipped: int = 0
+    failed: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "saved": self.saved,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 2),
+            "rows_per_s": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            # 단계별 처리율 (해당 단계만 기준, 계산은 워커 합산이 아닌 대기 시간)
+            "stages": {
+                name: {"ms": round(ms, 1), "rows_per_s": round(self.rows / (ms / 1000), 1) if ms else None}
+                for name, ms in self.timings.items()
+            },
+        }
+
+    def report(self, label: str):
+        d = self.as_dict()
+        print(f"[{label}] rows={d['rows']} saved={d['saved']} skipped={d['skipped']} "
+              f"failed={d['failed']} {d['rows_per_s']}/s", file=sys.stderr)
+
+
+def read_birth_records(path: str) -> Iterator[dict]:
+    """
+    CSV(헤더 필수) 또는 JSONL 파일 → 행 dict
+    필수: name, birth_date, birth_time, place_name / 선택: latitude, longitude, timezone
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _resolve(row: dict) -> ChartInput:
+    """행 → 좌표·타임존이 확정된 ChartInput (장소를 못 찾으면 ValueError)"""
+    ci = ChartInput(
+        str(row.get("name") or "Unknown"),
+        str(row["birth_date"]).strip(),
+        str(row["birth_time"]).strip(),
+        str(row.get("place_name") or "")
+    )
+    if row.get("latitude") not in (None, "") and row.get("longitude") not in (None, ""):
+        ci.lat, ci.lon = float(row["latitude"]), float(row["longitude"])
+    else:
+        ci.lat, ci.lon = get_coordinates(ci.place_name)
+        if ci.lat is None or ci.lon is None:
+            raise ValueError(f"'{ci.place_name}' 위치를 찾을 수 없습니다.")
+    ci.tz = row.get("timezone") or get_timezone(ci.lat, ci.lon)
+    return ci
+
+
+def compute_chunk(rows: List[Tuple]) -> List[Optional[dict]]:
+    """
+    (name, birth_date, birth_time, lat, lon, tz) 목록 → 차트 dict 목록 (프로세스 풀 작업)
+    배치 계산이 실패하면 행 단위로 다시 계산해 실패한 행만 None
+    """
+    if not rows:
+        return []
+    try:
+        return list(compute_batch(BatchInput(*row) for row in rows).charts())
+    except Exception:
+        results = []
+        for row in rows:
+            try:
+                results.append(compute_batch([BatchInput(*row)]).chart(0))
+            except Exception as e:
+                print(f"Calculation Error: {row[:3]} {e}", file=sys.stderr)
+                results.append(None)
+        return results
+
+
+class _Pool:
+    """
+    청크 계산기
+    workers > 1 이면 프로세스 풀에 순서대로 제출하고, 제출 대기 중인 청크 수를 제한해 메모리를 고정함
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._pending = deque()
+
+    def submit(self, rows: List[Tuple], context) -> Iterator[tuple]:
+        """청크 제출, 완료된 (context, 결과) 를 순서대로 반환"""
+        if self._executor is None:
+            yield context, compute_chunk(rows)
+            return
+        self._pending.append((context, self._executor.submit(compute_chunk, rows)))
+        while len(self._pending) > self.workers * 2:
+            yield self._pop()
+
+    def drain(self) -> Iterator[tuple]:
+        while self._pending:
+            yield self._pop()
+
+    def _pop(self):
+        context, future = self._pending.popleft()
+        return context, future.result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def _read_progress(path: str) -> int:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return int(json.load(f).get("rows", 0))
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_progress(path: str, rows: int):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"rows": rows}, f)
+    os.replace(tmp, path)
+
+
+def insert_records(db: Session, records: List[dict], facts: List[List[dict]]):
+    """
+    레코드 + chart_facts 일괄 INSERT (ORM 객체 생성 없이 executemany)
+    facts[i] 는 records[i] 의 천체별 행
+    """
+    if not records:
+        return
+    conn = db.connection()
+    records_table, facts_table = ChartRecord.__table__, ChartFact.__table__
+    ids = conn.execute(
+        insert(records_table).returning(records_table.c.id, sort_by_parameter_order=True), records
+    ).scalars().all()
+    rows = [{**fact, "chart_id": chart_id} for chart_id, chart_facts in zip(ids, facts) for fact in chart_facts]
+    conn.execute(insert(facts_table), rows)
+
+
+def import_records(
+    db: Session,
+    path: str,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    progress_path: Optional[str] = None,
+    restart: bool = False
+) -> BulkStats:
+    """
+    출생 데이터 파일 적재
+    progress_path 에 커밋된 행 수를 기록하고, 다음 실행 때 그만큼 건너뛰고 이어서 처리함
+    """
+    progress_path = progress_path or f"{path}.progress"
+    done_rows = 0 if restart else _read_progress(progress_path)
+    version = calculation_version()
+    stats = BulkStats()
+    pool = _Pool(workers)
+    # 제출했지만 아직 커밋되지 않은 입력 (workers > 1 이면 여러 청크가 동시에 계산 중)
+    in_flight = set()
+
+    def save(context, charts):
+        nonlocal done_rows
+        resolved, consumed = context
+        with stage(stats.timings, "write"):
+            records, facts = [], []
+            for (ci, key), chart_data in zip(resolved, charts):
+                if chart_data is None:
+                    stats.failed += 1
+                    continue
+                attach_metadata(chart_data, ci)
+                records.append(record_values(ci.name, ci.place_name, chart_data, ci, input_hash=key, calc_version=version))
+                facts.append(fact_values(chart_data))
+            insert_records(db, records, facts)
+            db.commit()
+            stats.saved += len(records)
+        in_flight.difference_update(key for _, key in resolved)
+        done_rows += consumed
+        _write_progress(progress_path, done_rows)
+        stats.report("import")
+
+    try:
+        rows = read_birth_records(path)
+        with stage(stats.timings, "read"):
+            for _ in range(done_rows):
+                next(rows, None)
+
+        while True:
+            with stage(stats.timings, "read"):
+                chunk = [row for _, row in zip(range(chunk_size), rows)]
+            if not chunk:
+                break
+            stats.rows += len(chunk)
+
+            with stage(stats.timings, "resolve"):
+                resolved = []
+                for row in chunk:
+                    try:
+                        ci = _resolve(row)
+                    except Exception as e:
+                        print(f"Import Error: {row} {e}", file=sys.stderr)
+                        stats.failed += 1
+                        continue
+                    resolved.append((ci, input_hash(ci)))
+
+                # 이미 저장된 입력 (같은 계산 버전) 과 계산 중인 청크의 입력은 건너뜀
+                keys = [key for _, key in resolved]
+                existing = {k for (k,) in db.query(ChartRecord.input_hash).filter(
+                    ChartRecord.input_hash.in_(keys), ChartRecord.calc_version == version
+                )} if keys else set()
+                fresh = []
+                for ci, key in resolved:
+                    if key in existing or key in in_flight:
+                        stats.skipped += 1
+                        continue
+                    in_flight.add(key)
+                    fresh.append((ci, key))
+
+            with stage(stats.timings, "compute"):
+                done = list(pool.submit(
+                    [(ci.name, ci.birth_date, ci.birth_time, ci.lat, ci.lon, ci.tz) for ci, _ in fresh],
+                    (fresh, len(chunk))
+                ))
+            for context, charts in done:
+                save(context, charts)
+
+        with stage(stats.timings, "compute"):
+            done = list(pool.drain())
+        for context, charts in done:
+            save(context, charts)
+    finally:
+        pool.close()
+    return stats
+
+
+def recompute_records(
+    db: Session,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    recompute_all: bool = False
+) -> BulkStats:
+    """
+    계산 규칙이 바뀐 기존 레코드 재계산 (저장된 좌표·타임존 사용)
+    완료된 레코드는 calc_version 이 현재 값이 되므로 중단 후 다시 실행하면 남은 것만 처리함
+    """
+    version = calculation_version()
+    stats = BulkStats()
+    pool = _Pool(workers)
+
+    def save(ids, charts):
+        with stage(stats.timings, "write"):
+            records = {r.id: r for r in db.query(ChartRecord).filter(ChartRecord.id.in_(ids))}
+            for record_id, chart_data in zip(ids, charts):
+                record = records.get(record_id)
+                if record is None or chart_data is None:
+                    stats.failed += 1
+                    continue
+                ci = ChartInput(record.name, record.birth_date, record.birth_time, record.place_name or "")
+                ci.lat, ci.lon, ci.tz = record.latitude, record.longitude, record.timezone
+                attach_metadata(chart_data, ci)
+                update_record(record, chart_data, input_hash=record.input_hash or input_hash(ci), calc_version=version)
+                stats.saved += 1
+            db.commit()
+            fragment_cache.invalidate(ids)
+        stats.report("recompute")
+
+    columns = (ChartRecord.id, ChartRecord.name, ChartRecord.birth_date, ChartRecord.birth_time,
+               ChartRecord.latitude, ChartRecord.longitude, ChartRecord.timezone)
+    last_id = 0
+    try:
+        while True:
+            with stage(stats.timings, "read"):
+                query = db.query(*columns).filter(ChartRecord.id > last_id)
+                if not recompute_all:
+                    query = query.filter((ChartRecord.calc_version != version) | ChartRecord.calc_version.is_(None))
+                rows = query.order_by(ChartRecord.id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            stats.rows += len(rows)
+
+            with stage(stats.timings, "compute"):
+                done = list(pool.submit(
+                    [(r.name, r.birth_date, r.birth_time, r.latitude, r.longitude, r.timezone) for r in rows],
+                    [r.id for r in rows]
+                ))
+            for ids, charts in done:
+                save(ids, charts)
+
+        with stage(stats.timings, "compute"):
+            done = list(pool.drain())
+        for ids, charts in done:
+            save(ids, charts)
+    finally:
+        pool.close()
+    return stats
@@ -1,23 +1,68 @@
 import swisseph as swe
 from datetime import datetime
-import pytz
 
-from .planets import calculate_planets_core, calculate_lots, ESSENTIAL_DIGNITIES, JOYS, format_position, get_sign
+from .degrees import DIGNITY_BY_SIGN, degree_info
+from .planets import calculate_planets_core, calculate_lots, JOYS, format_position
 from .houses import calculate_houses_and_points, get_house_number
 from .aspects import calculate_aspects
+from app.utils.concurrency import run_blocking
+from app.utils.timezone import to_utc
+
+# 섹트별 같은 편 행성 (is_day -> 행성 목록)
+SECT_PLANETS = {
+    True: ["Sun", "Jupiter", "Saturn"],
+    False: ["Moon", "Venus", "Mars"]
+}
+
+# 태양과의 거리 기준 (이하이면 해당 상태, 순서대로 판정)
+SUN_RELATIONS = [
+    (0.28, "Cazimi"),  # 17분
+    (7.5, "Combust"),
+    (15, "Under Sunbeams"),
+    (20, "Phasis")
+]
+
+
+def julian_day(birth_date: str, birth_time: str, tz_str: str) -> float:
+    """현지 출생 시각 → UT 율리우스일"""
+    dt_str = f"{birth_date} {birth_time}"
+    dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+    utc_dt = to_utc(dt, tz_str)
+    
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0)
+
+
+def get_sun_relation(dist: float) -> str:
+    """태양과의 각거리(0-180) → 관계 (Cazimi, Combust 등)"""
+    for limit, relation in SUN_RELATIONS:
+        if dist <= limit:
+            return relation
+    return "Free"
+
+
+def resolve_dignity(p_name: str, sign_name: str) -> str:
+    """행성의 본질적 위계 (Domicile, Exaltation, Detriment, Fall, None)"""
+    return DIGNITY_BY_SIGN.get((p_name, sign_name), "None")
+
+
+def _point(position: float) -> dict:
+    """축 표시 정보 (사인 조회 1회)"""
+    symbol = degree_info(position).symbol
+    return {"position": position, "degree_f": format_position(position, symbol), "symbol": symbol}
+
 
 async def calculate_natal_chart(name: str, birth_date: str, birth_time: str, lat: float, lon: float, tz_str: str):
     """
-    네이탈 차트 종합 계산 (비즈니스 로직 적용)
+    네이탈 차트 종합 계산 (계산 스레드 풀에서 실행)
+    """
+    return await run_blocking(compute_natal_chart, name, birth_date, birth_time, lat, lon, tz_str)
+
+def compute_natal_chart(name: str, birth_date: str, birth_time: str, lat: float, lon: float, tz_str: str):
+    """
+    네이탈 차트 종합 계산 (비즈니스 로직 적용, 동기)
     """
     # 1. 시간 계산
-    dt_str = f"{birth_date} {birth_time}"
-    dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-    local_tz = pytz.timezone(tz_str)
-    local_dt = local_tz.localize(dt)
-    utc_dt = local_dt.astimezone(pytz.UTC)
-    
-    jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0)
+    jd = julian_day(birth_date, birth_time, tz_str)
     
     # 2. 기초 천문 계산
     planets_raw, planets_list = calculate_planets_core(jd, lat, lon)
@@ -49,11 +94,7 @@ async def calculate_natal_chart(name: str, birth_date: str, birth_time: str, lat
         p_cat = h_info["category"] # Angular, Succedent, Cadent
         
         # 섹트 일치 여부
-        in_sect = False
-        if is_day:
-            if p_name in ["Sun", "Jupiter", "Saturn"]: in_sect = True
-        else:
-            if p_name in ["Moon", "Venus", "Mars"]: in_sect = True
+        in_sect = p_name in SECT_PLANETS[is_day]
         
         # 6. 태양과의 관계 (컴버스트 등)
         sun_rel = "Free"
@@ -61,28 +102,10 @@ async def calculate_natal_chart(name: str, birth_date: str, birth_time: str, lat
         if dist > 180: dist = 360 - dist
         
         if p_name != "Sun":
-            if dist <= 0.28: sun_rel = "Cazimi" # 17분
-            elif dist <= 7.5: sun_rel = "Combust"
-            elif dist <= 15: sun_rel = "Under Sunbeams"
-            elif dist <= 20: sun_rel = "Phasis"
+            sun_rel = get_sun_relation(dist)
             
         # 8. 본질적 위계 (Domicile, Exaltation 등)
-        dignity = "None"
-        sign_name = p["sign"]
-        if p_name in ESSENTIAL_DIGNITIES:
-            d = ESSENTIAL_DIGNITIES[p_name]
-            if isinstance(d["domicile"], list):
-                if sign_name in d["domicile"]: dignity = "Domicile"
-            elif sign_name == d["domicile"]: dignity = "Domicile"
-            
-            if sign_name == d.get("exaltation"): dignity = "Exaltation"
-            
-            # Detriment/Fall
-            if isinstance(d.get("detriment"), list):
-                if sign_name in d["detriment"]: dignity = "Detriment"
-            elif sign_name == d.get("detriment"): dignity = "Detriment"
-            
-            if sign_name == d.get("fall"): dignity = "Fall"
+        dignity = resolve_dignity(p_name, p["sign"])
 
         # 9. 조이 하우스
         is_joy = JOYS.get(p_name) == wsh
@@ -101,12 +124,12 @@ async def calculate_natal_chart(name: str, birth_date: str, birth_time: str, lat
     # 11. 랏(Lot) 계산
     moon_long = planets_raw["Moon"]["position"]
     f_long, s_long = calculate_lots(asc, sun_long, moon_long, is_day)
-    f_sign = get_sign(f_long)
-    s_sign = get_sign(s_long)
+    f_symbol = degree_info(f_long).symbol
+    s_symbol = degree_info(s_long).symbol
     
     lots = {
-        "Fortuna": {"name": "Fortuna", "symbol": "⊗", "position": f_long, "wsh": get_house_number(f_long, wsh_cusps), "degree_f": format_position(f_long, f_sign["symbol"]), "sign_symbol": f_sign["symbol"]},
-        "Spirit": {"name": "Spirit", "symbol": "⊕", "position": s_long, "wsh": get_house_number(s_long, wsh_cusps), "degree_f": format_position(s_long, s_sign["symbol"]), "sign_symbol": s_sign["symbol"]}
+        "Fortuna": {"name": "Fortuna", "symbol": "⊗", "position": f_long, "wsh": get_house_number(f_long, wsh_cusps), "degree_f": format_position(f_long, f_symbol), "sign_symbol": f_symbol},
+        "Spirit": {"name": "Spirit", "symbol": "⊕", "position": s_long, "wsh": get_house_number(s_long, wsh_cusps), "degree_f": format_position(s_long, s_symbol), "sign_symbol": s_symbol}
     }
 
     # 12. 애스펙트
@@ -118,23 +141,15 @@ async def calculate_natal_chart(name: str, birth_date: str, birth_time: str, lat
         "houses": house_pts["wsh"],
         "porphyry_cusps": house_pts["porphyry_cusps"],
         "angles": {
-            "asc": {"position": asc, "degree_f": format_position(asc, get_sign(asc)["symbol"]), "symbol": get_sign(asc)["symbol"]},
-            "dsc": {
-                "position": (asc + 180) % 360, 
-                "degree_f": format_position((asc + 180) % 360, get_sign((asc + 180) % 360)["symbol"]), 
-                "symbol": get_sign((asc + 180) % 360)["symbol"]
-            },
+            "asc": _point(asc),
+            "dsc": _point((asc + 180) % 360),
             "mc": {
-                "position": house_pts["mc"], 
-                "degree_f": format_position(house_pts["mc"], get_sign(house_pts["mc"])["symbol"]), 
-                "symbol": get_sign(house_pts["mc"])["symbol"],
+                **_point(house_pts["mc"]),
                 "wsh": get_house_number(house_pts["mc"], wsh_cusps),
                 "porphyry": 10
             },
             "ic": {
-                "position": (house_pts["mc"] + 180) % 360, 
-                "degree_f": format_position((house_pts["mc"] + 180) % 360, get_sign((house_pts["mc"] + 180) % 360)["symbol"]), 
-                "symbol": get_sign((house_pts["mc"] + 180) % 360)["symbol"],
+                **_point((house_pts["mc"] + 180) % 360),
                 "wsh": get_house_number((house_pts["mc"] + 180) % 360, wsh_cusps),
                 "porphyry": 4
             }
@@ -0,0 +1,147 @@
+"""
+차트 결과 캐시
+정규화된 입력 해시 + 계산 규칙 버전을 키로, 프로세스 LRU → chart_records 테이블 → 실제 계산 순으로 조회함.
+"""
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import ChartRecord
+from app.services.chart_service import ChartInput, create_chart
+from app.services.records import load_chart_data
+from app.utils.concurrency import run_db
+from app.utils.geocache import normalize_place
+from app.utils.timing import stage
+
+CHART_CACHE_SIZE = int(os.getenv("EPHE_CHART_CACHE_SIZE", "512"))
+
+_calc_version = None
+
+
+def calculation_version() -> str:
+    """
+    계산 규칙 버전
+    디그니티, 오브, 하우스 로직 등 계산 모듈 소스가 바뀌면 자동으로 달라짐
+    """
+    global _calc_version
+    if _calc_version is None:
+        from app.services import aspects, chart, degrees, houses, planets
+
+        digest = hashlib.sha256()
+        for module in (chart, planets, degrees, houses, aspects):
+            digest.update(inspect.getsource(module).encode("utf-8"))
+        _calc_version = digest.hexdigest()[:16]
+    return _calc_version
+
+
+def input_hash(chart_input: ChartInput) -> str:
+    """정규화된 입력값 해시 (이름, 날짜, 시간, 장소)"""
+    key = json.dumps([
+        chart_input.name.strip(),
+        chart_input.birth_date,
+        chart_input.birth_time,
+        normalize_place(chart_input.place_name)
+    ], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class _ChartLRU:
+    """입력 해시 → (chart_data JSON, lat, lon, tz)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: str, chart_data: dict, lat: float, lon: float, tz: str):
+        # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 직렬화해서 보관
+        with self._lock:
+            self._items[key] = (json.dumps(chart_data), lat, lon, tz)
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.db_hits + self.misses
+        return {
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.db_hits) / total, 4) if total else 0.0,
+            "size": len(self._items),
+            "max_size": self.size,
+            "calc_version": calculation_version(),
+        }
+
+
+chart_lru = _ChartLRU(CHART_CACHE_SIZE)
+
+
+async def get_or_create_chart(
+    db: Session,
+    name: str,
+    birth_date: str,
+    birth_time: str,
+    place_name: str
+) -> Tuple[dict, ChartInput, Optional[ChartRecord]]:
+    """
+    캐시 우선 차트 조회
+    
+    Returns:
+        tuple: (chart_data, chart_input, 같은 입력·버전으로 저장된 레코드 또는 None)
+        
+    Raises:
+        ChartError: 캐시 미스 후 계산 실패 시
+    """
+    ci = ChartInput(name, birth_date, birth_time, place_name)
+    key = input_hash(ci)
+    version = calculation_version()
+
+    with stage(ci.timings, "chart_cache"):
+        cached = chart_lru.get(key)
+        record = None
+        if cached is None:
+            record = await run_db(
+                lambda: db.query(ChartRecord).filter(
+                    ChartRecord.input_hash == key,
+                    ChartRecord.calc_version == version
+                ).first()
+            )
+
+    if cached is not None:
+        chart_lru.hits += 1
+        payload, ci.lat, ci.lon, ci.tz = cached
+        return json.loads(payload), ci, None
+
+    if record is not None:
+        chart_lru.db_hits += 1
+        chart_data = load_chart_data(record)
+        ci.lat, ci.lon, ci.tz = record.latitude, record.longitude, record.timezone
+        chart_lru.put(key, chart_data, ci.lat, ci.lon, ci.tz)
+        return chart_data, ci, record
+
+    chart_lru.misses += 1
+    chart_data, computed = await create_chart(name, birth_date, birth_time, place_name)
+    computed.timings.update(ci.timings)
+    chart_lru.put(key, chart_data, computed.lat, computed.lon, computed.tz)
+    return chart_data, computed, None
@@ -0,0 +1,127 @@
+"""
+차트 압축 저장 형식
+chart_records.chart_blob 에 천체 위치·속도와 ASC/MC 만 고정 길이 이진값으로 저장하고,
+사인·기호·한글 이름·도수 문자열·하우스·위계·애스펙트 같은 표시 필드는 읽을 때 배치 계산 규칙으로 다시 만듦.
+이름·날짜·장소·좌표 등 메타데이터는 레코드 컬럼에서 가져옴.
+
+형식 (little-endian)
+    header  : magic b"EC", 형식 버전 u8, 천체 수 u8
+    v1      : 천체별 황경 f64 × 7, 속도 f64 × 7, ASC f64, MC f64 (헤더 포함 132 바이트)
+
+고정 길이 실수 배열이라 압축해도 줄지 않으므로 압축은 하지 않음.
+"""
+import struct
+import sys
+from typing import List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import ChartRecord
+
+MAGIC = b"EC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<2sBB")
+N_BODIES = 7
+BODY_V1 = struct.Struct(f"<{N_BODIES * 2 + 2}d")
+
+
+def encode_chart(chart_data: dict) -> bytes:
+    """chart_data → 압축 형식 (행성 순서는 계산 결과 순서 = PLANETS 순서)"""
+    planets = chart_data["planets"]
+    if len(planets) != N_BODIES:
+        raise ValueError(f"Expected {N_BODIES} planets, got {len(planets)}")
+    angles = chart_data["angles"]
+    values = [p["position"] for p in planets] + [p["speed"] for p in planets] + \
+        [angles["asc"]["position"], angles["mc"]["position"]]
+    return HEADER.pack(MAGIC, FORMAT_VERSION, N_BODIES) + BODY_V1.pack(*values)
+
+
+def unpack_chart(blob: bytes) -> Tuple[Tuple[float, ...], Tuple[float, ...], float, float]:
+    """압축 형식 → (황경 7개, 속도 7개, ASC, MC)"""
+    magic, version, n_bodies = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or n_bodies != N_BODIES:
+        raise ValueError("Invalid chart blob")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported chart blob version: {version}")
+    values = BODY_V1.unpack_from(blob, HEADER.size)
+    return values[:N_BODIES], values[N_BODIES:2 * N_BODIES], values[-2], values[-1]
+
+
+def record_meta(record: ChartRecord) -> dict:
+    """레코드 컬럼 → attach_metadata 와 같은 메타데이터"""
+    return {
+        "name": record.name,
+        "birth_date": record.birth_date,
+        "birth_time": record.birth_time,
+        "place_name": record.place_name,
+        "latitude": record.latitude,
+        "longitude": record.longitude,
+        "timezone": record.timezone,
+    }
+
+
+def decode_charts(items: Sequence[Tuple[bytes, dict]]) -> List[dict]:
+    """(압축 형식, 메타데이터) 목록 → 표시용 chart_data 목록 (한 번에 배치 계산)"""
+    from app.services.batch import BatchInput, ChartBatch  # NumPy 는 읽을 때만 필요
+
+    if not items:
+        return []
+    inputs, positions, speeds, ascs, mcs = [], [], [], [], []
+    for blob, meta in items:
+        pos, speed, asc, mc = unpack_chart(blob)
+        inputs.append(BatchInput(meta["name"], meta["birth_date"], meta["birth_time"],
+                                 meta["latitude"], meta["longitude"], meta["timezone"]))
+        positions.append(pos)
+        speeds.append(speed)
+        ascs.append(asc)
+        mcs.append(mc)
+
+    batch = ChartBatch.from_positions(inputs, positions, speeds, ascs, mcs)
+    charts = []
+    for i, (_, meta) in enumerate(items):
+        chart_data = batch.chart(i)
+        chart_data.update(meta)
+        charts.append(chart_data)
+    return charts
+
+
+def decode_chart(blob: bytes, meta: dict) -> dict:
+    return decode_charts([(blob, meta)])[0]
+
+
+def compact_records(db: Session, batch_size: int = 500) -> dict:
+    """
+    이중 인코딩 JSON 으로 저장된 기존 레코드를 압축 형식으로 변환
+    다시 만든 결과가 저장된 JSON 과 같을 때만 변환하고, 다르면(이전 규칙으로 계산된 레코드 등) 그대로 둠
+    """
+    from app.services.records import load_chart_data
+
+    counts = {"converted": 0, "kept": 0}
+    last_id = 0
+    while True:
+        records = db.query(ChartRecord) \
+            .filter(ChartRecord.id > last_id, ChartRecord.chart_blob.is_(None)) \
+            .order_by(ChartRecord.id).limit(batch_size).all()
+        if not records:
+            break
+        last_id = records[-1].id
+
+        pending = []
+        for record in records:
+            try:
+                chart_data = load_chart_data(record)
+                pending.append((record, chart_data, encode_chart(chart_data)))
+            except (KeyError, TypeError, ValueError):
+                counts["kept"] += 1
+
+        rebuilt = decode_charts([(blob, record_meta(record)) for record, _, blob in pending])
+        for (record, chart_data, blob), decoded in zip(pending, rebuilt):
+            if decoded != chart_data:
+                counts["kept"] += 1
+                continue
+            record.chart_blob = blob
+            record.chart_data = None
+            counts["converted"] += 1
+        db.commit()
+        print(f"[compact] converted={counts['converted']} kept={counts['kept']}", file=sys.stderr)
+    return counts
@@ -5,8 +5,10 @@ Chart Service - 차트 생성 통합 서비스
 from dataclasses import dataclass, field
 from typing import Optional
 from app.services.chart import calculate_natal_chart
-from app.utils.geocoding import get_coordinates
+from app.utils.concurrency import run_blocking
+from app.utils.geocoding import get_coordinates_async
 from app.utils.timezone import get_timezone
+from app.utils.timing import stage
 
 
 class ChartError(Exception):
@@ -27,6 +29,7 @@ class ChartInput:
     lat: Optional[float] = field(default=None, init=False)
     lon: Optional[float] = field(default=None, init=False)
     tz: Optional[str] = field(default=None, init=False)
+    timings: dict = field(default_factory=dict, init=False, repr=False)  # 단계별 소요 시간 (ms)
     
     def __post_init__(self):
         """입력값 정규화"""
@@ -47,6 +50,33 @@ class ChartInput:
                 self.birth_time = f"{self.birth_time[:2]}:{self.birth_time[2:4]}:{self.birth_time[4:]}"
 
 
+async def resolve_location(place_name: str, timings: Optional[dict] = None) -> tuple[float, float, str]:
+    """
+    장소 이름 → (위도, 경도, 타임존)
+
+    Raises:
+        ChartError: 위치 조회 실패 또는 타임존 계산 실패 시
+    """
+    timings = {} if timings is None else timings
+
+    # 위치 정보 조회 (비동기 네트워크 I/O)
+    with stage(timings, "geocode"):
+        lat, lon = await get_coordinates_async(place_name)
+    if lat is None or lon is None:
+        raise ChartError(
+            f"'{place_name}' 위치를 찾을 수 없습니다.",
+            code="LOCATION_NOT_FOUND"
+        )
+
+    # 타임존 계산 (계산 스레드 풀)
+    try:
+        with stage(timings, "timezone"):
+            tz = await run_blocking(get_timezone, lat, lon)
+    except Exception as e:
+        raise ChartError(f"타임존 계산 실패: {e}", code="TIMEZONE_ERROR")
+    return lat, lon, tz
+
+
 async def create_chart(
     name: str,
     birth_date: str,
@@ -65,28 +95,24 @@ async def create_chart(
     # 1. 입력값 정규화
     ci = ChartInput(name, birth_date, birth_time, place_name)
     
-    # 2. 위치 정보 조회
-    lat, lon = get_coordinates(place_name)
-    if lat is None or lon is None:
-        raise ChartError(
-            f"'{place_name}' 위치를 찾을 수 없습니다.",
-            code="LOCATION_NOT_FOUND"
-        )
-    ci.lat, ci.lon = lat, lon
+    # 2-3. 위치 정보 / 타임존
+    ci.lat, ci.lon, ci.tz = await resolve_location(place_name, ci.timings)
     
-    # 3. 타임존 계산
+    # 4. 차트 계산 (계산 스레드 풀)
     try:
-        ci.tz = get_timezone(lat, lon)
-    except Exception as e:
-        raise ChartError(f"타임존 계산 실패: {e}", code="TIMEZONE_ERROR")
-    
-    # 4. 차트 계산
-    try:
-        chart_data = await calculate_natal_chart(ci.name, ci.birth_date, ci.birth_time, ci.lat, ci.lon, ci.tz)
+        with stage(ci.timings, "ephemeris"):
+            chart_data = await calculate_natal_chart(ci.name, ci.birth_date, ci.birth_time, ci.lat, ci.lon, ci.tz)
     except Exception as e:
         raise ChartError(f"차트 계산 오류: {e}", code="CALCULATION_ERROR")
     
     # 5. 메타데이터 추가
+    attach_metadata(chart_data, ci)
+    
+    return chart_data, ci
+
+
+def attach_metadata(chart_data: dict, ci: ChartInput) -> dict:
+    """계산 결과에 입력/위치 메타데이터 추가 (저장 형식)"""
     chart_data.update({
         'name': ci.name,
         'birth_date': ci.birth_date,
@@ -96,5 +122,4 @@ async def create_chart(
         'longitude': ci.lon,
         'timezone': ci.tz
     })
-    
-    return chart_data, ci
+    return chart_data
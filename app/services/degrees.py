@@ -0,0 +1,206 @@
+"""
+황도 1도 단위 조회표
+사인, 원소, 모드, 주인, 이집트 텀 주인, 칼데아 페이스 주인, 7행성 본질적 위계 점수를 0-359도마다 미리 계산해 둠.
+사인·텀·페이스 경계가 모두 정수 도이므로 1도 해상도로 정확함 (분 단위 표는 필요 없음).
+
+- degree_info(long): 스칼라 O(1) 조회 (DegreeInfo 는 공유 객체이므로 수정 금지)
+- DIGNITY_BY_SIGN[(행성, 사인)]: 위계 이름 (Domicile, Exaltation, Detriment, Fall)
+- vector_tables(): NumPy 배열 판 (배치 계산용, 첫 호출 때 생성)
+
+점수는 Lilly 기준: 도미사일 +5, 엑절테이션 +4, 트리플리시티 +3, 텀 +2, 페이스 +1, 디트리먼트 -5, 폴 -4
+트리플리시티는 도로테우스 낮/밤 주인만 반영함 (참여 주인 제외).
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+# 사인 (Tropical Zodiac) - 원소, 모드, 주인 반영
+SIGNS = [
+    ("Aries", "♈︎", "양", "fire", "cardinal", "Mars"),
+    ("Taurus", "♉︎", "황소", "earth", "fixed", "Venus"),
+    ("Gemini", "♊︎", "쌍둥이", "air", "mutable", "Mercury"),
+    ("Cancer", "♋︎", "게", "water", "cardinal", "Moon"),
+    ("Leo", "♌︎", "사자", "fire", "fixed", "Sun"),
+    ("Virgo", "♍︎", "처녀", "earth", "mutable", "Mercury"),
+    ("Libra", "♎︎", "천칭", "air", "cardinal", "Venus"),
+    ("Scorpio", "♏︎", "전갈", "water", "fixed", "Mars"),
+    ("Sagittarius", "♐︎", "사수", "fire", "mutable", "Jupiter"),
+    ("Capricorn", "♑︎", "염소", "earth", "cardinal", "Saturn"),
+    ("Aquarius", "♒︎", "물병", "air", "fixed", "Saturn"),
+    ("Pisces", "♓︎", "물고기", "water", "mutable", "Jupiter")
+]
+
+# 점수 배열의 행성 순서 (planets.PLANETS 와 같은 순서)
+PLANET_NAMES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]
+
+# 본질적 위계 데이터
+ESSENTIAL_DIGNITIES = {
+    "Sun": {"domicile": "Leo", "exaltation": "Aries", "detriment": "Aquarius", "fall": "Libra"},
+    "Moon": {"domicile": "Cancer", "exaltation": "Taurus", "detriment": "Capricorn", "fall": "Scorpio"},
+    "Mercury": {"domicile": ["Gemini", "Virgo"], "exaltation": "Virgo", "detriment": ["Sagittarius", "Pisces"], "fall": "Pisces"},
+    "Venus": {"domicile": ["Taurus", "Libra"], "exaltation": "Pisces", "detriment": ["Scorpio", "Aries"], "fall": "Virgo"},
+    "Mars": {"domicile": ["Aries", "Scorpio"], "exaltation": "Capricorn", "detriment": ["Libra", "Taurus"], "fall": "Cancer"},
+    "Jupiter": {"domicile": ["Sagittarius", "Pisces"], "exaltation": "Cancer", "detriment": ["Gemini", "Virgo"], "fall": "Capricorn"},
+    "Saturn": {"domicile": ["Capricorn", "Aquarius"], "exaltation": "Libra", "detriment": ["Cancer", "Leo"], "fall": "Aries"}
+}
+
+# 원소별 트리플리시티 주인 (낮, 밤) - 도로테우스
+TRIPLICITY = {
+    "fire": ("Sun", "Jupiter"),
+    "earth": ("Venus", "Moon"),
+    "air": ("Saturn", "Mercury"),
+    "water": ("Venus", "Mars")
+}
+
+# 이집트 텀 (사인 내 끝 도수, 주인)
+EGYPTIAN_TERMS = {
+    "Aries": [(6, "Jupiter"), (12, "Venus"), (20, "Mercury"), (25, "Mars"), (30, "Saturn")],
+    "Taurus": [(8, "Venus"), (14, "Mercury"), (22, "Jupiter"), (27, "Saturn"), (30, "Mars")],
+    "Gemini": [(6, "Mercury"), (12, "Jupiter"), (17, "Venus"), (24, "Mars"), (30, "Saturn")],
+    "Cancer": [(7, "Mars"), (13, "Venus"), (19, "Mercury"), (26, "Jupiter"), (30, "Saturn")],
+    "Leo": [(6, "Jupiter"), (11, "Venus"), (18, "Saturn"), (24, "Mercury"), (30, "Mars")],
+    "Virgo": [(7, "Mercury"), (17, "Venus"), (21, "Jupiter"), (28, "Mars"), (30, "Saturn")],
+    "Libra": [(6, "Saturn"), (14, "Venus"), (21, "Jupiter"), (28, "Mercury"), (30, "Mars")],
+    "Scorpio": [(7, "Mars"), (11, "Venus"), (19, "Mercury"), (24, "Jupiter"), (30, "Saturn")],
+    "Sagittarius": [(12, "Jupiter"), (17, "Venus"), (21, "Mercury"), (26, "Saturn"), (30, "Mars")],
+    "Capricorn": [(7, "Mercury"), (14, "Jupiter"), (22, "Venus"), (26, "Saturn"), (30, "Mars")],
+    "Aquarius": [(7, "Saturn"), (13, "Mercury"), (20, "Venus"), (25, "Jupiter"), (30, "Mars")],
+    "Pisces": [(12, "Venus"), (16, "Jupiter"), (19, "Mercury"), (28, "Mars"), (30, "Saturn")]
+}
+
+# 칼데아 페이스 (10도 단위, 양자리 0도부터)
+CHALDEAN_FACES = [
+    "Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon",
+    "Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars", "Sun", "Venus",
+    "Mercury", "Moon", "Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars"
+]
+
+SCORES = {"Domicile": 5, "Exaltation": 4, "Triplicity": 3, "Term": 2, "Face": 1, "Detriment": -5, "Fall": -4}
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _sign_dignity(planet: str, sign: str) -> str:
+    """사인 단위 위계 (뒤 규칙이 앞 규칙을 덮어씀: 도미사일 < 엑절테이션 < 디트리먼트 < 폴)"""
+    d = ESSENTIAL_DIGNITIES[planet]
+    dignity = "None"
+    if sign in _as_list(d["domicile"]):
+        dignity = "Domicile"
+    if sign == d.get("exaltation"):
+        dignity = "Exaltation"
+    if sign in _as_list(d.get("detriment")):
+        dignity = "Detriment"
+    if sign == d.get("fall"):
+        dignity = "Fall"
+    return dignity
+
+
+# (행성, 사인) → 위계 이름 ("None" 은 생략)
+DIGNITY_BY_SIGN: Dict[Tuple[str, str], str] = {
+    (planet, s[0]): dignity
+    for planet in ESSENTIAL_DIGNITIES for s in SIGNS
+    for dignity in [_sign_dignity(planet, s[0])] if dignity != "None"
+}
+
+
+class DegreeInfo(NamedTuple):
+    sign_idx: int
+    sign: str
+    symbol: str
+    name_ko: str
+    element: str
+    mode: str
+    ruler: str
+    term: str
+    face: str
+    # PLANET_NAMES 순서 위계 점수 (낮 차트, 밤 차트)
+    day_scores: Tuple[int, ...]
+    night_scores: Tuple[int, ...]
+
+
+def _score(planet: str, sign: str, element: str, term: str, face: str, is_day: bool) -> int:
+    d = ESSENTIAL_DIGNITIES[planet]
+    score = 0
+    if sign in _as_list(d["domicile"]):
+        score += SCORES["Domicile"]
+    if sign == d.get("exaltation"):
+        score += SCORES["Exaltation"]
+    if TRIPLICITY[element][0 if is_day else 1] == planet:
+        score += SCORES["Triplicity"]
+    if term == planet:
+        score += SCORES["Term"]
+    if face == planet:
+        score += SCORES["Face"]
+    if sign in _as_list(d.get("detriment")):
+        score += SCORES["Detriment"]
+    if sign == d.get("fall"):
+        score += SCORES["Fall"]
+    return score
+
+
+def _build() -> List[DegreeInfo]:
+    table = []
+    for deg in range(360):
+        idx = deg // 30
+        name, symbol, ko, element, mode, ruler = SIGNS[idx]
+        term = next(lord for end, lord in EGYPTIAN_TERMS[name] if deg % 30 < end)
+        face = CHALDEAN_FACES[deg // 10]
+        table.append(DegreeInfo(
+            idx, name, symbol, ko, element, mode, ruler, term, face,
+            tuple(_score(p, name, element, term, face, True) for p in PLANET_NAMES),
+            tuple(_score(p, name, element, term, face, False) for p in PLANET_NAMES)
+        ))
+    return table
+
+
+DEGREES: List[DegreeInfo] = _build()
+
+_PLANET_INDEX = {name: i for i, name in enumerate(PLANET_NAMES)}
+
+
+def degree_info(longitude: float) -> DegreeInfo:
+    """황경 → 해당 도의 조회표 행"""
+    return DEGREES[int(longitude % 360) % 360]
+
+
+def dignity_score(planet: str, longitude: float, is_day: bool) -> int:
+    """행성의 본질적 위계 점수 (7행성 외에는 0)"""
+    i = _PLANET_INDEX.get(planet)
+    if i is None:
+        return 0
+    info = degree_info(longitude)
+    return (info.day_scores if is_day else info.night_scores)[i]
+
+
+_vector_tables = None
+
+
+def vector_tables() -> dict:
+    """
+    NumPy 판 조회표 (첫 호출 때 생성)
+    sign / term / face: (360,) 사인 번호, 텀·페이스 주인의 PLANET_NAMES 번호
+    score: (2, 7, 360) [밤=0/낮=1, 행성, 도]
+    """
+    global _vector_tables
+    if _vector_tables is None:
+        import numpy as np
+
+        _vector_tables = {
+            "sign": np.array([d.sign_idx for d in DEGREES], dtype=np.int8),
+            "term": np.array([_PLANET_INDEX[d.term] for d in DEGREES], dtype=np.int8),
+            "face": np.array([_PLANET_INDEX[d.face] for d in DEGREES], dtype=np.int8),
+            "score": np.array([
+                [[d.night_scores[i] for d in DEGREES] for i in range(len(PLANET_NAMES))],
+                [[d.day_scores[i] for d in DEGREES] for i in range(len(PLANET_NAMES))]
+            ], dtype=np.int8),
+        }
+    return _vector_tables
+
+
+def degree_indices(longitudes):
+    """황경 배열 → 조회표 인덱스 배열 (vector_tables() 배열에 그대로 사용)"""
+    import numpy as np
+
+    return np.floor(np.mod(longitudes, 360)).astype(np.intp) % 360
@@ -0,0 +1,96 @@
+"""
+Swiss Ephemeris 호출 캐시
+같은 출생 데이터(재분석, 중복 저장)는 swe 계산 없이 메모리에서 반환함.
+여러 시각을 한 번에 계산하는 작업(배치, 트랜짓)은 calc_positions 를 쓰며, 사전 계산 표는 use_table=True 일 때만 사용함.
+"""
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import swisseph as swe
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .ephemeris_table import EphemerisTable
+
+# 캐시 크기 (행성 호출 1건 = 1 항목, 차트 1개당 8 항목)
+CALC_CACHE_SIZE = int(os.getenv("EPHE_CALC_CACHE_SIZE", "8192"))
+HOUSES_CACHE_SIZE = int(os.getenv("EPHE_HOUSES_CACHE_SIZE", "1024"))
+
+# 사전 계산 천문력 표 (python -m app.cli ephemeris-table-build 로 생성, 없으면 swe 직접 계산)
+TABLE_PATH = os.getenv("EPHE_TABLE_PATH", "./ephemeris.tbl")
+
+DEFAULT_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+
+@lru_cache(maxsize=CALC_CACHE_SIZE)
+def calc_ut(jd: float, body: int, flags: int = DEFAULT_FLAGS):
+    """swe.calc_ut 캐시 버전 ((jd, body, flags) 키)"""
+    return swe.calc_ut(jd, body, flags)
+
+
+@lru_cache(maxsize=HOUSES_CACHE_SIZE)
+def houses(jd: float, lat: float, lon: float, hsys: bytes = b'W'):
+    """swe.houses 캐시 버전 ((jd, lat, lon, hsys) 키)"""
+    return swe.houses(jd, lat, lon, hsys)
+
+
+_table = None
+_table_loaded = False
+
+
+def get_table() -> Optional["EphemerisTable"]:
+    """표 싱글톤 (프로세스마다 한 번 memmap)"""
+    global _table, _table_loaded
+    if not _table_loaded:
+        from .ephemeris_table import open_table
+
+        _table = open_table(TABLE_PATH)
+        _table_loaded = True
+    return _table
+
+
+def calc_positions(jds, body: int, use_table: bool = False) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    여러 시각의 (황경, 속도) 배열
+    기본은 swe.calc_ut 로 정확히 계산 (compute_natal_chart 와 같은 값)
+    use_table=True 이면 표 범위 안은 보간, 범위 밖이거나 표에 없는 천체만 swe.calc_ut 로 계산
+    """
+    import numpy as np
+
+    jds = np.atleast_1d(np.asarray(jds, dtype=float))
+    lon = np.empty(len(jds))
+    speed = np.empty(len(jds))
+
+    table = get_table() if use_table else None
+    inside = table.covers(jds) if table is not None and body in table.bodies else np.zeros(len(jds), dtype=bool)
+    if inside.any():
+        lon[inside], speed[inside] = table.calc(jds[inside], body)
+    for i in np.nonzero(~inside)[0].tolist():
+        res = swe.calc_ut(jds[i], body, DEFAULT_FLAGS)[0]
+        lon[i] = res[0]
+        speed[i] = res[3]
+    return lon, speed
+
+
+def _info(func) -> dict:
+    info = func.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / total, 4) if total else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def cache_stats() -> dict:
+    """캐시 히트율 통계 (+ 사전 계산 표 정보)"""
+    table = get_table()
+    return {"calc_ut": _info(calc_ut), "houses": _info(houses), "table": table.info() if table else None}
+
+
+def clear_cache():
+    calc_ut.cache_clear()
+    houses.cache_clear()
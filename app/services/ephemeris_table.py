@@ -0,0 +1,125 @@
+"""
+사전 계산 천문력 표 (7행성 + 평균 노드의 황경·속도)
+빌드 단계에서 고정 간격으로 swe.calc_ut 결과를 이진 파일로 저장하고,
+조회 시 np.memmap 으로 열어 구간별 3차 에르미트 보간으로 임의 시각의 값을 구함.
+페이지는 OS 캐시로 공유되므로 여러 워커 프로세스가 열어도 RSS 증가가 거의 없음.
+
+파일 구조 (little-endian)
+    header : magic, 시작 jd, 간격(일), 행 수, 천체 수, swe 플래그, 천체 id 목록
+    data   : DATA_OFFSET 부터 float64 (행, 천체, [황경, 속도])
+
+보간 오차 (1일 간격, 1800-2200 임의 시각 4만 건을 swe 와 비교)
+    황경: 태양·노드 1e-6° 미만, 달·수성·금성·화성 6e-4° 미만, 목성·토성 최대 4e-3°
+    속도: 최대 1.5e-2°/일
+    외행성 최대 오차는 swe 속도값이 드물게 튀는 표본(모시에 계산) 부근에서 생김
+"""
+import math
+import struct
+import sys
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+MAGIC = b"EPHETBL1"
+HEADER = struct.Struct("<8sddQII16i")
+DATA_OFFSET = 4096  # 데이터는 페이지 경계에서 시작
+
+TABLE_BODIES = [swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS, swe.JUPITER, swe.SATURN, swe.MEAN_NODE]
+TABLE_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+DEFAULT_START_YEAR = 1800
+DEFAULT_END_YEAR = 2200
+DEFAULT_STEP = 1.0
+
+
+def build_table(
+    out_path: str,
+    start_year: int = DEFAULT_START_YEAR,
+    end_year: int = DEFAULT_END_YEAR,
+    step: float = DEFAULT_STEP,
+    bodies: Sequence[int] = TABLE_BODIES
+) -> Dict:
+    """[start_year-01-01, end_year-01-01] 0시 UT 부터 step 간격 표 생성"""
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year, 1, 1, 0.0)
+    n_rows = math.ceil((end_jd - start_jd) / step) + 1
+    header = HEADER.pack(MAGIC, start_jd, step, n_rows, len(bodies), TABLE_FLAGS,
+                         *(list(bodies) + [-1] * (16 - len(bodies))))
+
+    with open(out_path, "wb") as f:
+        f.write(header.ljust(DATA_OFFSET, b"\0"))
+        rows = np.empty((min(n_rows, 10000), len(bodies), 2))
+        for offset in range(0, n_rows, len(rows)):
+            count = min(len(rows), n_rows - offset)
+            for r in range(count):
+                jd = start_jd + (offset + r) * step
+                for b, body in enumerate(bodies):
+                    res = swe.calc_ut(jd, body, TABLE_FLAGS)[0]
+                    rows[r, b, 0] = res[0]
+                    rows[r, b, 1] = res[3]
+            f.write(rows[:count].astype("<f8").tobytes())
+            print(f"[ephemeris-table] {offset + count}/{n_rows}", file=sys.stderr)
+
+    return {"rows": n_rows, "bodies": len(bodies), "start_jd": start_jd, "end_jd": start_jd + (n_rows - 1) * step,
+            "bytes": DATA_OFFSET + n_rows * len(bodies) * 16}
+
+
+class EphemerisTable:
+    """표 파일 조회기 (읽기 전용 memmap)"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+        magic, self.start_jd, self.step, self.n_rows, n_bodies, self.flags = fields[:6]
+        if magic != MAGIC:
+            raise ValueError(f"Invalid ephemeris table: {path}")
+        self.path = path
+        self.bodies = {body: i for i, body in enumerate(fields[6:6 + n_bodies])}
+        self.end_jd = self.start_jd + (self.n_rows - 1) * self.step
+        self.data = np.memmap(path, dtype="<f8", mode="r", offset=DATA_OFFSET, shape=(self.n_rows, n_bodies, 2))
+
+    def covers(self, jds: np.ndarray) -> np.ndarray:
+        return (jds >= self.start_jd) & (jds <= self.end_jd)
+
+    def calc(self, jds: np.ndarray, body: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        표 범위 안의 시각들 → (황경, 속도) 에르미트 보간
+        범위 확인은 호출하는 쪽에서 함 (covers)
+        """
+        col = self.bodies[body]
+        x = (np.atleast_1d(np.asarray(jds, dtype=float)) - self.start_jd) / self.step
+        i = np.clip(np.floor(x).astype(np.int64), 0, self.n_rows - 2)
+        s = x - i
+
+        p0, p1 = self.data[i, col], self.data[i + 1, col]
+        lon0 = p0[:, 0]
+        m0, m1 = p0[:, 1] * self.step, p1[:, 1] * self.step
+        delta = 180 - np.mod(180 - (p1[:, 0] - lon0), 360)
+        c = 3 * delta - 2 * m0 - m1
+        d = m0 + m1 - 2 * delta
+
+        lon = np.mod(lon0 + s * (m0 + s * (c + s * d)), 360)
+        speed = (m0 + s * (2 * c + 3 * s * d)) / self.step
+        return lon, speed
+
+    def info(self) -> Dict:
+        return {
+            "path": self.path,
+            "start_jd": self.start_jd,
+            "end_jd": self.end_jd,
+            "step": self.step,
+            "rows": self.n_rows,
+            "bodies": len(self.bodies),
+        }
+
+
+def open_table(path: str) -> Optional[EphemerisTable]:
+    """표 파일이 없거나 손상되었으면 None (swe 직접 계산으로 대체)"""
+    try:
+        return EphemerisTable(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Ephemeris Table Error: {path} {e}")
+        return None
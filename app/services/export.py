@@ -0,0 +1,238 @@
+"""
+차트 보관소 내보내기 (NDJSON, CSV, Parquet, Arrow IPC 스트림)
+레코드를 id 순으로 EXPORT_BATCH_SIZE 건씩 서버 측 커서(yield_per)로 읽고, 배치마다 차트를 복원해
+평탄화한 행을 바로 직렬화해 내보냄. 전체 결과를 목록으로 만들지 않으므로 메모리 사용량은 배치 크기에만 비례함.
+
+컬럼 (EXPORT_COLUMNS, 모든 형식 공통)
+- 레코드: id, name, birth_date, birth_time, place_name, latitude, longitude, timezone, created_at, calc_version, is_day
+- 행성별: {행성}_position, _speed, _sign, _retrograde, _wsh, _porphyry, _dignity, _in_sect, _sun_relation
+- 축·랏: asc/mc/fortuna/spirit _position, _sign (+ mc/fortuna/spirit _wsh)
+- 하우스: house_{1-12}_sign (홀사인), porphyry_{1-12}_cusp
+- 애스펙트: {행성1}_{행성2}_aspect, _orb (없으면 빈 값)
+
+Parquet / Arrow 는 pyarrow 가 설치된 경우에만 사용 가능 (없으면 ExportError).
+"""
+import csv
+import io
+import json
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import ChartRecord
+from app.services.chart_codec import decode_charts, record_meta
+from app.services.degrees import degree_info
+from app.services.search import SearchFilters, apply_filters
+
+EXPORT_BATCH_SIZE = int(os.getenv("EPHE_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+BODIES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]
+
+RECORD_COLUMNS = (
+    ChartRecord.id, ChartRecord.name, ChartRecord.birth_date, ChartRecord.birth_time, ChartRecord.place_name,
+    ChartRecord.latitude, ChartRecord.longitude, ChartRecord.timezone, ChartRecord.created_at,
+    ChartRecord.calc_version, ChartRecord.chart_blob, ChartRecord.chart_data,
+)
+
+
+def _columns() -> List[Tuple[str, str]]:
+    """(컬럼 이름, 타입) - 타입: int, float, str, bool"""
+    cols = [
+        ("id", "int"), ("name", "str"), ("birth_date", "str"), ("birth_time", "str"), ("place_name", "str"),
+        ("latitude", "float"), ("longitude", "float"), ("timezone", "str"), ("created_at", "str"),
+        ("calc_version", "str"), ("is_day", "bool"),
+    ]
+    for body in BODIES:
+        b = body.lower()
+        cols += [
+            (f"{b}_position", "float"), (f"{b}_speed", "float"), (f"{b}_sign", "str"), (f"{b}_retrograde", "bool"),
+            (f"{b}_wsh", "int"), (f"{b}_porphyry", "int"), (f"{b}_dignity", "str"), (f"{b}_in_sect", "bool"),
+            (f"{b}_sun_relation", "str"),
+        ]
+    for point in ("asc", "mc", "fortuna", "spirit"):
+        cols += [(f"{point}_position", "float"), (f"{point}_sign", "str")]
+        if point != "asc":
+            cols.append((f"{point}_wsh", "int"))
+    cols += [(f"house_{n}_sign", "str") for n in range(1, 13)]
+    cols += [(f"porphyry_{n}_cusp", "float") for n in range(1, 13)]
+    for i, p1 in enumerate(BODIES):
+        for p2 in BODIES[i + 1:]:
+            cols += [(f"{p1.lower()}_{p2.lower()}_aspect", "str"), (f"{p1.lower()}_{p2.lower()}_orb", "float")]
+    return cols
+
+
+EXPORT_COLUMNS = _columns()
+COLUMN_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+
+class ExportError(Exception):
+    """지원하지 않는 형식 또는 선택 의존성 없음"""
+
+
+def flatten_chart(row, chart: dict) -> dict:
+    """레코드 행 + 복원된 chart_data → 평탄화한 행 (EXPORT_COLUMNS 순서)"""
+    flat = dict.fromkeys(COLUMN_NAMES)
+    flat.update({
+        "id": row.id, "name": row.name, "birth_date": row.birth_date, "birth_time": row.birth_time,
+        "place_name": row.place_name, "latitude": row.latitude, "longitude": row.longitude,
+        "timezone": row.timezone, "created_at": row.created_at.isoformat() if row.created_at else None,
+        "calc_version": row.calc_version, "is_day": chart["meta"]["is_day"],
+    })
+    for p in chart["planets"]:
+        b = p["name"].lower()
+        for field in ("position", "speed", "sign", "retrograde", "wsh", "porphyry", "dignity", "in_sect", "sun_relation"):
+            flat[f"{b}_{field}"] = p[field]
+
+    angles = chart["angles"]
+    for point, data in (("asc", angles["asc"]), ("mc", angles["mc"]),
+                        ("fortuna", chart["lots"]["Fortuna"]), ("spirit", chart["lots"]["Spirit"])):
+        flat[f"{point}_position"] = data["position"]
+        flat[f"{point}_sign"] = degree_info(data["position"]).sign
+        if point != "asc":
+            flat[f"{point}_wsh"] = data["wsh"]
+
+    for house in chart["houses"]:
+        flat[f"house_{house['number']}_sign"] = house["sign"]
+    for n, cusp in enumerate(chart["porphyry_cusps"], start=1):
+        flat[f"porphyry_{n}_cusp"] = cusp
+    for aspect in chart["aspects"]:
+        key = f"{aspect['planet1'].lower()}_{aspect['planet2'].lower()}"
+        flat[f"{key}_aspect"] = aspect["type"]
+        flat[f"{key}_orb"] = aspect["orb"]
+    return flat
+
+
+def _decode(rows) -> Iterator[Tuple[object, dict]]:
+    """레코드 행 배치 → (행, chart_data), 압축 형식은 배치 하나로 한 번에 복원"""
+    blobs = [r for r in rows if r.chart_blob is not None]
+    decoded = dict(zip(
+        (r.id for r in blobs),
+        decode_charts([(r.chart_blob, record_meta(r)) for r in blobs])
+    ))
+    for r in rows:
+        chart = decoded.get(r.id)
+        if chart is None:
+            chart = json.loads(r.chart_data) if isinstance(r.chart_data, str) else r.chart_data
+        if chart:
+            yield r, chart
+
+
+def iter_export_rows(db: Session, filters: Optional[SearchFilters] = None,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[dict]]:
+    """조건에 맞는 레코드를 평탄화한 행 배치로 (id 순, 서버 측 커서)"""
+    query = select(*RECORD_COLUMNS)
+    if filters is not None:
+        query = apply_filters(query, filters)
+    query = query.order_by(ChartRecord.id).execution_options(yield_per=batch_size)
+    for rows in db.execute(query).partitions():
+        yield [flatten_chart(row, chart) for row, chart in _decode(rows)]
+
+
+def _ndjson(batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        if batch:
+            yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch).encode("utf-8")
+
+
+def _csv(batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMN_NAMES)
+    for batch in batches:
+        for r in batch:
+            writer.writerow(["" if r[c] is None else r[c] for c in COLUMN_NAMES])
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _Sink:
+    """pyarrow 출력 대상 (쓰인 바이트를 모아 두었다가 배치마다 꺼냄)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ExportError("Parquet/Arrow export requires pyarrow (pip install pyarrow)")
+    types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string(), "bool": pa.bool_()}
+    return pa, pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def _columnar(batches: Iterable[List[dict]], fmt: str) -> Iterator[bytes]:
+    """배치 = Parquet row group / Arrow record batch"""
+    pa, schema = _arrow_schema()
+    sink = _Sink()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for batch in batches:
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def export_stream(db: Session, fmt: str, filters: Optional[SearchFilters] = None,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """형식별 직렬화된 바이트 청크 (형식·의존성 확인은 첫 청크 전에 끝냄)"""
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported export format: {fmt}")
+    if fmt in ("parquet", "arrow"):
+        _arrow_schema()
+    batches = iter_export_rows(db, filters, batch_size)
+    if fmt == "ndjson":
+        return _ndjson(batches)
+    if fmt == "csv":
+        return _csv(batches)
+    return _columnar(batches, fmt)
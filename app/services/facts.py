@@ -0,0 +1,92 @@
+"""
+천체별 정규화 데이터(chart_facts) 백필 및 분석 쿼리
+예) "화성이 염소자리, 홀사인 10하우스에 있는 차트" 를 인덱스 SQL 로 조회
+"""
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import ChartRecord, ChartFact
+from app.services.history import LIST_COLUMNS
+from app.services.records import build_facts, load_chart_data
+
+FACT_QUERY_LIMIT = 500
+
+
+class FactCondition(BaseModel):
+    """천체 하나에 대한 조건 (비어 있는 항목은 무시)"""
+    body: str
+    sign: Optional[str] = None
+    wsh: Optional[int] = None
+    porphyry: Optional[int] = None
+    dignity: Optional[str] = None
+    in_sect: Optional[bool] = None
+    sun_relation: Optional[str] = None
+    retrograde: Optional[bool] = None
+    degree_min: Optional[float] = None
+    degree_max: Optional[float] = None
+
+
+class FactQuery(BaseModel):
+    """모든 조건을 만족(AND)하는 차트 조회"""
+    conditions: List[FactCondition] = Field(..., min_length=1)
+    limit: int = Field(100, ge=1, le=FACT_QUERY_LIMIT)
+
+
+def _condition_subquery(db: Session, cond: FactCondition):
+    """조건을 만족하는 chart_id 서브쿼리"""
+    query = db.query(ChartFact.chart_id).filter(ChartFact.body == cond.body)
+    for field in ("sign", "wsh", "porphyry", "dignity", "in_sect", "sun_relation", "retrograde"):
+        value = getattr(cond, field)
+        if value is not None:
+            query = query.filter(getattr(ChartFact, field) == value)
+    if cond.degree_min is not None:
+        query = query.filter(ChartFact.degree >= cond.degree_min)
+    if cond.degree_max is not None:
+        query = query.filter(ChartFact.degree < cond.degree_max)
+    return query
+
+
+def query_facts(db: Session, fact_query: FactQuery) -> Tuple[int, List]:
+    """
+    조건을 모두 만족하는 차트 조회
+    
+    Returns:
+        tuple: (전체 일치 수, 최신순 목록 최대 limit 개)
+    """
+    subqueries = [_condition_subquery(db, c) for c in fact_query.conditions]
+    matched = subqueries[0]
+    if len(subqueries) > 1:
+        matched = matched.intersect(*subqueries[1:])
+    chart_ids = matched.subquery()
+
+    count = db.query(func.count()).select_from(chart_ids).scalar()
+    rows = db.query(*LIST_COLUMNS) \
+        .filter(ChartRecord.id.in_(db.query(chart_ids.c[0]))) \
+        .order_by(ChartRecord.created_at.desc(), ChartRecord.id.desc()) \
+        .limit(fact_query.limit).all()
+    return count, rows
+
+
+def backfill_facts(db: Session, batch_size: int = 500) -> int:
+    """chart_facts 가 없는 기존 레코드 채우기"""
+    done = 0
+    last_id = 0
+    while True:
+        records = db.query(ChartRecord) \
+            .filter(ChartRecord.id > last_id, ~ChartRecord.facts.any()) \
+            .order_by(ChartRecord.id).limit(batch_size).all()
+        if not records:
+            break
+        for record in records:
+            try:
+                record.facts = build_facts(load_chart_data(record))
+                done += 1
+            except (KeyError, TypeError, ValueError):
+                # 계산 결과가 아닌 레코드는 건너뜀
+                pass
+        last_id = records[-1].id
+        db.commit()
+    return done
@@ -0,0 +1,134 @@
+"""
+저장된 차트 partial(chart_result.html) 렌더 결과 캐시
+저장된 차트는 바뀌지 않으므로 차트 id 별로 렌더된 HTML 을 보관하고 ETag 로 브라우저 재검증(304)을 지원함.
+
+ETag = 차트 id + 레코드 버전(calc_version, chart_blob 해시, 메타데이터 해시) + 프래그먼트 버전
+메타데이터(이름, 장소, 생년월일시, 생성 시각)는 blob 에 없지만 HTML 에 표시되므로 함께 해시함
+(SQLite 는 삭제된 마지막 id 를 재사용하므로 같은 출생 데이터를 다른 이름으로 다시 저장해도 ETag 가 달라져야 함).
+프래그먼트 버전은 템플릿·표시 필드 복원 코드·계산 규칙·SVG 렌더러가 바뀌면 달라지므로
+배포나 재계산 후에는 캐시를 비우지 않아도 이전 항목이 자연히 무효화됨.
+같은 프로세스의 삭제·재계산은 invalidate 로 즉시 제거함.
+"""
+import hashlib
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from app.models import ChartRecord
+
+FRAGMENT_CACHE_SIZE = int(os.getenv("EPHE_FRAGMENT_CACHE_SIZE", "256"))
+FRAGMENT_CACHE_BYTES = int(os.getenv("EPHE_FRAGMENT_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+TEMPLATE = "partials/chart_result.html"
+TEMPLATE_DIR = "app/templates"
+
+# 읽을 때 표시 필드를 다시 만드는 모듈 (NumPy 를 불러오지 않도록 소스 파일만 읽음)
+DECODE_MODULES = ("app.services.chart_codec", "app.services.batch", "app.services.records")
+
+_fragment_version = None
+
+
+def fragment_version() -> str:
+    """템플릿 + 표시 필드 복원 코드 + 계산 규칙 + SVG 렌더러 버전"""
+    global _fragment_version
+    if _fragment_version is None:
+        from app.services.chart_cache import calculation_version
+        from app.services.svg_render import render_version
+
+        digest = hashlib.sha256()
+        with open(os.path.join(TEMPLATE_DIR, TEMPLATE), "rb") as f:
+            digest.update(f.read())
+        for name in DECODE_MODULES:
+            with open(importlib.util.find_spec(name).origin, "rb") as f:
+                digest.update(f.read())
+        digest.update(calculation_version().encode())
+        digest.update(render_version().encode())
+        _fragment_version = digest.hexdigest()[:12]
+    return _fragment_version
+
+
+# ETag 계산에 필요한 컬럼만 (chart_data JSON 은 읽지 않음)
+META_COLUMNS = (
+    ChartRecord.name,
+    ChartRecord.place_name,
+    ChartRecord.birth_date,
+    ChartRecord.birth_time,
+    ChartRecord.created_at,
+)
+ETAG_COLUMNS = (ChartRecord.id, ChartRecord.calc_version, ChartRecord.chart_blob) + META_COLUMNS
+
+
+def record_etag(row) -> str:
+    """레코드 내용이 바뀌면(재계산, 압축 변환, 같은 id 로 다른 레코드 저장) 달라지는 ETag (row: ETAG_COLUMNS 조회 결과)"""
+    content = hashlib.sha1(row.chart_blob).hexdigest()[:12] if row.chart_blob is not None else "json"
+    meta = "\x1f".join(str(getattr(row, col.key)) for col in META_COLUMNS)
+    meta_hash = hashlib.sha1(meta.encode("utf-8")).hexdigest()[:8]
+    return f'"c{row.id}-{row.calc_version or "none"}-{content}-{meta_hash}-{fragment_version()}"'
+
+
+class _FragmentLRU:
+    """차트 id → (ETag, HTML, UTF-8 바이트 수), 항목 수와 총 바이트 수로 제한"""
+
+    def __init__(self, size: int, max_bytes: int):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[int, Tuple[str, str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, chart_id: int, etag: str) -> Optional[str]:
+        """같은 ETag 로 저장된 HTML (버전이 다르면 None)"""
+        with self._lock:
+            item = self._items.get(chart_id)
+            if item is None or item[0] != etag:
+                return None
+            self._items.move_to_end(chart_id)
+            return item[1]
+
+    def put(self, chart_id: int, etag: str, html: str):
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(chart_id)
+            self._items[chart_id] = (etag, html, size)
+            self._bytes += size
+            while len(self._items) > self.size or self._bytes > self.max_bytes:
+                _, (_, _, old_size) = self._items.popitem(last=False)
+                self._bytes -= old_size
+
+    def invalidate(self, chart_ids: Iterable[int]):
+        with self._lock:
+            for chart_id in chart_ids:
+                self._discard(chart_id)
+
+    def _discard(self, chart_id: int):
+        item = self._items.pop(chart_id, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.not_modified
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": round((self.hits + self.not_modified) / total, 4) if total else 0.0,
+            "size": len(self._items),
+            "max_size": self.size,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+fragment_cache = _FragmentLRU(FRAGMENT_CACHE_SIZE, FRAGMENT_CACHE_BYTES)
@@ -0,0 +1,52 @@
+"""
+차트 기록 목록 조회 (키셋 페이지네이션)
+목록에 필요한 컬럼만 조회하여 chart_data JSON 을 읽지 않음.
+"""
+import os
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import ChartRecord
+
+HISTORY_PAGE_SIZE = int(os.getenv("EPHE_HISTORY_PAGE_SIZE", "50"))
+
+# history_list.html 에서 사용하는 컬럼
+LIST_COLUMNS = (
+    ChartRecord.id,
+    ChartRecord.name,
+    ChartRecord.birth_date,
+    ChartRecord.place_name,
+    ChartRecord.created_at,
+)
+
+
+def fetch_history_page(
+    db: Session,
+    cursor: Optional[int] = None,
+    limit: int = HISTORY_PAGE_SIZE
+) -> Tuple[List, Optional[int]]:
+    """
+    최신순 기록 한 페이지 조회
+    
+    Args:
+        cursor: 이전 페이지 마지막 레코드 id (없으면 첫 페이지)
+        
+    Returns:
+        tuple: (행 목록, 다음 페이지 cursor 또는 None)
+    """
+    query = db.query(*LIST_COLUMNS)
+    if cursor is not None:
+        # (created_at, id) 가 cursor 레코드보다 앞서는 행만 (created_at 인덱스 사용)
+        # cursor 레코드가 그 사이 삭제됐으면 id 순으로 이어감 (id 는 생성 순서대로 증가)
+        anchor = select(ChartRecord.created_at).where(ChartRecord.id == cursor).scalar_subquery()
+        query = query.filter(or_(
+            tuple_(ChartRecord.created_at, ChartRecord.id) < tuple_(anchor, cursor),
+            and_(anchor.is_(None), ChartRecord.id < cursor)
+        ))
+
+    rows = query.order_by(ChartRecord.created_at.desc(), ChartRecord.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
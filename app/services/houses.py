@@ -1,5 +1,5 @@
-import swisseph as swe
-from .planets import get_sign, SIGNS
+from .degrees import degree_info
+from . import ephemeris
 
 def calculate_houses_and_points(jd: float, lat: float, lon: float):
     """
@@ -7,7 +7,7 @@ def calculate_houses_and_points(jd: float, lat: float, lon: float):
     홀사인과 포피리 하우스 동시 계산.
     """
     # ASC, MC 등 포인트 계산
-    res = swe.houses(jd, lat, lon, b'W') # W: Whole Sign은 커스프만 제공
+    res = ephemeris.houses(jd, lat, lon, b'W') # W: Whole Sign은 커스프만 제공
     cusps = res[0] # 1~12 하우스 커스프
     ascmc = res[1]
     asc_long = ascmc[0]
@@ -56,7 +56,7 @@ def calculate_houses_and_points(jd: float, lat: float, lon: float):
     for i in range(1, 13):
         h_idx = i - 1
         start_long = wsh_cusps[h_idx]
-        sign_info = get_sign(start_long)
+        info = degree_info(start_long)
         
         # 하우스 분류 (앵글, 석시던트, 케이던트)
         if i in [1, 4, 7, 10]: cat = "Angular"
@@ -71,9 +71,9 @@ def calculate_houses_and_points(jd: float, lat: float, lon: float):
         wsh_data.append({
             "number": i,
             "start_long": start_long,
-            "sign": sign_info["name"],
-            "sign_symbol": sign_info["symbol"],
-            "ruler": sign_info["ruler"],
+            "sign": info.sign,
+            "sign_symbol": info.symbol,
+            "ruler": info.ruler,
             "category": cat,
             "fortune": fortune
         })
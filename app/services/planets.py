@@ -1,23 +1,7 @@
 import swisseph as swe
-from datetime import datetime
-import pytz
-from typing import Dict, List, Tuple, Optional
 
-# 1. 사인 (Tropical Zodiac) - 원소, 모드, 주인 반영
-SIGNS = [
-    ("Aries", "♈︎", "양", "fire", "cardinal", "Mars"),
-    ("Taurus", "♉︎", "황소", "earth", "fixed", "Venus"),
-    ("Gemini", "♊︎", "쌍둥이", "air", "mutable", "Mercury"),
-    ("Cancer", "♋︎", "게", "water", "cardinal", "Moon"),
-    ("Leo", "♌︎", "사자", "fire", "fixed", "Sun"),
-    ("Virgo", "♍︎", "처녀", "earth", "mutable", "Mercury"),
-    ("Libra", "♎︎", "천칭", "air", "cardinal", "Venus"),
-    ("Scorpio", "♏︎", "전갈", "water", "fixed", "Mars"),
-    ("Sagittarius", "♐︎", "사수", "fire", "mutable", "Jupiter"),
-    ("Capricorn", "♑︎", "염소", "earth", "cardinal", "Saturn"),
-    ("Aquarius", "♒︎", "물병", "air", "fixed", "Saturn"),
-    ("Pisces", "♓︎", "물고기", "water", "mutable", "Jupiter")
-]
+from . import ephemeris
+from .degrees import degree_info
 
 PLANETS = {
     swe.SUN: ("Sun", "☉︎", "태양"),
@@ -29,17 +13,6 @@ PLANETS = {
     swe.SATURN: ("Saturn", "♄︎", "토성")
 }
 
-# 8. 본질적 위계 데이터
-ESSENTIAL_DIGNITIES = {
-    "Sun": {"domicile": "Leo", "exaltation": "Aries", "detriment": "Aquarius", "fall": "Libra"},
-    "Moon": {"domicile": "Cancer", "exaltation": "Taurus", "detriment": "Capricorn", "fall": "Scorpio"},
-    "Mercury": {"domicile": ["Gemini", "Virgo"], "exaltation": "Virgo", "detriment": ["Sagittarius", "Pisces"], "fall": "Pisces"},
-    "Venus": {"domicile": ["Taurus", "Libra"], "exaltation": "Pisces", "detriment": ["Scorpio", "Aries"], "fall": "Virgo"},
-    "Mars": {"domicile": ["Aries", "Scorpio"], "exaltation": "Capricorn", "detriment": ["Libra", "Taurus"], "fall": "Cancer"},
-    "Jupiter": {"domicile": ["Sagittarius", "Pisces"], "exaltation": "Cancer", "detriment": ["Gemini", "Virgo"], "fall": "Capricorn"},
-    "Saturn": {"domicile": ["Capricorn", "Aquarius"], "exaltation": "Libra", "detriment": ["Cancer", "Leo"], "fall": "Aries"}
-}
-
 # 9. 조이 하우스
 JOYS = {
     "Mercury": 1, "Moon": 3, "Venus": 5, "Mars": 6,
@@ -47,13 +20,12 @@ JOYS = {
 }
 
 def get_sign(longitude: float) -> dict:
-    idx = int(longitude / 30) % 12
-    degree = longitude % 30
-    s = SIGNS[idx]
+    """사인 정보 dict (하위호환, 반복 호출 경로는 degree_info 사용)"""
+    info = degree_info(longitude)
     return {
-        "name": s[0], "symbol": s[1], "name_ko": s[2],
-        "element": s[3], "mode": s[4], "ruler": s[5],
-        "degree": degree
+        "name": info.sign, "symbol": info.symbol, "name_ko": info.name_ko,
+        "element": info.element, "mode": info.mode, "ruler": info.ruler,
+        "degree": longitude % 30
     }
 
 def format_position(longitude: float, symbol: str) -> str:
@@ -68,28 +40,28 @@ def calculate_planets_core(jd: float, lat: float, lon: float) -> dict:
     
     # 기본 행성 계산
     for pid, (name, sym, ko) in PLANETS.items():
-        res, _ = swe.calc_ut(jd, pid)
+        res, _ = ephemeris.calc_ut(jd, pid)
         long = res[0]
         speed = res[3]
-        sign_info = get_sign(long)
+        info = degree_info(long)
         
         planets_list.append({
             "id": pid, "name": name, "symbol": sym, "name_ko": ko,
             "position": long, "speed": speed, "retrograde": speed < 0,
-            "sign": sign_info["name"], "sign_symbol": sign_info["symbol"], "sign_ko": sign_info["name_ko"],
-            "element": sign_info["element"], "degree_f": format_position(long, sign_info["symbol"])
+            "sign": info.sign, "sign_symbol": info.symbol, "sign_ko": info.name_ko,
+            "element": info.element, "degree_f": format_position(long, info.symbol)
         })
         results[name] = planets_list[-1]
 
     # 노드 계산
-    res_n, _ = swe.calc_ut(jd, swe.MEAN_NODE)
+    res_n, _ = ephemeris.calc_ut(jd, swe.MEAN_NODE)
     n_long = res_n[0]
-    n_sign = get_sign(n_long)
+    n_symbol = degree_info(n_long).symbol
     s_long = (n_long + 180) % 360
-    s_sign = get_sign(s_long)
+    s_symbol = degree_info(s_long).symbol
     
-    results["North Node"] = {"name": "North Node", "symbol": "☊︎", "position": n_long, "sign_symbol": n_sign["symbol"], "degree_f": format_position(n_long, n_sign["symbol"])}
-    results["South Node"] = {"name": "South Node", "symbol": "☋︎", "position": s_long, "sign_symbol": s_sign["symbol"], "degree_f": format_position(s_long, s_sign["symbol"])}
+    results["North Node"] = {"name": "North Node", "symbol": "☊︎", "position": n_long, "sign_symbol": n_symbol, "degree_f": format_position(n_long, n_symbol)}
+    results["South Node"] = {"name": "South Node", "symbol": "☋︎", "position": s_long, "sign_symbol": s_symbol, "degree_f": format_position(s_long, s_symbol)}
 
     return results, planets_list
 
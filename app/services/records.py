@@ -0,0 +1,138 @@
+"""
+ChartRecord 생성/읽기 헬퍼
+"""
+import json
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.constants import ZODIAC_SIGNS, PLANET_KO
+from app.models import ChartRecord, ChartFact
+from app.services.chart_codec import decode_chart, encode_chart, record_meta
+from app.services.chart_service import ChartInput
+
+# 도미사일 행성 비트 (Sun=1, Moon=2, Mercury=4 ...)
+DOMICILE_BITS = {name: 1 << i for i, name in enumerate(PLANET_KO)}
+
+
+def chart_summary(chart_data: dict) -> dict:
+    """검색용 요약 컬럼 값 추출"""
+    planets = {p["name"]: p for p in chart_data["planets"]}
+    asc = chart_data["angles"]["asc"]["position"]
+    mask = 0
+    for name, bit in DOMICILE_BITS.items():
+        if name in planets and planets[name]["dignity"] == "Domicile":
+            mask |= bit
+    return {
+        "sun_sign": planets["Sun"]["sign"],
+        "moon_sign": planets["Moon"]["sign"],
+        "asc_sign": ZODIAC_SIGNS[int(asc / 30) % 12],
+        "is_day": chart_data["meta"]["is_day"],
+        "domicile_mask": mask,
+    }
+
+
+def fact_values(chart_data: dict) -> list:
+    """chart_data → 천체별 chart_facts 컬럼 값 목록 (행성, ASC, MC, 랏)"""
+    def fact(body, position, **extra):
+        return {
+            "body": body, "position": position,
+            "sign": ZODIAC_SIGNS[int(position / 30) % 12], "degree": position % 30,
+            "wsh": None, "porphyry": None, "dignity": None,
+            "in_sect": None, "sun_relation": None, "retrograde": None,
+            **extra
+        }
+
+    facts = [
+        fact(p["name"], p["position"],
+             wsh=p["wsh"], porphyry=p["porphyry"], dignity=p["dignity"],
+             in_sect=p["in_sect"], sun_relation=p["sun_relation"], retrograde=p["retrograde"])
+        for p in chart_data["planets"]
+    ]
+    angles = chart_data["angles"]
+    facts.append(fact("ASC", angles["asc"]["position"], wsh=1, porphyry=1))
+    facts.append(fact("MC", angles["mc"]["position"], wsh=angles["mc"]["wsh"], porphyry=angles["mc"]["porphyry"]))
+    for name, lot in chart_data.get("lots", {}).items():
+        facts.append(fact(name, lot["position"], wsh=lot["wsh"]))
+    return facts
+
+
+def build_facts(chart_data: dict) -> list:
+    """chart_data → 천체별 ChartFact 목록"""
+    return [ChartFact(**values) for values in fact_values(chart_data)]
+
+
+def record_values(name: str, place_name: str, chart_data: dict, chart_input: ChartInput,
+                  input_hash: str = None, calc_version: str = None) -> dict:
+    """계산 결과 → chart_records 컬럼 값 (요약 컬럼 포함)"""
+    return {
+        "name": name,
+        "birth_date": chart_input.birth_date,
+        "birth_time": chart_input.birth_time,
+        "place_name": place_name,
+        "latitude": chart_input.lat,
+        "longitude": chart_input.lon,
+        "timezone": chart_input.tz,
+        "gender": "",
+        "chart_blob": encode_chart(chart_data),
+        "chart_data": None,
+        "input_hash": input_hash,
+        "calc_version": calc_version,
+        **chart_summary(chart_data)
+    }
+
+
+def build_record(name: str, place_name: str, chart_data: dict, chart_input: ChartInput,
+                 input_hash: str = None, calc_version: str = None) -> ChartRecord:
+    """계산 결과로 ChartRecord 생성 (커밋은 호출자가 담당)"""
+    record = ChartRecord(**record_values(name, place_name, chart_data, chart_input, input_hash, calc_version))
+    record.facts = build_facts(chart_data)
+    return record
+
+
+def update_record(record: ChartRecord, chart_data: dict, input_hash: str = None, calc_version: str = None) -> ChartRecord:
+    """재계산 결과로 기존 레코드 갱신 (요약 컬럼, chart_facts 포함, 커밋은 호출자가 담당)"""
+    record.chart_blob = encode_chart(chart_data)
+    record.chart_data = None
+    record.input_hash = input_hash
+    record.calc_version = calc_version
+    for key, value in chart_summary(chart_data).items():
+        setattr(record, key, value)
+    record.facts = build_facts(chart_data)
+    return record
+
+
+def load_chart_data(record: ChartRecord) -> dict:
+    """저장된 차트 복원 (압축 형식, 또는 JSON 문자열로 이중 인코딩된 기존 레코드)"""
+    if record.chart_blob is not None:
+        return decode_chart(record.chart_blob, record_meta(record))
+    data = record.chart_data
+    if isinstance(data, str):
+        data = json.loads(data)
+    return data
+
+
+def find_duplicate(db: Session, name: str, birth_date: str, birth_time: str, place_name: str) -> Optional[ChartRecord]:
+    """이름, 날짜, 시간, 장소가 같은 저장 레코드"""
+    return db.query(ChartRecord).filter(
+        ChartRecord.name == name,
+        ChartRecord.birth_date == birth_date,
+        ChartRecord.birth_time == birth_time,
+        ChartRecord.place_name == place_name
+    ).first()
+
+
+def save_record(db: Session, record: ChartRecord) -> ChartRecord:
+    db.add(record)
+    db.commit()
+    return record
+
+
+def delete_record(db: Session, chart_id: int) -> bool:
+    """레코드 삭제 (천체 데이터 포함), 없으면 False"""
+    record = db.query(ChartRecord).filter(ChartRecord.id == chart_id).first()
+    if record is None:
+        return False
+    db.delete(record)
+    db.commit()
+    return True
@@ -0,0 +1,216 @@
+"""
+출생 시각 보정 (렉티피케이션) 탐색
+장소·타임존은 한 번만 확정하고, 현지 시각 구간 안에서 차트 판정이 바뀌는 순간을 모두 찾아 타임라인으로 반환함.
+
+- ASC / MC 사인 변경: swe.houses 를 ASC_STEP_MINUTES 간격으로 표본 추출해 사인 경계를 끼는 구간을 찾고,
+  구간마다 swe.houses 값 자체에 대해 근 찾기 (일리노이 가위치법, 1초 이내)
+- 행성 사인 진입: swe.calc_ut 를 PLANET_STEP_HOURS 간격으로 표본 추출해 같은 방식으로 근 찾기
+- 홀사인 하우스·섹트는 사건마다 바뀐 부분만 다시 계산함
+  (ASC 사인 변경 → 모든 행성 하우스, 행성 사인 진입 → 해당 행성 하우스, 섹트는 태양 하우스가 바뀔 때)
+  섹트 기준은 compute_natal_chart 와 같음 (태양이 홀사인 7-12하우스면 낮)
+
+사건 시각은 초 단위로 버림함 (해당 초 안에서 바뀜). 차트 입력은 분 단위이므로 바뀐 판정은 사건 시각의 다음 분부터 적용됨.
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import swisseph as swe
+
+from .chart_service import resolve_location
+from .degrees import SIGNS, degree_info
+from .ephemeris import DEFAULT_FLAGS
+from .planets import PLANETS
+from app.utils.concurrency import run_blocking
+from app.utils.timezone import from_utc, to_utc
+
+# 표본 간격 - 한 간격 안에서 같은 경계를 두 번 지나지 않을 만큼 짧게 (ASC 는 위도에 따라 분당 0.1-2°)
+ASC_STEP_MINUTES = 10
+PLANET_STEP_HOURS = 6
+
+MAX_WINDOW_HOURS = 72
+MAX_ITERATIONS = 60
+TOLERANCE_DAYS = 0.1 / 86400
+TOLERANCE_DEGREES = 1e-7
+UNIX_EPOCH = datetime(1970, 1, 1)
+UNIX_EPOCH_JD = 2440587.5
+
+
+def _wrap180(x: float) -> float:
+    """각도 차이 → (-180, 180]"""
+    return 180 - (180 - x) % 360
+
+
+def _julday(utc_dt: datetime) -> float:
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day,
+                      utc_dt.hour + utc_dt.minute / 60.0 + utc_dt.second / 3600.0)
+
+
+def _utc(jd: float) -> datetime:
+    return UNIX_EPOCH + timedelta(seconds=math.floor((jd - UNIX_EPOCH_JD) * 86400))
+
+
+def _root(f: Callable[[float], float], lo: float, hi: float, f_lo: float, f_hi: float) -> float:
+    """f(lo), f(hi) 부호가 다른 구간의 근 (일리노이 가위치법)"""
+    side = 0
+    for _ in range(MAX_ITERATIONS):
+        if f_lo == 0:
+            return lo
+        mid = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        f_mid = f(mid)
+        if abs(f_mid) < TOLERANCE_DEGREES:
+            return mid
+        if (f_mid > 0) == (f_hi > 0):
+            hi, f_hi = mid, f_mid
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, f_lo = mid, f_mid
+            if side == 1:
+                f_hi /= 2
+            side = 1
+        if hi - lo < TOLERANCE_DAYS:
+            break
+    return (lo + hi) / 2
+
+
+def _samples(start_jd: float, end_jd: float, step_days: float) -> List[float]:
+    n = max(1, math.ceil((end_jd - start_jd) / step_days))
+    return [start_jd + (end_jd - start_jd) * i / n for i in range(n + 1)]
+
+
+def _sign_changes(longitude: Callable[[float], float], jds: List[float],
+                  values: List[float]) -> List[Tuple[float, int]]:
+    """
+    표본 (시각, 황경) 에서 사인 경계(30° 배수)를 지나는 구간을 찾아 근 찾기
+    Returns: [(시각, 지난 뒤 사인 번호)]
+    """
+    changes = []
+    for lo, hi, v_lo, v_hi in zip(jds, jds[1:], values, values[1:]):
+        delta = _wrap180(v_hi - v_lo)
+        k_lo, k_hi = math.floor(v_lo / 30), math.floor((v_lo + delta) / 30)
+        # 순행이면 k_lo+1..k_hi 번째 경계, 역행이면 k_lo..k_hi+1 번째 경계를 지남
+        crossed = range(k_lo + 1, k_hi + 1) if delta > 0 else range(k_lo, k_hi, -1)
+        for k in crossed:
+            boundary = k * 30 % 360
+
+            def f(jd, boundary=boundary):
+                return _wrap180(longitude(jd) - boundary)
+
+            jd = _root(f, lo, hi, _wrap180(v_lo - boundary), _wrap180(v_hi - boundary))
+            changes.append((jd, k % 12 if delta > 0 else (k - 1) % 12))
+    return changes
+
+
+def rectify(lat: float, lon: float, tz_str: str, start: datetime, end: datetime) -> dict:
+    """
+    현지 시각 [start, end] 구간의 판정 변경 타임라인 (동기)
+
+    Returns:
+        {"initial": 시작 시각의 판정, "events": [{"time", "utc", "cause", 바뀐 항목...}]}
+        cause: "ASC", "MC" 또는 사인이 바뀐 행성 이름
+
+    Raises:
+        ValueError: 구간이 잘못되었거나 MAX_WINDOW_HOURS 초과
+    """
+    if start.tzinfo is not None or end.tzinfo is not None:
+        raise ValueError("start/end must be local times without UTC offset")
+    if not start < end <= start + timedelta(hours=MAX_WINDOW_HOURS):
+        raise ValueError(f"Invalid time window (max {MAX_WINDOW_HOURS} hours)")
+    start_jd = _julday(to_utc(start, tz_str))
+    end_jd = _julday(to_utc(end, tz_str))
+
+    # 1. ASC / MC: 같은 swe.houses 표본을 함께 사용
+    def asc(jd):
+        return swe.houses(jd, lat, lon, b'W')[1][0]
+
+    def mc(jd):
+        return swe.houses(jd, lat, lon, b'W')[1][1]
+
+    jds = _samples(start_jd, end_jd, ASC_STEP_MINUTES / 1440)
+    angles = [swe.houses(jd, lat, lon, b'W')[1] for jd in jds]
+    events = [(jd, "ASC", idx) for jd, idx in _sign_changes(asc, jds, [a[0] for a in angles])]
+    events += [(jd, "MC", idx) for jd, idx in _sign_changes(mc, jds, [a[1] for a in angles])]
+
+    # 2. 행성 사인 진입
+    jds_planet = _samples(start_jd, end_jd, PLANET_STEP_HOURS / 24)
+    signs: Dict[str, int] = {}
+    for pid, (name, _, _) in PLANETS.items():
+        def position(jd, pid=pid):
+            return swe.calc_ut(jd, pid, DEFAULT_FLAGS)[0][0]
+
+        values = [position(jd) for jd in jds_planet]
+        signs[name] = degree_info(values[0]).sign_idx
+        events += [(jd, name, idx) for jd, idx in _sign_changes(position, jds_planet, values)]
+
+    # 3. 시작 판정
+    asc_idx = degree_info(angles[0][0]).sign_idx
+    mc_idx = degree_info(angles[0][1]).sign_idx
+    houses = {name: (idx - asc_idx) % 12 + 1 for name, idx in signs.items()}
+    is_day = houses["Sun"] >= 7
+    initial = {
+        "asc_sign": SIGNS[asc_idx][0],
+        "mc_sign": SIGNS[mc_idx][0],
+        "is_day": is_day,
+        "signs": {name: SIGNS[idx][0] for name, idx in signs.items()},
+        "houses": dict(houses),
+    }
+
+    # 4. 사건 순서대로 바뀐 부분만 갱신
+    timeline = []
+    for jd, cause, idx in sorted(events):
+        event = {}
+        if cause == "ASC":
+            asc_idx = idx
+            event["asc_sign"] = SIGNS[idx][0]
+            affected = list(signs)
+        elif cause == "MC":
+            event["mc_sign"] = SIGNS[idx][0]
+            affected = []
+        else:
+            signs[cause] = idx
+            event["sign"] = SIGNS[idx][0]
+            affected = [cause]
+
+        changed = {}
+        for name in affected:
+            house = (signs[name] - asc_idx) % 12 + 1
+            if house != houses[name]:
+                houses[name] = changed[name] = house
+        if changed:
+            event["houses"] = changed
+        if "Sun" in changed and (houses["Sun"] >= 7) != is_day:
+            is_day = not is_day
+            event["is_day"] = is_day
+
+        utc = _utc(jd)
+        timeline.append({
+            "time": f"{from_utc(utc, tz_str):%Y-%m-%d %H:%M:%S}",
+            "utc": f"{utc:%Y-%m-%dT%H:%M:%S}Z",
+            "cause": cause,
+            **event,
+        })
+
+    return {"initial": initial, "events": timeline}
+
+
+async def rectify_place(place_name: str, start: datetime, end: datetime) -> dict:
+    """
+    장소 이름으로 보정 타임라인 계산 (지오코딩·타임존은 한 번만, 계산은 계산 스레드 풀)
+
+    Raises:
+        ChartError: 위치 조회 / 타임존 계산 실패
+        ValueError: 잘못된 구간
+    """
+    lat, lon, tz = await resolve_location(place_name)
+    result = await run_blocking(rectify, lat, lon, tz, start, end)
+    return {
+        "place_name": place_name,
+        "latitude": lat,
+        "longitude": lon,
+        "timezone": tz,
+        "start": f"{start:%Y-%m-%d %H:%M}",
+        "end": f"{end:%Y-%m-%d %H:%M}",
+        **result,
+    }
@@ -0,0 +1,151 @@
+"""
+차트 보관소 검색
+이름/장소 전문 검색(SQLite FTS5 또는 PostgreSQL tsvector) + 요약 컬럼 패싯 필터.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import column, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import ChartRecord
+from app.services.history import LIST_COLUMNS
+from app.services.records import DOMICILE_BITS, chart_summary, load_chart_data
+
+SEARCH_LIMIT = 100
+
+# PostgreSQL 전문 검색 대상 (GIN 인덱스와 같은 식이어야 인덱스 사용)
+PG_SEARCH_VECTOR = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(place_name, ''))"
+
+
+@dataclass
+class SearchFilters:
+    """검색 조건 (비어 있는 항목은 무시)"""
+    q: Optional[str] = None
+    sun_sign: Optional[str] = None
+    moon_sign: Optional[str] = None
+    asc_sign: Optional[str] = None
+    sect: Optional[str] = None        # "day" | "night"
+    domicile: Optional[str] = None    # 도미사일에 있는 행성 이름
+    date_from: Optional[str] = None   # YYYY-MM-DD
+    date_to: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not any(vars(self).values())
+
+
+def _is_sqlite() -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index():
+    """
+    전문 검색 인덱스 생성 (멱등)
+    - SQLite: chart_records 를 원본으로 하는 FTS5 테이블 + 동기화 트리거
+    - PostgreSQL: 이름/장소 tsvector GIN 인덱스
+    """
+    with engine.begin() as conn:
+        if _is_sqlite():
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chart_search'"
+            )).first()
+            if exists:
+                return
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE chart_search USING fts5("
+                "name, place_name, content='chart_records', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            ))
+            conn.execute(text(
+                "CREATE TRIGGER chart_search_ai AFTER INSERT ON chart_records BEGIN "
+                "INSERT INTO chart_search(rowid, name, place_name) VALUES (new.id, new.name, new.place_name); END"
+            ))
+            conn.execute(text(
+                "CREATE TRIGGER chart_search_ad AFTER DELETE ON chart_records BEGIN "
+                "INSERT INTO chart_search(chart_search, rowid, name, place_name) "
+                "VALUES ('delete', old.id, old.name, old.place_name); END"
+            ))
+            conn.execute(text(
+                "CREATE TRIGGER chart_search_au AFTER UPDATE OF name, place_name ON chart_records BEGIN "
+                "INSERT INTO chart_search(chart_search, rowid, name, place_name) "
+                "VALUES ('delete', old.id, old.name, old.place_name); "
+                "INSERT INTO chart_search(rowid, name, place_name) VALUES (new.id, new.name, new.place_name); END"
+            ))
+            conn.execute(text("INSERT INTO chart_search(chart_search) VALUES ('rebuild')"))
+        elif engine.dialect.name == "postgresql":
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_chart_records_search ON chart_records USING GIN ({PG_SEARCH_VECTOR})"
+            ))
+
+
+def rebuild_search_index():
+    """FTS5 인덱스 전체 재구성 (SQLite 전용)"""
+    if _is_sqlite():
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO chart_search(chart_search) VALUES ('rebuild')"))
+
+
+def _tokens(q: str) -> List[str]:
+    return [t for t in re.split(r"[\s,]+", q.strip()) if t]
+
+
+def _text_filter(q: str):
+    """검색어 → 전문 검색 조건 (각 단어 접두어 일치, AND)"""
+    tokens = _tokens(q)
+    if _is_sqlite():
+        match = " ".join('"' + t.replace('"', '""') + '"*' for t in tokens)
+        matched = text("SELECT rowid FROM chart_search WHERE chart_search MATCH :match") \
+            .bindparams(match=match).columns(column("rowid"))
+        return ChartRecord.id.in_(matched)
+    query = " & ".join(re.sub(r"[^\w]", "", t) + ":*" for t in tokens if re.sub(r"[^\w]", "", t))
+    return text(f"{PG_SEARCH_VECTOR} @@ to_tsquery('simple', :tsquery)").bindparams(tsquery=query)
+
+
+def apply_filters(query, filters: SearchFilters):
+    """검색 조건을 ChartRecord 쿼리에 적용 (검색, 내보내기 공용)"""
+    if filters.q and _tokens(filters.q):
+        query = query.filter(_text_filter(filters.q))
+    if filters.sun_sign:
+        query = query.filter(ChartRecord.sun_sign == filters.sun_sign)
+    if filters.moon_sign:
+        query = query.filter(ChartRecord.moon_sign == filters.moon_sign)
+    if filters.asc_sign:
+        query = query.filter(ChartRecord.asc_sign == filters.asc_sign)
+    if filters.sect in ("day", "night"):
+        query = query.filter(ChartRecord.is_day == (filters.sect == "day"))
+    if filters.domicile in DOMICILE_BITS:
+        query = query.filter(ChartRecord.domicile_mask.op("&")(DOMICILE_BITS[filters.domicile]) != 0)
+    if filters.date_from:
+        query = query.filter(ChartRecord.birth_date >= filters.date_from)
+    if filters.date_to:
+        query = query.filter(ChartRecord.birth_date <= filters.date_to)
+    return query
+
+
+def search_charts(db: Session, filters: SearchFilters, limit: int = SEARCH_LIMIT) -> List:
+    """조건에 맞는 기록 목록 (최신순, 목록 컬럼만)"""
+    query = apply_filters(db.query(*LIST_COLUMNS), filters)
+    return query.order_by(ChartRecord.created_at.desc(), ChartRecord.id.desc()).limit(limit).all()
+
+
+def backfill_summaries(db: Session, batch_size: int = 500) -> int:
+    """요약 컬럼이 비어 있는 기존 레코드 채우기"""
+    updated = 0
+    while True:
+        records = db.query(ChartRecord).filter(ChartRecord.sun_sign.is_(None)) \
+            .order_by(ChartRecord.id).limit(batch_size).all()
+        if not records:
+            break
+        for record in records:
+            try:
+                summary = chart_summary(load_chart_data(record))
+            except (KeyError, TypeError, ValueError):
+                # 요약할 수 없는 레코드는 다시 조회되지 않도록 빈 값 표시
+                summary = {"sun_sign": "", "moon_sign": "", "asc_sign": "", "is_day": None, "domicile_mask": 0}
+            for key, value in summary.items():
+                setattr(record, key, value)
+        db.commit()
+        updated += len(records)
+    return updated
@@ -0,0 +1,375 @@
+"""
+서버 측 차트 휠 SVG 렌더링 + 영구 렌더 캐시
+public/js/chart_engine.js 의 Morinus 스타일 휠(눈금, 텀, 페이스, 하우스, 천체)을 그대로 Python 으로 옮김.
+클라이언트는 완성된 SVG 를 받아 행성 클릭(애스펙트 광선) 같은 상호작용만 처리함.
+
+- 차트 해시: chart_data 내용 해시 (같은 차트 = 같은 URL)
+- 렌더 키: 차트 해시 + 렌더러 버전 + 하우스 시스템 + 레이어 → 변하지 않으므로 immutable 캐시 가능
+"""
+import hashlib
+import inspect
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from html import escape
+from typing import Any, Dict, List, Optional
+
+from app.constants import ZODIAC_SIGNS, ZODIAC_SYMBOLS
+from app.services import degrees
+from app.services.degrees import CHALDEAN_FACES, EGYPTIAN_TERMS
+
+RENDER_CACHE_PATH = os.getenv("EPHE_RENDER_CACHE_PATH", "./rendercache.db")
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("EPHE_RENDER_CACHE_MAX_ENTRIES", "20000"))
+RENDER_CACHE_MEMORY_ENTRIES = int(os.getenv("EPHE_RENDER_CACHE_MEMORY_ENTRIES", "256"))
+# 같은 차트를 다시 등록할 때 원본의 last_used 를 갱신하는 최소 간격 (초, 그 사이 등록은 DB 쓰기 없음)
+SOURCE_TOUCH_INTERVAL = 3600
+
+HOUSE_SYSTEMS = ("WSH", "Porphyry")
+
+PLANET_SYMBOLS = {
+    "Sun": "☉︎", "Moon": "☽︎", "Mercury": "☿︎", "Venus": "♀︎", "Mars": "♂︎",
+    "Jupiter": "♃︎", "Saturn": "♄︎", "North Node": "☊︎", "South Node": "☋︎",
+    "Fortuna": "⊗", "Spirit": "⊕"
+}
+
+COLORS = {"canvas_bg": "#F7F7F7", "main_lines": "#0000FF", "text": "#000000"}
+
+R = {"outer": 495, "zodiac": 435, "ticks": 425, "terms": 385, "faces": 345, "inner": 110}
+
+MONO = "font-family:'JetBrains Mono'"
+
+
+def _n(value: float) -> str:
+    """좌표 숫자 (소수 둘째 자리, 불필요한 0 제거)"""
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _pos(radius: float, deg: float):
+    rad = math.fmod(deg, 360) * (math.pi / 180)
+    return 500 + radius * math.cos(rad), 500 - radius * math.sin(rad)
+
+
+def _line(radius1: float, deg1: float, radius2: float, deg2: float, attrs: str) -> str:
+    x1, y1 = _pos(radius1, deg1)
+    x2, y2 = _pos(radius2, deg2)
+    return f'<line x1="{_n(x1)}" y1="{_n(y1)}" x2="{_n(x2)}" y2="{_n(y2)}" {attrs}/>'
+
+
+def _text(radius: float, deg: float, body: str, attrs: str) -> str:
+    x, y = _pos(radius, deg)
+    return f'<text x="{_n(x)}" y="{_n(y)}" text-anchor="middle" dominant-baseline="central" {attrs}>{body}</text>'
+
+
+def _js_round(value: float) -> int:
+    """Math.round 와 같은 반올림 (.5 는 올림)"""
+    return math.floor(value + 0.5)
+
+
+def format_degree(long: float) -> str:
+    """16° 07' 형식 (휠 표시용)"""
+    return f"{math.floor(long % 30)}° {math.floor((long % 1) * 60):02d}'"
+
+
+def render_chart_svg(chart_data: dict, house_system: str = "WSH",
+                     show_terms: bool = False, show_decans: bool = False) -> str:
+    """
+    차트 휠 SVG 문서 생성
+    천체 <g> 에 data-planet/data-pos 를, 휠 <g> 에 광선 반경과 회전각을 실어 클라이언트가 애스펙트 광선을 그림
+    """
+    c = COLORS
+    asc = chart_data["angles"]["asc"]["position"]
+    view_rotation = 180 - asc
+    h_limit = R["faces"] if show_decans else (R["terms"] if show_terms else R["zodiac"])
+
+    if house_system == "WSH":
+        asc_sign_start = math.floor(asc / 30) * 30
+        house_cusps = [(asc_sign_start + i * 30) % 360 for i in range(12)]
+    else:
+        house_cusps = chart_data["porphyry_cusps"]
+
+    out: List[str] = [
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 1000">',
+        f'<g id="chart-wheel" data-rotation="{view_rotation!r}" data-beam-radius="{h_limit}">',
+        f'<rect width="1000" height="1000" fill="{c["canvas_bg"]}"/>'
+    ]
+
+    # 1. 동심원
+    for idx, radius in enumerate((R["outer"], R["zodiac"], R["inner"])):
+        out.append(f'<circle cx="500" cy="500" r="{radius}" fill="none" stroke="{c["main_lines"]}" '
+                   f'stroke-width="{1.8 if idx == 0 else 1.0}"/>')
+    if show_terms:
+        out.append(f'<circle cx="500" cy="500" r="{R["terms"]}" fill="none" stroke="{c["main_lines"]}" stroke-width="0.8" opacity="0.4"/>')
+    if show_decans:
+        out.append(f'<circle cx="500" cy="500" r="{R["faces"]}" fill="none" stroke="{c["main_lines"]}" stroke-width="0.8" opacity="0.4"/>')
+    out.append(f'<circle cx="500" cy="500" r="{R["inner"]}" fill="#FAFAFA" stroke="{c["text"]}" stroke-width="1.2"/>')
+
+    # 2. 사인, 눈금, 텀, 페이스
+    for i, sign in enumerate(ZODIAC_SIGNS):
+        start_angle = i * 30 + view_rotation
+        out.append(_line(R["zodiac"], start_angle, R["outer"], start_angle, f'stroke="{c["main_lines"]}" stroke-width="2.2"'))
+
+        for d in range(1, 30):
+            tick = 12 if d % 10 == 0 else (8 if d % 5 == 0 else 4)
+            out.append(_line(R["zodiac"], start_angle + d, R["zodiac"] - tick, start_angle + d,
+                             f'stroke="{c["main_lines"]}" stroke-width="0.8" opacity="0.3"'))
+
+        out.append(_text((R["outer"] + R["zodiac"]) / 2, start_angle + 15, ZODIAC_SYMBOLS[i],
+                         'font-size="40" font-weight="950"'))
+
+        if show_terms:
+            cur = 0
+            for end, planet in EGYPTIAN_TERMS[sign]:
+                out.append(_line(R["terms"], start_angle + end, R["zodiac"], start_angle + end,
+                                 f'stroke="{c["text"]}" stroke-width="0.8" opacity="0.2"'))
+                out.append(_text((R["terms"] + R["zodiac"]) / 2, start_angle + (cur + end) / 2,
+                                 PLANET_SYMBOLS.get(planet, "•"), f'font-size="12" font-weight="800" fill="{c["text"]}"'))
+                cur = end
+
+        if show_decans:
+            for f in range(3):
+                out.append(_text((R["faces"] + (R["terms"] if show_terms else R["zodiac"])) / 2, start_angle + f * 10 + 5,
+                                 PLANET_SYMBOLS[CHALDEAN_FACES[i * 3 + f]],
+                                 f'font-size="11" font-weight="800" opacity="0.6" fill="{c["text"]}"'))
+
+    # 3. 하우스 & 축
+    for i, cusp in enumerate(house_cusps):
+        angle = cusp + view_rotation
+        out.append(_line(R["inner"], angle, h_limit, angle, f'stroke="{c["main_lines"]}" stroke-width="1.2" opacity="0.6"'))
+        out.append(_text(R["inner"] + 30, angle + 15, str(i + 1),
+                         f'font-size="18" font-weight="900" fill="{c["main_lines"]}" opacity="0.3"'))
+
+    mc_angle = chart_data["angles"]["mc"]["position"] + view_rotation
+    for angle, label, width in ((180, "ASC", 2.5), (0, "DSC", 1.2), (mc_angle, "MC", 2.5), (mc_angle + 180, "IC", 1.2)):
+        out.append(_line(R["inner"], angle, R["outer"] + 50, angle, f'stroke="{c["text"]}" stroke-width="{width}"'))
+        out.append(_text(R["outer"] + 75, angle, label, f'font-size="22" font-weight="950" style="{MONO}"'))
+
+    # 4. 천체 배치 (겹치면 안쪽 단계로)
+    objects = list(chart_data["planets"])
+    for name in ("Fortuna", "Spirit"):
+        lot = chart_data.get("lots", {}).get(name)
+        if lot:
+            objects.append({"name": name, "position": lot["position"]})
+    objects.sort(key=lambda o: o["position"])
+
+    base_radius = h_limit - 45
+    levels: Dict[int, int] = {}
+    # 애스펙트 광선은 클라이언트가 천체 아래 레이어에 그림
+    out.append('<g id="aspect-beams"></g>')
+    for obj in objects:
+        rot = math.fmod(obj["position"] + view_rotation + 360, 360)
+        level = 0
+        for step in range(-24, 25):
+            k = _js_round(math.fmod(rot + step / 2, 360))
+            if k in levels:
+                level = max(level, levels[k] + 1)
+        levels[_js_round(rot)] = level
+        x, y = _pos(base_radius - level * 65, rot)
+
+        name = escape(obj["name"])
+        rx = f'<text x="40" y="-30" fill="{c["text"]}" font-size="18" font-weight="950">Rx</text>' if obj.get("retrograde") else ""
+        out.append(
+            f'<g class="chart-planet" data-planet="{name}" data-pos="{obj["position"]!r}" data-rot="{rot!r}" '
+            f'transform="translate({_n(x)}, {_n(y)})" style="cursor:pointer">'
+            f'<text class="planet-glyph" x="0" y="-14" text-anchor="middle" dominant-baseline="central" font-size="42" '
+            f'font-weight="bold" fill="{c["text"]}">{PLANET_SYMBOLS.get(obj["name"], "•")}</text>'
+            f'<text x="0" y="24" text-anchor="middle" font-size="14" font-weight="950" fill="{c["text"]}" '
+            f'style="{MONO}">{format_degree(obj["position"])}</text>{rx}</g>'
+        )
+
+    meta = chart_data["meta"]
+    lines = [
+        meta["name"].upper(), meta["date"].replace("-", "."), meta["time"][:5] + " LMT",
+        "홀사인 (WSH)" if house_system == "WSH" else "포피리 (Porphyry)", "네이탈 (RADIX)"
+    ]
+    for i, text in enumerate(lines):
+        out.append(f'<text x="500" y="{460 + i * 20}" text-anchor="middle" font-size="14" font-weight="950" '
+                   f'style="{MONO}; opacity:0.8;">{escape(text)}</text>')
+
+    out.append("</g></svg>")
+    return "".join(out)
+
+
+def chart_hash(chart_data: dict) -> str:
+    """chart_data 내용 해시 (렌더 URL 키)"""
+    payload = json.dumps(chart_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+_render_version = None
+
+
+def render_version() -> str:
+    """렌더러 소스 해시 + 텀/페이스 표 (그리는 방식이 바뀌면 이전 SVG 무효화)"""
+    global _render_version
+    if _render_version is None:
+        source = inspect.getsource(sys.modules[__name__]) + inspect.getsource(degrees)
+        _render_version = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+    return _render_version
+
+
+def render_key(c_hash: str, house_system: str, show_terms: bool, show_decans: bool) -> str:
+    return f"{c_hash}:{render_version()}:{house_system}:{int(show_terms)}{int(show_decans)}"
+
+
+class RenderCache:
+    """
+    차트 원본 + 렌더 결과 영구 캐시 (메모리 LRU + SQLite)
+    - sources: 차트 해시 → chart_data (SVG 요청 시 다시 그릴 수 있도록 보관)
+    - svgs: 렌더 키 → SVG
+    - 두 테이블 모두 최대 항목 수 초과 시 오래 안 쓰인 순으로 제거
+    """
+
+    def __init__(self, path: str, max_entries: int, memory_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._registered: "OrderedDict[str, float]" = OrderedDict()  # 차트 해시 → 마지막 last_used 갱신 시각
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.renders = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources"
+                " (chart_hash TEXT PRIMARY KEY, chart_data TEXT NOT NULL, last_used REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sources)")}
+            if "last_used" not in columns:  # 이전 버전 파일
+                self._conn.execute("ALTER TABLE sources ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_sources_last_used ON sources (last_used)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS svgs (key TEXT PRIMARY KEY, svg TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_svgs_last_used ON svgs (last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, svg: str):
+        self._memory[key] = svg
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def register(self, chart_data: dict) -> str:
+        """
+        차트 원본 등록 후 차트 해시 반환
+        최근(SOURCE_TOUCH_INTERVAL 이내)에 등록한 차트는 DB 에 쓰지 않음
+        """
+        c_hash = chart_hash(chart_data)
+        now = time.time()
+        with self._lock:
+            touched = self._registered.get(c_hash)
+            if touched is not None and now - touched < SOURCE_TOUCH_INTERVAL:
+                return c_hash
+
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO sources (chart_hash, chart_data, last_used) VALUES (?, ?, ?)"
+                " ON CONFLICT (chart_hash) DO UPDATE SET last_used = excluded.last_used",
+                (c_hash, json.dumps(chart_data, ensure_ascii=False), now)
+            )
+            self._evict_sources(conn)
+            conn.commit()
+            self._registered[c_hash] = now
+            self._registered.move_to_end(c_hash)
+            while len(self._registered) > self.memory_entries:
+                self._registered.popitem(last=False)
+        return c_hash
+
+    def get_svg(self, c_hash: str, house_system: str = "WSH",
+                show_terms: bool = False, show_decans: bool = False) -> Optional[str]:
+        """렌더 결과 조회, 없으면 원본으로 렌더 후 저장 (원본도 없으면 None)"""
+        key = render_key(c_hash, house_system, show_terms, show_decans)
+        with self._lock:
+            svg = self._memory.get(key)
+            if svg is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return svg
+
+            conn = self._connect()
+            row = conn.execute("SELECT svg FROM svgs WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE svgs SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self._remember(key, row[0])
+                self.hits += 1
+                return row[0]
+
+            source = conn.execute("SELECT chart_data FROM sources WHERE chart_hash = ?", (c_hash,)).fetchone()
+            if source is not None:
+                conn.execute("UPDATE sources SET last_used = ? WHERE chart_hash = ?", (time.time(), c_hash))
+                conn.commit()
+        if source is None:
+            return None
+
+        svg = render_chart_svg(json.loads(source[0]), house_system, show_terms, show_decans)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO svgs (key, svg, last_used) VALUES (?, ?, ?)", (key, svg, time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+            self._remember(key, svg)
+            self.renders += 1
+        return svg
+
+    def _evict(self, conn: sqlite3.Connection):
+        """최대 항목 수 초과분 제거 (오래 안 쓰인 순)"""
+        (count,) = conn.execute("SELECT COUNT(*) FROM svgs").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM svgs WHERE key IN (SELECT key FROM svgs ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def _evict_sources(self, conn: sqlite3.Connection):
+        """차트 원본 최대 항목 수 초과분 제거 (오래 안 쓰인 순)"""
+        (count,) = conn.execute("SELECT COUNT(*) FROM sources").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            evicted = [row[0] for row in conn.execute(
+                "SELECT chart_hash FROM sources ORDER BY last_used ASC LIMIT ?", (overflow,)
+            )]
+            conn.executemany("DELETE FROM sources WHERE chart_hash = ?", [(h,) for h in evicted])
+            for c_hash in evicted:
+                self._registered.pop(c_hash, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            (entries,) = conn.execute("SELECT COUNT(*) FROM svgs").fetchone()
+            (sources,) = conn.execute("SELECT COUNT(*) FROM sources").fetchone()
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "renders": self.renders,
+                "entries": entries,
+                "sources": sources,
+                "max_entries": self.max_entries,
+            }
+
+
+# 싱글톤
+render_cache = RenderCache(RENDER_CACHE_PATH, RENDER_CACHE_MAX_ENTRIES, RENDER_CACHE_MEMORY_ENTRIES)
+
+
+def chart_svg_url(chart_data: dict) -> str:
+    """
+    차트 원본 등록 후 휠 SVG 주소 (하우스/레이어는 쿼리로 지정)
+    렌더러 버전을 주소에 넣어 렌더러가 바뀌면 immutable 로 캐시된 이전 SVG 를 쓰지 않게 함
+    """
+    return f"/ephe/api/v1/charts/{render_cache.register(chart_data)}/{render_version()}.svg"
@@ -0,0 +1,58 @@
+"""
+블로킹 작업 실행기
+Swiss Ephemeris, TimezoneFinder 같은 CPU 작업과 DB 세션 작업을 이벤트 루프 밖의 제한된 스레드 풀에서 실행함.
+DB 작업은 계산과 별도 풀을 써서 긴 계산 뒤에 짧은 조회가 줄서지 않게 함.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# 계산용 워커 스레드 수 (동시 계산 상한)
+CALC_WORKERS = int(os.getenv("EPHE_CALC_WORKERS", "4"))
+
+# DB 작업용 워커 스레드 수 (커넥션 풀 크기 + overflow 이하로 두면 풀 대기가 생기지 않음)
+DB_WORKERS = int(os.getenv("EPHE_DB_WORKERS", "8"))
+
+# 싱글톤으로 재사용
+_executor = None
+_db_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CALC_WORKERS, thread_name_prefix="ephe-calc")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """동기 함수를 계산 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="ephe-db")
+    return _db_executor
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    DB 세션 작업을 DB 스레드 풀에서 실행하고 결과를 기다림
+    한 요청의 세션은 한 번에 한 스레드에서만 쓰이도록 호출자가 순서대로 await 해야 함
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    global _executor, _db_executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=False)
+        _db_executor = None
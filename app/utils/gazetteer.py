@@ -0,0 +1,226 @@
+"""
+오프라인 지명 사전 (GeoNames TSV 기반)
+빌드 단계에서 정렬된 접두어 인덱스 파일을 만들고, 조회 시 mmap 으로 읽어 메모리 사용을 고정함.
+
+인덱스 파일 구조 (little-endian, 섹션은 8바이트 정렬)
+    header       : magic, 레코드/키/상위목록 개수, 섹션 오프셋
+    records      : (lat f64, lon f64, population u32, label_off u32, label_len u32)
+    labels       : UTF-8 표시명 blob
+    keys         : 정규화 이름 정렬 배열 (offsets u32 + blob) 과 키별 레코드 번호 u32
+    top          : 키가 많은 접두어별 인구순 상위 레코드 번호 (빈 칸은 0xFFFFFFFF)
+"""
+import bisect
+import heapq
+import mmap
+import struct
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"EPHEGAZ1"
+HEADER = struct.Struct("<8sIIII8Q")
+RECORD = struct.Struct("<ddIII")
+
+TOP_K = 10           # 접두어별 보관하는 상위 레코드 수 (= 최대 limit)
+SCAN_LIMIT = 64      # 이보다 키가 많은 접두어는 상위 목록을 미리 계산
+MAX_PREFIX_DEPTH = 12
+EMPTY = 0xFFFFFFFF
+
+# GeoNames 컬럼 번호
+COL_NAME, COL_ASCII, COL_ALT = 1, 2, 3
+COL_LAT, COL_LON, COL_FCLASS, COL_COUNTRY, COL_POP = 4, 5, 6, 8, 14
+
+
+def normalize_name(text: str) -> str:
+    """악센트 제거 + 소문자화 + 공백 정리 (한글 음절은 유지)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(unicodedata.normalize("NFC", stripped).casefold().split())
+
+
+def _align(buf: bytearray):
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def build_index(tsv_lines: Iterable[str], out_path: str, include_alternates: bool = True) -> Dict[str, int]:
+    """
+    GeoNames TSV(cities500.txt 등) → 인덱스 파일
+    인구 밀집지(feature class P)만 사용
+    """
+    records: List[Tuple[float, float, int, str]] = []
+    keys: List[Tuple[bytes, int]] = []
+
+    for line in tsv_lines:
+        cols = line.rstrip("\n").split("\t")
+        if len(cols) <= COL_POP or cols[COL_FCLASS] != "P":
+            continue
+        rid = len(records)
+        name = cols[COL_NAME]
+        label = f"{name}, {cols[COL_COUNTRY]}" if cols[COL_COUNTRY] else name
+        records.append((float(cols[COL_LAT]), float(cols[COL_LON]), int(cols[COL_POP] or 0), label))
+
+        names = {name, cols[COL_ASCII]}
+        if include_alternates and cols[COL_ALT]:
+            names.update(a for a in cols[COL_ALT].split(",") if 0 < len(a) <= 64 and "://" not in a)
+        for key in {normalize_name(n) for n in names}:
+            if key:
+                keys.append((key.encode("utf-8"), rid))
+
+    keys.sort()
+    population = [r[2] for r in records]
+
+    # 키가 많은 접두어의 인구순 상위 목록 (문자 단위 접두어)
+    top: Dict[bytes, List[int]] = {}
+    for depth in range(1, MAX_PREFIX_DEPTH + 1):
+        start = 0
+        while start < len(keys):
+            prefix = keys[start][0].decode("utf-8")[:depth]
+            if len(prefix) < depth:
+                start += 1
+                continue
+            pb = prefix.encode("utf-8")
+            end = start
+            while end < len(keys) and keys[end][0].startswith(pb):
+                end += 1
+            if end - start > SCAN_LIMIT:
+                rids = {keys[i][1] for i in range(start, end)}
+                top[pb] = heapq.nlargest(TOP_K, rids, key=lambda r: (population[r], -r))
+            start = end
+
+    buf = bytearray(HEADER.size)
+    offsets = []
+
+    offsets.append(len(buf))
+    label_blob = bytearray()
+    for lat, lon, pop, label in records:
+        lb = label.encode("utf-8")
+        buf += RECORD.pack(lat, lon, min(pop, EMPTY), len(label_blob), len(lb))
+        label_blob += lb
+    _align(buf)
+
+    offsets.append(len(buf))
+    buf += label_blob
+    _align(buf)
+
+    for items in (keys, sorted(top.items())):
+        key_offsets, blob = [0], bytearray()
+        for k, _ in items:
+            blob += k
+            key_offsets.append(len(blob))
+        offsets.append(len(buf))
+        buf += struct.pack(f"<{len(key_offsets)}I", *key_offsets)
+        _align(buf)
+        offsets.append(len(buf))
+        if items is keys:
+            buf += struct.pack(f"<{len(keys)}I", *(rid for _, rid in keys))
+        else:
+            for _, rids in items:
+                buf += struct.pack(f"<{TOP_K}I", *(rids + [EMPTY] * (TOP_K - len(rids))))
+        _align(buf)
+        offsets.append(len(buf))
+        buf += blob
+        _align(buf)
+
+    buf[:HEADER.size] = HEADER.pack(MAGIC, len(records), len(keys), len(top), TOP_K, *offsets)
+    with open(out_path, "wb") as f:
+        f.write(buf)
+
+    return {"records": len(records), "keys": len(keys), "top_prefixes": len(top), "bytes": len(buf)}
+
+
+class _SortedKeys:
+    """mmap 위 정렬 키 배열 (bisect 용 시퀀스)"""
+
+    def __init__(self, mm: mmap.mmap, offsets, blob_start: int):
+        self._mm = mm
+        self._offsets = offsets
+        self._blob = blob_start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._mm[self._blob + self._offsets[i]:self._blob + self._offsets[i + 1]]
+
+
+class Gazetteer:
+    """인덱스 파일 조회기 (읽기 전용 mmap)"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.n_records, self.n_keys, self.n_top, self.top_k,
+         rec_off, label_off, key_off, key_rec_off, key_blob_off,
+         top_off, top_ids_off, top_blob_off) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid gazetteer index: {path}")
+
+        mv = memoryview(self._mm)
+        self._rec_off = rec_off
+        self._label_off = label_off
+        self._keys = _SortedKeys(self._mm, mv[key_off:key_off + 4 * (self.n_keys + 1)].cast("I"), key_blob_off)
+        self._key_records = mv[key_rec_off:key_rec_off + 4 * self.n_keys].cast("I")
+        self._top = _SortedKeys(self._mm, mv[top_off:top_off + 4 * (self.n_top + 1)].cast("I"), top_blob_off)
+        self._top_ids = mv[top_ids_off:top_ids_off + 4 * self.top_k * self.n_top].cast("I")
+
+    def _record(self, rid: int) -> Tuple[float, float, int, str]:
+        lat, lon, pop, l_off, l_len = RECORD.unpack_from(self._mm, self._rec_off + rid * RECORD.size)
+        start = self._label_off + l_off
+        return lat, lon, pop, self._mm[start:start + l_len].decode("utf-8")
+
+    def _population(self, rid: int) -> int:
+        return RECORD.unpack_from(self._mm, self._rec_off + rid * RECORD.size)[2]
+
+    def _prefix_ids(self, prefix: bytes, limit: int) -> List[int]:
+        """접두어에 해당하는 레코드 번호 (인구순)"""
+        i = bisect.bisect_left(self._top, prefix)
+        if i < len(self._top) and self._top[i] == prefix:
+            ids = self._top_ids[i * self.top_k:(i + 1) * self.top_k]
+            return [r for r in ids if r != EMPTY][:limit]
+
+        # 미리 계산되지 않은 접두어는 범위가 작으므로 직접 순회
+        rids = set()
+        i = bisect.bisect_left(self._keys, prefix)
+        scanned = 0
+        while i < len(self._keys) and scanned < SCAN_LIMIT * 4 and self._keys[i].startswith(prefix):
+            rids.add(self._key_records[i])
+            i += 1
+            scanned += 1
+        return heapq.nlargest(limit, rids, key=lambda r: (self._population(r), -r))
+
+    def search(self, query: str, limit: int = 5) -> List[Dict]:
+        """접두어 자동완성 (search_places 와 같은 형태)"""
+        prefix = normalize_name(query).encode("utf-8")
+        if not prefix:
+            return []
+        results = []
+        for rid in self._prefix_ids(prefix, min(limit, self.top_k)):
+            lat, lon, _, label = self._record(rid)
+            results.append({"display_name": label, "lat": lat, "lon": lon})
+        return results
+
+    def lookup(self, place_name: str) -> Optional[Tuple[float, float]]:
+        """
+        장소명 → 좌표
+        "이름, 국가코드" 형태(search 결과 표시명)는 국가까지 맞춰 조회
+        """
+        name, _, country = place_name.rpartition(",")
+        if not name:
+            name, country = country, ""
+        country = country.strip().upper()
+        key = normalize_name(name).encode("utf-8")
+
+        best = None
+        i = bisect.bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i] == key:
+            rid = self._key_records[i]
+            lat, lon, pop, label = self._record(rid)
+            if not country or label.endswith(f", {country}"):
+                if best is None or pop > best[2]:
+                    best = (lat, lon, pop)
+            i += 1
+
+        if best is None:
+            # 정확히 일치하는 이름이 없으면 접두어 검색 1순위
+            results = self.search(name, limit=1)
+            return (results[0]["lat"], results[0]["lon"]) if results else None
+        return best[0], best[1]
@@ -0,0 +1,173 @@
+"""
+지오코딩 결과 영구 캐시 (SQLite)
+정규화된 장소 문자열을 키로 Nominatim 응답을 보관함.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# 환경변수 또는 기본값 사용
+GEOCACHE_PATH = os.getenv("EPHE_GEOCACHE_PATH", "./geocache.db")
+GEOCACHE_TTL = int(os.getenv("EPHE_GEOCACHE_TTL", str(180 * 24 * 3600)))  # 180일
+GEOCACHE_MAX_ENTRIES = int(os.getenv("EPHE_GEOCACHE_MAX_ENTRIES", "50000"))
+GEOCACHE_MEMORY_ENTRIES = int(os.getenv("EPHE_GEOCACHE_MEMORY_ENTRIES", "2048"))
+
+# 캐시 미스 표시 (None 은 "결과 없음"으로 캐시될 수 있음)
+MISS = object()
+
+
+def normalize_place(query: str) -> str:
+    """대소문자, 공백 차이를 제거한 캐시 키"""
+    return " ".join(query.casefold().split())
+
+
+class PlaceCache:
+    """
+    2단 캐시: 프로세스 메모리 LRU + SQLite 테이블
+    - TTL 이 지난 항목은 미스로 처리 후 삭제
+    - 최대 항목 수 초과 시 last_used 가 오래된 순으로 제거 (근사 LRU)
+    """
+
+    def __init__(self, path: str, ttl: int, max_entries: int, memory_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS places ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_places_last_used ON places (last_used)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(kind: str, query: str) -> str:
+        return f"{kind}:{normalize_place(query)}"
+
+    def _remember(self, key: str, created_at: float, value: Any):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_memory(self, kind: str, query: str) -> Any:
+        """
+        메모리 단계만 조회 (디스크 접근 없음, 이벤트 루프에서 호출 가능). 없으면 MISS
+        다른 스레드가 SQLite 작업 중이면 잠금을 기다리지 않고 MISS 반환 (호출자가 get 으로 재조회)
+        """
+        key = self._key(kind, query)
+        if not self._lock.acquire(blocking=False):
+            return MISS
+        try:
+            entry = self._memory.get(key)
+            if entry is None or time.time() - entry[0] >= self.ttl:
+                return MISS
+            self._memory.move_to_end(key)
+            self.hits += 1
+            self.memory_hits += 1
+            return entry[1]
+        finally:
+            self._lock.release()
+
+    def get(self, kind: str, query: str) -> Any:
+        """캐시 조회. 없거나 만료되면 MISS 반환"""
+        key = self._key(kind, query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry[1]
+
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, created_at FROM places WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return MISS
+            if now - row[1] >= self.ttl:
+                conn.execute("DELETE FROM places WHERE key = ?", (key,))
+                conn.commit()
+                self._memory.pop(key, None)
+                self.misses += 1
+                return MISS
+
+            conn.execute("UPDATE places SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.hits += 1
+            return value
+
+    def set(self, kind: str, query: str, value: Any):
+        """캐시 저장 (JSON 직렬화 가능한 값)"""
+        key = self._key(kind, query)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO places (key, payload, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+            self._remember(key, now, value)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """최대 항목 수 초과분 제거 (오래 안 쓰인 순)"""
+        (count,) = conn.execute("SELECT COUNT(*) FROM places").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM places WHERE key IN "
+                "(SELECT key FROM places ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM places")
+            conn.commit()
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 카운터 및 저장 항목 수"""
+        with self._lock:
+            (entries,) = self._connect().execute("SELECT COUNT(*) FROM places").fetchone()
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": entries,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+# 싱글톤
+place_cache = PlaceCache(GEOCACHE_PATH, GEOCACHE_TTL, GEOCACHE_MAX_ENTRIES, GEOCACHE_MEMORY_ENTRIES)
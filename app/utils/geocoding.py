@@ -1,39 +1,196 @@
-from geopy.geocoders import Nominatim
-from typing import Optional, List, Tuple, Dict
+import asyncio
+import os
+import time
+from typing import Optional, List, Tuple, Dict, Iterable
+
+from app.utils.concurrency import run_blocking
+from app.utils.geocache import place_cache, MISS
+from app.utils.gazetteer import Gazetteer
+
+# 지오코딩 백엔드 선택: nominatim (기본) 또는 offline (로컬 지명 사전)
+GEOCODER = os.getenv("EPHE_GEOCODER", "nominatim")
+GAZETTEER_PATH = os.getenv("EPHE_GAZETTEER_PATH", "./gazetteer.idx")
+
+# 동시에 진행할 Nominatim 요청 수 상한
+GEOCODE_CONCURRENCY = int(os.getenv("EPHE_GEOCODE_CONCURRENCY", "2"))
+GEOCODE_TIMEOUT = 10
+
+# geopy/aiohttp 는 import 비용이 커서 첫 네트워크 조회 때 불러옴 (User-Agent 필수)
+_geolocator = None
+
+# 비동기 클라이언트 (aiohttp 세션 재사용) - 이벤트 루프 안에서 지연 생성
+_async_geolocator = None
+_geocode_semaphore = None
+
+# 싱글톤으로 재사용 (인덱스 파일 mmap)
+_gazetteer = None
+
+
+def get_gazetteer() -> Gazetteer:
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer(GAZETTEER_PATH)
+    return _gazetteer
+
+
+def get_geolocator():
+    global _geolocator
+    if _geolocator is None:
+        from geopy.geocoders import Nominatim
+
+        _geolocator = Nominatim(user_agent="natal_chart_service")
+    return _geolocator
+
+
+def get_async_geolocator():
+    global _async_geolocator, _geocode_semaphore
+    if _async_geolocator is None:
+        from geopy.adapters import AioHTTPAdapter
+        from geopy.geocoders import Nominatim
+
+        _async_geolocator = Nominatim(user_agent="natal_chart_service", adapter_factory=AioHTTPAdapter)
+        _geocode_semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+    return _async_geolocator
+
+
+async def close_async_geolocator():
+    """앱 종료 시 aiohttp 세션 정리"""
+    global _async_geolocator
+    if _async_geolocator is not None:
+        await _async_geolocator.__aexit__(None, None, None)
+        _async_geolocator = None
+
+
+def _cached_coordinates(place_name: str):
+    """오프라인 사전 또는 캐시에서 좌표 조회. 없으면 MISS"""
+    if GEOCODER == "offline":
+        coords = get_gazetteer().lookup(place_name)
+        return coords if coords else (None, None)
+
+    cached = place_cache.get("coord", place_name)
+    if cached is not MISS:
+        return (cached[0], cached[1]) if cached else (None, None)
+    return MISS
+
+
+def _store_coordinates(place_name: str, location) -> Tuple[Optional[float], Optional[float]]:
+    if location:
+        place_cache.set("coord", place_name, [location.latitude, location.longitude])
+        return location.latitude, location.longitude
+    place_cache.set("coord", place_name, None)
+    return None, None
+
+
+def _store_places(query: str, locations) -> List[Dict[str, str]]:
+    results = []
+    for loc in locations or []:
+        results.append({
+            "display_name": loc.address,
+            "lat": loc.latitude,
+            "lon": loc.longitude
+        })
+    place_cache.set("search", query, results)
+    return results
 
-# 초기화 (User-Agent 필수)
-geolocator = Nominatim(user_agent="natal_chart_service")
 
 def get_coordinates(place_name: str) -> Tuple[Optional[float], Optional[float]]:
     """
     장소 이름으로 위도, 경도 조회 (동기)
+    캐시 히트 시 네트워크 요청 없이 반환
     """
+    cached = _cached_coordinates(place_name)
+    if cached is not MISS:
+        return cached
+
     try:
-        location = geolocator.geocode(place_name, timeout=10)
-        if location:
-            return location.latitude, location.longitude
+        location = get_geolocator().geocode(place_name, timeout=GEOCODE_TIMEOUT)
+        return _store_coordinates(place_name, location)
+    except Exception as e:
+        # 네트워크 오류는 캐시하지 않음
+        print(f"Geocoding Error: {e}")
         return None, None
+
+
+async def get_coordinates_async(place_name: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    get_coordinates 의 비동기 버전 (이벤트 루프를 막지 않음)
+    루프에서는 메모리 캐시만 보고, SQLite 캐시·지명 사전 조회와 저장은 스레드 풀에서 실행
+    """
+    if GEOCODER != "offline":
+        cached = place_cache.get_memory("coord", place_name)
+        if cached is not MISS:
+            return (cached[0], cached[1]) if cached else (None, None)
+
+    cached = await run_blocking(_cached_coordinates, place_name)
+    if cached is not MISS:
+        return cached
+
+    try:
+        client = get_async_geolocator()
+        async with _geocode_semaphore:
+            location = await client.geocode(place_name, timeout=GEOCODE_TIMEOUT)
+        return await run_blocking(_store_coordinates, place_name, location)
     except Exception as e:
         print(f"Geocoding Error: {e}")
         return None, None
 
+
 def search_places(query: str) -> List[Dict[str, str]]:
     """
     장소 검색 및 자동완성 결과 반환
     """
+    if GEOCODER == "offline":
+        return get_gazetteer().search(query)
+
+    cached = place_cache.get("search", query)
+    if cached is not MISS:
+        return cached
+
+    try:
+        locations = get_geolocator().geocode(query, exactly_one=False, limit=5)
+        return _store_places(query, locations)
+    except Exception as e:
+        print(f"Search Error: {e}")
+        return []
+
+
+async def search_places_async(query: str) -> List[Dict[str, str]]:
+    """search_places 의 비동기 버전 (디스크 접근은 스레드 풀에서 실행)"""
+    if GEOCODER == "offline":
+        return await run_blocking(get_gazetteer().search, query)
+
+    cached = place_cache.get_memory("search", query)
+    if cached is not MISS:
+        return cached
+
+    cached = await run_blocking(place_cache.get, "search", query)
+    if cached is not MISS:
+        return cached
+
     try:
-        locations = geolocator.geocode(query, exactly_one=False, limit=5)
-        if not locations:
-            return []
-        
-        results = []
-        for loc in locations:
-            results.append({
-                "display_name": loc.address,
-                "lat": loc.latitude,
-                "lon": loc.longitude
-            })
-        return results
+        client = get_async_geolocator()
+        async with _geocode_semaphore:
+            locations = await client.geocode(query, exactly_one=False, limit=5, timeout=GEOCODE_TIMEOUT)
+        return await run_blocking(_store_places, query, locations)
     except Exception as e:
         print(f"Search Error: {e}")
         return []
+
+
+def warm_cache(places: Iterable[str], delay: float = 1.0) -> Dict[str, int]:
+    """
+    장소 목록을 미리 조회해 캐시 채우기
+    Nominatim 이용 정책(초당 1회)을 지키기 위해 네트워크 조회 사이에 delay 적용
+    """
+    counts = {"cached": 0, "resolved": 0, "not_found": 0}
+    for place in places:
+        place = place.strip()
+        if not place:
+            continue
+        if place_cache.get("coord", place) is not MISS:
+            counts["cached"] += 1
+            continue
+        lat, lon = get_coordinates(place)
+        counts["resolved" if lat is not None else "not_found"] += 1
+        time.sleep(delay)
+    return counts
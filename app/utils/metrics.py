@@ -0,0 +1,146 @@
+"""
+Prometheus 텍스트 형식 지표 (외부 의존성 없음)
+- 단계별 소요 시간 히스토그램 (timing.stage 로 기록되는 모든 단계)
+- HTTP 요청 수 / 소요 시간 (라우트 경로 단위, MetricsMiddleware)
+- 차트 오류 코드별 횟수
+
+EPHE_METRICS_TOKEN 이 없으면 수집하지 않고 (기록 함수가 즉시 반환) /metrics 도 404.
+"""
+import bisect
+import hmac
+import os
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+METRICS_TOKEN = os.getenv("EPHE_METRICS_TOKEN", "")
+ENABLED = bool(METRICS_TOKEN)
+
+# 히스토그램 경계 (초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels: str, amount: float = 1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        # 라벨 → [버킷별 개수 (+Inf 포함), 합계]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, *labels: str, seconds: float):
+        if not ENABLED:
+            return
+        idx = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(BUCKETS) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+_registry: List = []
+
+STAGE_SECONDS = Histogram("ephe_stage_seconds", "Pipeline stage duration", ("stage",))
+REQUEST_SECONDS = Histogram("ephe_http_request_seconds", "HTTP request duration", ("method", "route"))
+REQUESTS = Counter("ephe_http_requests_total", "HTTP requests", ("method", "route", "status"))
+CHART_ERRORS = Counter("ephe_chart_errors_total", "Chart pipeline errors", ("code",))
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def authorized(header: str) -> bool:
+    """Authorization: Bearer <EPHE_METRICS_TOKEN> 확인"""
+    return ENABLED and hmac.compare_digest(header or "", f"Bearer {METRICS_TOKEN}")
+
+
+class MetricsMiddleware:
+    """
+    요청 수 / 소요 시간 기록 (순수 ASGI, 스트리밍 응답은 본문 전송 완료까지)
+    라우트는 매칭된 경로 템플릿(/partials/load/{chart_id})으로 기록해 라벨 수를 고정함
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUESTS.inc(scope["method"], route, str(status))
+            REQUEST_SECONDS.observe(scope["method"], route, seconds=time.perf_counter() - started)
@@ -0,0 +1,213 @@
+"""
+요청 단위 프로파일러 (재시작 없이 켜는 opt-in 방식)
+로그인한 세션의 요청에 `X-Ephe-Profile: 1` 헤더 또는 `?_profile=1` 쿼리가 있으면 그 요청 하나를 프로파일링함.
+
+- cProfile: 이벤트 루프 스레드 (라우터, 비동기 단계) → {id}.pstats
+- 샘플링: EPHE_PROFILE_INTERVAL 초마다 모든 스레드 스택 (계산 스레드 풀 포함) → {id}.folded
+  (flamegraph.pl / speedscope 에서 바로 여는 collapsed stack 형식, 첫 프레임은 스레드 이름)
+
+프로세스 전체를 관찰하므로 같은 시간에 처리된 다른 요청도 함께 기록됨. 동시에 하나만 프로파일링하며,
+이미 진행 중이면 그대로 통과시키고 X-Ephe-Profile-Id: busy 로 알림.
+최근 EPHE_PROFILE_KEEP 개만 EPHE_PROFILE_DIR 에 남김.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import secrets
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+PROFILE_DIR = os.getenv("EPHE_PROFILE_DIR", "./profiles")
+PROFILE_KEEP = int(os.getenv("EPHE_PROFILE_KEEP", "20"))
+PROFILE_INTERVAL = float(os.getenv("EPHE_PROFILE_INTERVAL", "0.002"))
+
+PROFILE_HEADER = b"x-ephe-profile"
+PROFILE_QUERY = "_profile"
+
+# 시각(ms) + 난수 → 이름순 = 시간순
+PROFILE_ID = re.compile(r"^\d{8}-\d{9}-[0-9a-f]{6}$")
+
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+_busy = threading.Lock()
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    cwd = os.getcwd() + os.sep
+    if path.startswith(cwd):
+        path = path[len(cwd):]
+    elif "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(_STDLIB):
+        path = path[len(_STDLIB):]
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ",")
+
+
+class _Sampler(threading.Thread):
+    """모든 스레드의 스택을 주기적으로 모아 collapsed stack 으로 집계"""
+
+    def __init__(self, interval: float):
+        super().__init__(name="ephe-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._done.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _requested(scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value.strip() not in (b"", b"0")
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get(PROFILE_QUERY, ["0"])[0] not in ("", "0")
+
+
+def _save(profile_id: str, profiler: cProfile.Profile, sampler: _Sampler, meta: dict):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, profile_id)
+    profiler.dump_stats(base + ".pstats")
+    with open(base + ".folded", "w", encoding="utf-8") as f:
+        f.write(sampler.folded())
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    _prune()
+
+
+def _prune():
+    for meta in list_profiles()[PROFILE_KEEP:]:
+        for ext in (".json", ".pstats", ".folded"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, meta["id"] + ext))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[dict]:
+    """저장된 프로파일 메타데이터 (최신순)"""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in sorted(names, reverse=True):
+        if not name.endswith(".json") or not PROFILE_ID.match(name[:-5]):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(profile_id: str, ext: str) -> Optional[str]:
+    """프로파일 파일 경로 (잘못된 id 나 없는 파일이면 None)"""
+    if not PROFILE_ID.match(profile_id) or ext not in (".json", ".pstats", ".folded"):
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id + ext)
+    return path if os.path.exists(path) else None
+
+
+def profile_summary(profile_id: str, sort: str = "cumulative", limit: int = 60) -> Optional[str]:
+    """pstats 상위 함수 표 (텍스트)"""
+    path = profile_path(profile_id, ".pstats")
+    if path is None:
+        return None
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilerMiddleware:
+    """
+    요청 단위 프로파일링 (순수 ASGI, SessionMiddleware 안쪽에서 실행되어야 세션을 볼 수 있음)
+    응답 헤더 X-Ephe-Profile-Id 로 저장된 프로파일 id 를 알려줌
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope) \
+                or not scope.get("session", {}).get("authenticated"):
+            await self.app(scope, receive, send)
+            return
+
+        if not _busy.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"busy"))
+            return
+
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        profile_id = f"{stamp}{int(now % 1 * 1000):03d}-{secrets.token_hex(3)}"
+        status = 500
+        sampler = _Sampler(PROFILE_INTERVAL)
+        profiler = cProfile.Profile()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await _with_header(send, profile_id.encode())(message)
+
+        started = time.perf_counter()
+        try:
+            sampler.start()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+                sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            _save(profile_id, profiler, sampler, {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status,
+                "duration_ms": round(duration_ms, 1),
+                "samples": sampler.samples,
+                "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+            })
+        finally:
+            _busy.release()
+
+
+def _with_header(send, value: bytes):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message = dict(message, headers=list(message.get("headers", [])) + [(b"x-ephe-profile-id", value)])
+        await send(message)
+    return wrapped
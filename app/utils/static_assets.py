@@ -0,0 +1,233 @@
+"""
+정적 파일 서빙 (public/)
+- 내용 해시 파일명: 템플릿의 static_url("js/chart_engine.js") → /ephe/static/js/chart_engine.<해시>.js
+  해시 주소는 내용이 바뀌면 달라지므로 1년 immutable 캐시, 원래 이름은 매번 재검증(no-cache + ETag)
+- 사전 압축본: 파일 옆의 .br / .gz 를 Accept-Encoding 에 따라 그대로 전송 (요청마다 압축하지 않음)
+  python -m app.cli static-build 로 생성하며, 없으면 원본을 보냄
+- 해시 주소의 작은 파일은 내용이 바뀌지 않으므로 첫 요청 때 메모리에 올려 파일 I/O 스레드 왕복 없이 응답
+- StaticShortcutMiddleware: /ephe/static/ 요청은 세션·인증·프로파일러를 거치지 않고 바로 StaticFiles 로 보냄
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.routing import Match
+from starlette.staticfiles import NotModifiedResponse
+
+STATIC_DIR = "public"
+STATIC_URL = "/ephe/static"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Accept-Encoding 우선순위 순 (인코딩, 확장자)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSED_EXTS = tuple(ext for _, ext in ENCODINGS)
+
+# 이보다 작은 파일은 압축 이득이 헤더 비용보다 작음
+MIN_COMPRESS_BYTES = 512
+
+# 메모리에 올릴 해시 주소 파일 크기 상한
+MEMORY_MAX_BYTES = 1024 * 1024
+
+# name.<해시 10자>.ext
+HASHED_NAME = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{10}(?P<ext>\.[^./]+)$")
+
+_manifest: Optional[Dict[str, str]] = None
+_reverse: Dict[str, str] = {}
+# (해시 경로, 인코딩) → (본문, 미디어 타입), 인코딩 None = 원본
+_memory: Dict[Tuple[str, Optional[str]], Optional[Tuple[bytes, str]]] = {}
+
+
+def _asset_files(directory: str):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(COMPRESSED_EXTS):
+                continue
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, directory).replace(os.sep, "/"), path
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest[:10]}{ext}"
+
+
+def asset_manifest() -> Dict[str, str]:
+    """원래 경로 → 해시 경로 (첫 호출 때 public/ 을 한 번 읽음)"""
+    global _manifest
+    if _manifest is None:
+        manifest = {}
+        for rel, path in _asset_files(STATIC_DIR):
+            with open(path, "rb") as f:
+                manifest[rel] = _hashed_name(rel, hashlib.sha256(f.read()).hexdigest())
+        _reverse.clear()
+        _reverse.update({hashed: rel for rel, hashed in manifest.items()})
+        _manifest = manifest
+    return _manifest
+
+
+def static_url(path: str) -> str:
+    """템플릿용 정적 파일 주소 (해시 파일명, 목록에 없으면 원래 이름)"""
+    return f"{STATIC_URL}/{asset_manifest().get(path, path)}"
+
+
+def build_precompressed(directory: str = STATIC_DIR) -> dict:
+    """정적 파일마다 .gz (+ brotli 패키지가 있으면 .br) 생성, 원본보다 작을 때만 남김"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    counts = {"files": 0, "gzip": 0, "br": 0, "skipped": 0}
+    for _, path in _asset_files(directory):
+        counts["files"] += 1
+        with open(path, "rb") as f:
+            data = f.read()
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+        for ext, blob in variants.items():
+            target = path + ext
+            if len(data) < MIN_COMPRESS_BYTES or len(blob) >= len(data):
+                if os.path.exists(target):
+                    os.remove(target)
+                counts["skipped"] += 1
+                continue
+            with open(target, "wb") as f:
+                f.write(blob)
+            counts["gzip" if ext == ".gz" else "br"] += 1
+    return counts
+
+
+def _accepted(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class AssetStaticFiles(StaticFiles):
+    """해시 파일명 해석 + 사전 압축본 선택 + 캐시 헤더"""
+
+    async def get_response(self, path: str, scope):
+        rel = path.replace(os.sep, "/")
+        asset_manifest()
+        original = _reverse.get(rel)
+        if original is not None:
+            cached = self._memory_response(rel, original, scope)
+            if cached is not None:
+                return cached
+            cache_control = IMMUTABLE
+        else:
+            # 이전 배포의 해시 주소는 현재 파일로 응답하되 오래 캐시하지 않음
+            match = HASHED_NAME.match(rel)
+            original = match.group("stem") + match.group("ext") if match else rel
+            cache_control = REVALIDATE
+        response = await super().get_response(original.replace("/", os.sep), scope)
+        response.headers["cache-control"] = cache_control
+        return response
+
+    def _memory_response(self, rel: str, original: str, scope) -> Optional[Response]:
+        """해시 주소 응답을 메모리에서 (ETag = 내용 해시 + 인코딩)"""
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+        request_headers = Headers(scope=scope)
+        accepted = _accepted(request_headers.get("accept-encoding", ""))
+        for encoding, ext in ENCODINGS + ((None, ""),):
+            if encoding is not None and encoding not in accepted:
+                continue
+            key = (rel, encoding)
+            if key not in _memory:
+                _memory[key] = self._load(original, ext)
+            item = _memory[key]
+            if item is None:
+                continue
+            body, media_type = item
+            headers = {
+                "cache-control": IMMUTABLE,
+                "vary": "Accept-Encoding",
+                "etag": f'"{rel.rsplit(".", 2)[-2]}-{encoding or "identity"}"',
+            }
+            if encoding is not None:
+                headers["content-encoding"] = encoding
+            if self.is_not_modified(Headers(headers=headers), request_headers):
+                return NotModifiedResponse(headers)
+            return Response(body, media_type=media_type, headers=headers)
+        return None
+
+    def _load(self, original: str, ext: str) -> Optional[Tuple[bytes, str]]:
+        full_path, stat_result = self.lookup_path(original.replace("/", os.sep) + ext)
+        if stat_result is None or stat_result.st_size > MEMORY_MAX_BYTES:
+            return None
+        with open(full_path, "rb") as f:
+            body = f.read()
+        return body, mimetypes.guess_type(original)[0] or "text/plain"
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        accepted = _accepted(request_headers.get("accept-encoding", ""))
+        for encoding, ext in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(str(full_path) + ext)
+            except OSError:
+                continue
+            media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+            response = FileResponse(
+                str(full_path) + ext, status_code=status_code, stat_result=variant_stat,
+                media_type=media_type, headers={"content-encoding": encoding}
+            )
+            break
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        # 압축본이 없어도 중간 캐시가 인코딩별로 구분하도록
+        response.headers["vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class StaticShortcutMiddleware:
+    """
+    정적 파일 요청을 라우터 앞에서 바로 처리 (순수 ASGI)
+    세션 쿠키 복원·인증·프로파일러를 거치지 않으므로 가장 바깥쪽 근처(세션 미들웨어보다 바깥)에 둠
+    """
+
+    def __init__(self, app, mount, prefix: str = STATIC_URL + "/"):
+        self.app = app
+        self.mount = mount
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        match, child_scope = self.mount.matches(scope)
+        if match is not Match.FULL:
+            await self.app(scope, receive, send)
+            return
+        scope.update(child_scope)
+        scope["route"] = self.mount
+        try:
+            await self.mount.app(scope, receive, send)
+        except HTTPException as exc:
+            # ExceptionMiddleware 바깥이므로 직접 응답
+            await PlainTextResponse(exc.detail, status_code=exc.status_code, headers=exc.headers)(scope, receive, send)
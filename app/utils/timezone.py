@@ -1,36 +1,187 @@
-"""좌표 → 타임존 변환"""
-from timezonefinder import TimezoneFinder
+"""
+좌표 → 타임존 변환
+- TimezoneFinder 는 import 시점이 아니라 앱 시작 후 미리 초기화 (EPHE_TZ_WARM: background | eager | off)
+- 좌표를 격자(EPHE_TZ_GRID 도)로 반올림한 칸 단위 LRU 캐시
+  칸 안 3x3 점이 모두 같은 타임존일 때만 칸 전체를 캐시하고,
+  경계에 걸친 칸은 매번 정확한 폴리곤 조회로 처리함 (칸보다 작은 고립 구역은 구분하지 못함)
+- 현지 시각 → UTC 변환용 pytz 타임존 객체 및 변환 결과 캐시
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
 
+TZ_CACHE_SIZE = int(os.getenv("EPHE_TZ_CACHE_SIZE", "4096"))
+TZ_GRID = float(os.getenv("EPHE_TZ_GRID", "0.01"))  # 약 1km
+TZ_WARM = os.getenv("EPHE_TZ_WARM", "background")
+
+# 경계 칸 표시
+BORDER = "__border__"
 
 # 싱글톤으로 재사용 (초기화 비용이 큼)
 _tf = None
+_tf_lock = threading.Lock()
+_init_ms: Optional[float] = None
 
 
 def get_timezone_finder():
-    global _tf
+    global _tf, _init_ms
     if _tf is None:
-        _tf = TimezoneFinder()
+        with _tf_lock:
+            if _tf is None:
+                started = time.perf_counter()
+                from timezonefinder import TimezoneFinder
+
+                tf = TimezoneFinder()
+                tf.timezone_at(lat=0.0, lng=0.0)  # 지연 로딩되는 데이터까지 미리 읽음
+                _init_ms = (time.perf_counter() - started) * 1000
+                _tf = tf
     return _tf
 
 
+def warm_up(background: bool = True) -> Optional[threading.Thread]:
+    """TimezoneFinder 미리 초기화 (background 면 데몬 스레드에서)"""
+    if not background:
+        get_timezone_finder()
+        return None
+    thread = threading.Thread(target=get_timezone_finder, name="ephe-tz-warm", daemon=True)
+    thread.start()
+    return thread
+
+
+class _ZoneCache:
+    """격자 칸 (위도 칸, 경도 칸) → 타임존 또는 BORDER"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._items: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.border = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[int, int]) -> Optional[str]:
+        with self._lock:
+            zone = self._items.get(key)
+            if zone is not None:
+                self._items.move_to_end(key)
+            return zone
+
+    def put(self, key: Tuple[int, int], zone: str):
+        with self._lock:
+            self._items[key] = zone
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.border + self.misses
+        return {
+            "hits": self.hits,
+            "border_lookups": self.border,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._items),
+            "max_size": self.size,
+            "grid": TZ_GRID,
+            "ready": _tf is not None,
+            "init_ms": round(_init_ms, 1) if _init_ms is not None else None,
+            "zones": _info(get_zone),
+            "utc_offsets": _info(_utc_offset),
+        }
+
+
+zone_cache = _ZoneCache(TZ_CACHE_SIZE)
+
+
+def _cell_zone(tf, cell: Tuple[int, int]) -> str:
+    """칸 안 3x3 점(중심, 변 중점, 꼭짓점)의 타임존이 모두 같으면 그 타임존, 아니면 BORDER"""
+    lat_c, lon_c = cell[0] * TZ_GRID, cell[1] * TZ_GRID
+    half = TZ_GRID / 2
+    zones = set()
+    for dlat, dlon in ((a, b) for a in (0, -half, half) for b in (0, -half, half)):
+        lat = min(max(lat_c + dlat, -90.0), 90.0)
+        lon = (lon_c + dlon + 180) % 360 - 180
+        zones.add(tf.timezone_at(lat=lat, lng=lon))
+    zone = zones.pop() if len(zones) == 1 else None
+    return zone or BORDER
+
+
 def get_timezone(latitude: float, longitude: float) -> str:
     """
     좌표로부터 타임존 문자열 반환
-    
+
     Args:
         latitude: 위도
         longitude: 경도
-        
+
     Returns:
         "Asia/Seoul" 같은 IANA 타임존 문자열
-        
+
     Raises:
         ValueError: 타임존을 찾을 수 없을 때
     """
     tf = get_timezone_finder()
+    cell = (round(latitude / TZ_GRID), round(longitude / TZ_GRID))
+    zone = zone_cache.get(cell)
+    if zone is None:
+        zone_cache.misses += 1
+        zone = _cell_zone(tf, cell)
+        zone_cache.put(cell, zone)
+    elif zone == BORDER:
+        zone_cache.border += 1
+    else:
+        zone_cache.hits += 1
+
+    if zone != BORDER:
+        return zone
+
     tz = tf.timezone_at(lat=latitude, lng=longitude)
-    
+
     if tz is None:
         raise ValueError(f"Cannot find timezone for coordinates: ({latitude}, {longitude})")
-    
+
     return tz
+
+
+@lru_cache(maxsize=256)
+def get_zone(tz_str: str):
+    """pytz 타임존 객체 캐시"""
+    import pytz
+
+    return pytz.timezone(tz_str)
+
+
+@lru_cache(maxsize=TZ_CACHE_SIZE)
+def _utc_offset(tz_str: str, local_dt: datetime):
+    return get_zone(tz_str).localize(local_dt).utcoffset()
+
+
+def to_utc(local_dt: datetime, tz_str: str) -> datetime:
+    """현지 시각(naive) → UTC naive (is_dst 는 pytz 기본값)"""
+    return local_dt - _utc_offset(tz_str, local_dt)
+
+
+def from_utc(utc_dt: datetime, tz_str: str) -> datetime:
+    """UTC naive → 현지 시각(naive)"""
+    import pytz
+
+    return pytz.utc.localize(utc_dt).astimezone(get_zone(tz_str)).replace(tzinfo=None)
+
+
+def _info(func) -> dict:
+    info = func.cache_info()
+    total = info.hits + info.misses
+    return {"hits": info.hits, "misses": info.misses, "hit_rate": round(info.hits / total, 4) if total else 0.0}
+
+
+def timezone_stats() -> dict:
+    """타임존 캐시 히트율 + 초기화 시간"""
+    return zone_cache.stats()
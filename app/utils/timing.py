@@ -0,0 +1,26 @@
+"""파이프라인 단계별 소요 시간 기록"""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from app.utils.metrics import STAGE_SECONDS
+
+
+@contextmanager
+def stage(timings: Dict[str, float], name: str):
+    """
+    with 블록 소요 시간을 timings[name] 에 누적 (ms)
+    await 를 포함한 블록에도 사용 가능, 지표 수집이 켜져 있으면 ephe_stage_seconds 에도 기록
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        timings[name] = timings.get(name, 0.0) + elapsed
+        STAGE_SECONDS.observe(name, seconds=elapsed / 1000)
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """브라우저 개발자 도구에서 볼 수 있는 Server-Timing 헤더 값"""
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
@@ -0,0 +1,133 @@
+"""
+미들웨어 / 정적 파일 처리량 측정 (req/s)
+로그인한 세션 쿠키를 가진 클라이언트로 다음 요청을 반복해 초당 처리 수와 p95 를 잼.
+
+- static       : /ephe/static/js/chart_engine.js (압축 미지원 클라이언트)
+- static-gzip  : 같은 파일, Accept-Encoding: gzip, br (해시 주소)
+- page         : 로그인한 상태의 GET /ephe/ (대시보드로 303, 전체 미들웨어 + 라우터 통과)
+
+    python -m benchmarks.asgi_overhead --concurrency 16 --duration 3
+    python -m benchmarks.asgi_overhead --legacy   # 이전 방식(BaseHTTPMiddleware 인증 + StaticFiles) 재현
+
+네트워크 없이 httpx ASGITransport 로 앱을 직접 호출하므로 값에는 클라이언트 비용도 포함됨 (두 방식 비교용).
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+CASES = ("static", "static-gzip", "page")
+
+
+def _install_legacy(app):
+    """인증 미들웨어와 정적 파일 마운트를 이전 구현으로 교체 (첫 요청 전에 호출)"""
+    from fastapi.staticfiles import StaticFiles
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.responses import RedirectResponse
+
+    from app import main
+    from app.utils.static_assets import StaticShortcutMiddleware
+
+    class LegacySessionAuthMiddleware(BaseHTTPMiddleware):
+        ALLOWED_PATHS = ["/ephe/", "/ephe/login", "/ephe/static", "/ephe/metrics"]
+
+        async def dispatch(self, request, call_next):
+            path = request.url.path
+            for allowed in self.ALLOWED_PATHS:
+                if path.startswith(allowed) or path == "/ephe":
+                    return await call_next(request)
+            if request.session.get("authenticated"):
+                return await call_next(request)
+            return RedirectResponse(url="/ephe/", status_code=303)
+
+    middleware = []
+    for m in app.user_middleware:
+        if m.cls is StaticShortcutMiddleware:
+            continue
+        if m.cls is main.SessionAuthMiddleware:
+            m = type(m)(LegacySessionAuthMiddleware)
+        middleware.append(m)
+    app.user_middleware[:] = middleware
+    main.static_mount.app = StaticFiles(directory=main.STATIC_DIR)
+
+
+async def _worker(client, url, headers, latencies, deadline):
+    # 요청이 이벤트 루프에 양보하지 않고 끝날 수 있으므로 Event 대신 마감 시각으로 멈춤
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        r = await client.get(url, headers=headers)
+        if r.status_code not in (200, 303):
+            raise RuntimeError(f"{url}: {r.status_code}")
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args):
+    import httpx
+
+    from app.main import AUTH_PASSWORD, AUTH_USERNAME, app
+    from app.utils.static_assets import static_url
+
+    if args.legacy:
+        _install_legacy(app)
+        hashed = "/ephe/static/js/chart_engine.js"
+    else:
+        hashed = static_url("js/chart_engine.js")
+
+    requests = {
+        "static": ("/ephe/static/js/chart_engine.js", {"accept-encoding": "identity"}),
+        "static-gzip": (hashed, {"accept-encoding": "gzip, br"}),
+        "page": ("/ephe/", {}),
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await client.post("/ephe/login", data={"username": AUTH_USERNAME, "password": AUTH_PASSWORD})
+        for case in CASES:
+            url, headers = requests[case]
+            r = await client.get(url, headers=headers)
+            encoding = r.headers.get("content-encoding", "identity")
+
+            latencies = []
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                _worker(client, url, headers, latencies, started + args.duration)
+                for _ in range(args.concurrency)
+            ))
+            elapsed = time.perf_counter() - started
+
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+            print(f"{case:<12} {len(latencies) / elapsed:8.0f} req/s  p95 {p95:6.2f} ms  "
+                  f"{r.status_code} {encoding} {r.headers.get('content-length', 0)}B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--duration", type=float, default=3.0, help="케이스별 측정 시간(초)")
+    parser.add_argument("--legacy", action="store_true", help="이전 인증 미들웨어 / 정적 파일 서빙으로 측정")
+    args = parser.parse_args()
+
+    # 실제 DB/캐시 파일을 건드리지 않도록 임시 경로 사용 (app import 전에 설정)
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'ephe.db')}"
+    os.environ["EPHE_GEOCACHE_PATH"] = os.path.join(tmp, "geocache.db")
+    os.environ["EPHE_RENDER_CACHE_PATH"] = os.path.join(tmp, "rendercache.db")
+
+    # 사전 압축본은 임시 public 사본에 만들어 작업 트리를 건드리지 않음
+    from app.utils import static_assets
+
+    public = os.path.join(tmp, "public")
+    shutil.copytree(static_assets.STATIC_DIR, public)
+    static_assets.STATIC_DIR = public
+    if not args.legacy:
+        static_assets.build_precompressed(public)
+
+    print(f"mode            : {'legacy' if args.legacy else 'asgi'}, concurrency={args.concurrency}")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
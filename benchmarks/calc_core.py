@@ -0,0 +1,351 @@
+"""
+계산 코어 벤치마크 + 기준값(baseline) 회귀 검사
+고정 입력 코퍼스(시드 고정 난수 출생 데이터)로 아래 단계를 각각 여러 번 재고,
+저장된 기준값과 Mann-Whitney U 검정으로 비교해 유의미하게 느려진 단계가 있으면 종료 코드 1 로 실패함.
+
+    create_chart      chart_service.create_chart (지오코딩은 코퍼스 좌표로 대체, 타임존 + 전체 계산)
+    planets_core      planets.calculate_planets_core
+    houses            houses.calculate_houses_and_points
+    house_number      houses.get_house_number (천체 7개 × 홀사인·포피리 커스프)
+    aspects           aspects.calculate_aspects
+    sign_format       degrees.degree_info + format_position
+    render            partials/chart_result.html 템플릿 렌더링
+
+swe 호출 캐시는 매 반복 전에 비우므로 계산 단계는 캐시되지 않은 계산 시간을 잼.
+기준값은 측정 머신에 따라 달라지므로 같은 머신(또는 같은 CI 러너)에서 저장한 것과 비교해야 함.
+
+    python -m benchmarks.calc_core --save                       # 기준값 저장
+    python -m benchmarks.calc_core                              # 기준값과 비교
+    python -m benchmarks.calc_core --cases planets_core,aspects --rounds 30
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+# 실제 캐시 파일을 건드리지 않도록 임시 경로 사용 (모듈 import 전에 설정)
+os.environ.setdefault("EPHE_GEOCACHE_PATH", os.path.join(tempfile.mkdtemp(), "geocache.db"))
+
+import swisseph as swe  # noqa: E402
+
+from app.services import chart_service, ephemeris  # noqa: E402
+from app.services.aspects import calculate_aspects  # noqa: E402
+from app.services.chart import compute_natal_chart, julian_day  # noqa: E402
+from app.services.degrees import degree_info  # noqa: E402
+from app.services.houses import calculate_houses_and_points, get_house_number  # noqa: E402
+from app.services.planets import calculate_planets_core, format_position  # noqa: E402
+from app.utils.timezone import get_timezone  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "calc_core.json")
+
+CORPUS_SEED = 20240501
+CORPUS_SIZE = 200
+
+# 기본 측정 설정
+DEFAULT_ROUNDS = 15
+DEFAULT_REPEAT = 3  # 표본 1개 = 반복 측정 중 가장 빠른 값
+DEFAULT_MIN_TIME = 0.02  # 반복 1번의 최소 측정 시간(초), 짧은 단계는 코퍼스를 여러 번 반복
+DEFAULT_ALPHA = 0.01  # 유의 수준
+DEFAULT_THRESHOLD = 0.10  # 중앙값 기준 허용 변화율 (프로세스 간 편차보다 크게)
+
+# 코퍼스 좌표 범위 (사람이 사는 위도 위주, 극지방 하우스 계산 제외)
+LAT_RANGE = (-55.0, 65.0)
+
+
+def build_corpus(size: int = CORPUS_SIZE, seed: int = CORPUS_SEED) -> List[dict]:
+    """시드 고정 출생 데이터 (1900-2050년, 임의 좌표, 타임존 포함)"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        lat = round(rng.uniform(*LAT_RANGE), 4)
+        lon = round(rng.uniform(-180.0, 180.0), 4)
+        corpus.append({
+            "name": f"bench{i}",
+            "birth_date": f"{rng.randint(1900, 2050)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "birth_time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            "place_name": f"bench-place-{i}",
+            "lat": lat,
+            "lon": lon,
+            "tz": get_timezone(lat, lon),
+        })
+    for item in corpus:
+        item["jd"] = julian_day(item["birth_date"], item["birth_time"], item["tz"])
+    return corpus
+
+
+class _Fixtures:
+    """단계별 입력 (측정 전에 한 번 계산)"""
+
+    def __init__(self, corpus: List[dict]):
+        self.corpus = corpus
+        self.charts = [
+            compute_natal_chart(c["name"], c["birth_date"], c["birth_time"], c["lat"], c["lon"], c["tz"])
+            for c in corpus
+        ]
+        self.house_queries = []
+        for chart in self.charts:
+            wsh_cusps = [h["start_long"] for h in chart["houses"]]
+            for p in chart["planets"]:
+                self.house_queries.append((p["position"], wsh_cusps))
+                self.house_queries.append((p["position"], chart["porphyry_cusps"]))
+        self.longitudes = [p["position"] for chart in self.charts for p in chart["planets"]]
+        self.coordinates = {c["place_name"]: (c["lat"], c["lon"]) for c in corpus}
+
+
+def _case_create_chart(fx: _Fixtures) -> Callable[[], int]:
+    async def stub_coordinates(place_name):
+        return fx.coordinates[place_name]
+
+    chart_service.get_coordinates_async = stub_coordinates
+
+    async def run_all():
+        for c in fx.corpus:
+            await chart_service.create_chart(c["name"], c["birth_date"], c["birth_time"], c["place_name"])
+
+    loop = asyncio.new_event_loop()
+
+    def run():
+        ephemeris.clear_cache()
+        loop.run_until_complete(run_all())
+        return len(fx.corpus)
+    return run
+
+
+def _case_planets_core(fx: _Fixtures) -> Callable[[], int]:
+    def run():
+        ephemeris.clear_cache()
+        for c in fx.corpus:
+            calculate_planets_core(c["jd"], c["lat"], c["lon"])
+        return len(fx.corpus)
+    return run
+
+
+def _case_houses(fx: _Fixtures) -> Callable[[], int]:
+    def run():
+        ephemeris.clear_cache()
+        for c in fx.corpus:
+            calculate_houses_and_points(c["jd"], c["lat"], c["lon"])
+        return len(fx.corpus)
+    return run
+
+
+def _case_house_number(fx: _Fixtures) -> Callable[[], int]:
+    def run():
+        for long, cusps in fx.house_queries:
+            get_house_number(long, cusps)
+        return len(fx.house_queries)
+    return run
+
+
+def _case_aspects(fx: _Fixtures) -> Callable[[], int]:
+    def run():
+        for chart in fx.charts:
+            calculate_aspects(chart["planets"])
+        return len(fx.charts)
+    return run
+
+
+def _case_sign_format(fx: _Fixtures) -> Callable[[], int]:
+    def run():
+        for long in fx.longitudes:
+            format_position(long, degree_info(long).symbol)
+        return len(fx.longitudes)
+    return run
+
+
+def _case_render(fx: _Fixtures) -> Callable[[], int]:
+    from app.dependencies import templates
+
+    template = templates.get_template("partials/chart_result.html")
+
+    def run():
+        for chart in fx.charts:
+            template.render(chart_data=chart, chart_svg_url="")
+        return len(fx.charts)
+    return run
+
+
+CASES: Dict[str, Callable[[_Fixtures], Callable[[], int]]] = {
+    "create_chart": _case_create_chart,
+    "planets_core": _case_planets_core,
+    "houses": _case_houses,
+    "house_number": _case_house_number,
+    "aspects": _case_aspects,
+    "sign_format": _case_sign_format,
+    "render": _case_render,
+}
+
+
+def calibrate(run: Callable[[], int], min_time: float) -> int:
+    """표본 1개가 min_time 이상 걸리도록 코퍼스 반복 횟수 결정 (첫 호출은 워밍업)"""
+    run()  # 템플릿 컴파일, 지연 import 등
+    started = time.perf_counter()
+    run()
+    once = time.perf_counter() - started
+    return max(1, math.ceil(min_time / max(once, 1e-9)))
+
+
+def sample(run: Callable[[], int], loops: int, repeat: int) -> float:
+    """1회 호출당 초 (repeat 번 중 가장 빠른 값 - 다른 프로세스 간섭 제거)"""
+    best = float("inf")
+    for _ in range(repeat):
+        ops = 0
+        started = time.perf_counter()
+        for _ in range(loops):
+            ops += run()
+        best = min(best, (time.perf_counter() - started) / ops)
+    return best
+
+
+def mann_whitney_p(a: Sequence[float], b: Sequence[float]) -> float:
+    """양측 Mann-Whitney U 검정 p 값 (정규 근사, 동순위 보정)"""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(values)
+    tie_term = 0.0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+
+    r1 = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (abs(u1 - n1 * n2 / 2) - 0.5) / sigma
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def environment() -> dict:
+    from app.services.chart_cache import calculation_version
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+        "swisseph": swe.version,
+        "calc_version": calculation_version(),
+        "corpus": {"seed": CORPUS_SEED, "size": CORPUS_SIZE},
+    }
+
+
+def run_suite(names: Sequence[str], rounds: int, repeat: int, min_time: float) -> dict:
+    fixtures = _Fixtures(build_corpus())
+    runs = {name: CASES[name](fixtures) for name in names}
+    loops = {name: calibrate(run, min_time) for name, run in runs.items()}
+
+    # 단계를 번갈아 측정해 시간에 따른 머신 상태 변화가 한 단계에 몰리지 않게 함
+    samples: Dict[str, List[float]] = {name: [] for name in names}
+    for _ in range(rounds):
+        for name, run in runs.items():
+            samples[name].append(sample(run, loops[name], repeat))
+
+    results = {}
+    for name in names:
+        results[name] = {"unit": "s/op", "loops": loops[name], "repeat": repeat,
+                         "median": statistics.median(samples[name]), "samples": samples[name]}
+        print(f"  {name:<14} {_fmt(results[name]['median']):>10}/op  (loops {loops[name]}, rounds {rounds})",
+              file=sys.stderr)
+    return {"env": environment(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "cases": results}
+
+
+def compare(current: dict, baseline: dict, alpha: float, threshold: float) -> bool:
+    """기준값 대비 변화 출력, 회귀가 없으면 True"""
+    for key in ("python", "machine", "swisseph"):
+        if current["env"].get(key) != baseline["env"].get(key):
+            print(f"warning: {key} differs from baseline ({baseline['env'].get(key)} → {current['env'].get(key)})")
+    if current["env"].get("calc_version") != baseline["env"].get("calc_version"):
+        print("note: calculation rules changed since baseline")
+
+    ok = True
+    print(f"{'case':<14} {'baseline':>10} {'current':>10} {'change':>8} {'p':>8}  result")
+    for name, cur in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            print(f"{name:<14} {'-':>10} {_fmt(cur['median']):>10} {'':>8} {'':>8}  new")
+            continue
+        change = cur["median"] / base["median"] - 1
+        p = mann_whitney_p(cur["samples"], base["samples"])
+        if p < alpha and change > threshold:
+            verdict = "REGRESSION"
+            ok = False
+        elif p < alpha and change < -threshold:
+            verdict = "faster"
+        else:
+            verdict = "same"
+        print(f"{name:<14} {_fmt(base['median']):>10} {_fmt(cur['median']):>10} {change:>+7.1%} {p:>8.4f}  {verdict}")
+    return ok
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} µs"
+
+
+def _load(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES), help="쉼표로 구분한 측정 단계")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="단계별 표본 수")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="표본 1개당 반복 측정 수 (가장 빠른 값 사용)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="반복 1번의 최소 측정 시간(초)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save", action="store_true", help="비교하지 않고 결과를 기준값으로 저장")
+    parser.add_argument("--output", help="이번 결과를 JSON 으로 저장할 경로")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="유의 수준")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 최소 중앙값 증가율")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.cases.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (choose from {', '.join(CASES)})")
+
+    current = run_suite(names, args.rounds, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1)
+        print(f"baseline saved: {args.baseline}")
+        return
+
+    baseline = _load(args.baseline)
+    if baseline is None:
+        print(f"no baseline at {args.baseline} (run with --save first)")
+        return
+    sys.exit(0 if compare(current, baseline, args.alpha, args.threshold) else 1)
+
+
+if __name__ == "__main__":
+    main()
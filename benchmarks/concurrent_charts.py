@@ -0,0 +1,101 @@
+"""
+동시 차트 생성 부하 테스트
+느린 지오코딩 1건과 캐시된 장소 N건을 동시에 요청해, 빠른 요청이 느린 요청 뒤에 줄서지 않는지 확인함.
+
+    python -m benchmarks.concurrent_charts --requests 50 --slow 2.0
+    python -m benchmarks.concurrent_charts --blocking   # 이전 방식(루프 블로킹) 재현
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# 실제 캐시 파일을 건드리지 않도록 임시 경로 사용 (모듈 import 전에 설정)
+os.environ.setdefault("EPHE_GEOCACHE_PATH", os.path.join(tempfile.mkdtemp(), "geocache.db"))
+
+from app.services import chart_service  # noqa: E402
+from app.utils.geocache import place_cache  # noqa: E402
+
+CACHED_PLACES = {
+    "Seoul": (37.5665, 126.9780),
+    "Busan": (35.1796, 129.0756),
+    "Tokyo": (35.6762, 139.6503),
+    "London": (51.5074, -0.1278),
+    "New York": (40.7128, -74.0060),
+}
+SLOW_PLACE = "Slowtown"
+
+
+class _Location:
+    def __init__(self, lat, lon):
+        self.latitude, self.longitude = lat, lon
+
+
+class _SlowGeocoder:
+    """네트워크 지연을 흉내내는 비동기 지오코더"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def geocode(self, query, **kwargs):
+        await asyncio.sleep(self.delay)
+        return _Location(37.0, 127.0)
+
+
+async def _timed(coro, submitted: float):
+    """요청 제출 시점부터 완료까지의 지연"""
+    await coro
+    return time.perf_counter() - submitted
+
+
+async def run(n_requests: int, slow_delay: float, blocking: bool):
+    for place, (lat, lon) in CACHED_PLACES.items():
+        place_cache.set("coord", place, [lat, lon])
+
+    if blocking:
+        # 이전 구현처럼 이벤트 루프 위에서 동기 네트워크 호출
+        async def blocking_coordinates(place_name):
+            if place_name == SLOW_PLACE:
+                time.sleep(slow_delay)
+                return 37.0, 127.0
+            return CACHED_PLACES[place_name]
+        chart_service.get_coordinates_async = blocking_coordinates
+    else:
+        from app.utils import geocoding
+        geocoding.get_async_geolocator()
+        geocoding._async_geolocator = _SlowGeocoder(slow_delay)
+
+    places = list(CACHED_PLACES)
+    start = time.perf_counter()
+    tasks = [_timed(chart_service.create_chart("slow", "1990-01-01", "12:00", SLOW_PLACE), start)]
+    for i in range(n_requests):
+        tasks.append(_timed(chart_service.create_chart(
+            f"user{i}", f"19{50 + i % 50:02d}-0{1 + i % 9}-1{i % 10}", f"{i % 24:02d}:{i % 60:02d}", places[i % len(places)]
+        ), start))
+
+    latencies = await asyncio.gather(*tasks)
+    total = time.perf_counter() - start
+
+    fast = sorted(latencies[1:])
+    print(f"mode            : {'blocking' if blocking else 'async'}")
+    print(f"slow geocode    : {latencies[0] * 1000:.1f} ms")
+    print(f"cached requests : {len(fast)}")
+    print(f"  p50           : {statistics.median(fast) * 1000:.1f} ms")
+    print(f"  p95           : {fast[int(len(fast) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"  max           : {fast[-1] * 1000:.1f} ms")
+    print(f"wall time       : {total * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--slow", type=float, default=2.0, help="느린 지오코딩 지연(초)")
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.slow, args.blocking))
+
+
+if __name__ == "__main__":
+    main()
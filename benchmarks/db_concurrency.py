@@ -0,0 +1,154 @@
+"""
+DB 동시성 부하 테스트
+기록 N건이 있는 임시 SQLite DB 에 차트 저장(/partials/save)을 계속 보내는 동안 기록 목록(/partials/history) 지연을 재서,
+읽기가 쓰기 뒤에 줄서지 않는지 확인함. 먼저 쓰기 없이 읽기만 잰 값과 비교함.
+
+    python -m benchmarks.db_concurrency --records 5000 --readers 20 --writers 4
+    python -m benchmarks.db_concurrency --inline-db --journal DELETE --synchronous FULL   # 이전 방식 재현
+    python -m benchmarks.db_concurrency --fsync-ms 5   # 느린 디스크 흉내
+
+--fsync-ms 는 커밋마다 디스크 동기화 지연을 흉내냄 (가상 머신·tmpfs 처럼 fsync 가 거의 공짜인 환경용).
+WAL + synchronous=NORMAL 은 커밋 때 fsync 하지 않으므로 이 조합에는 적용하지 않음.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+async def _reader(client, latencies, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        r = await client.get("/ephe/partials/history")
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def _writer(client, i, counts, stop, places):
+    n = 0
+    while not stop.is_set():
+        r = await client.post("/ephe/partials/save", data={
+            "name": f"writer{i}-{n}", "birth_date": "1990-05-05", "birth_time": f"{n % 24:02d}:30",
+            "place_name": places[n % len(places)]
+        })
+        r.raise_for_status()
+        counts[i] += 1
+        n += 1
+
+
+def _report(label: str, latencies, duration: float):
+    latencies = sorted(latencies)
+    print(f"{label}")
+    print(f"  reads         : {len(latencies)} ({len(latencies) / duration:.0f}/s)")
+    print(f"  p50           : {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"  p95           : {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"  max           : {latencies[-1] * 1000:.1f} ms")
+
+
+async def run(args):
+    import httpx
+
+    from sqlalchemy import event
+
+    from app.database import SessionLocal, engine, ensure_schema
+    from app.main import AUTH_PASSWORD, AUTH_USERNAME, app
+    from app.services.bulk import insert_records
+    from app.services.chart_service import create_chart
+    from app.services.records import fact_values, record_values
+    from app.utils.geocache import place_cache
+    from app.utils.timezone import warm_up
+
+    places = {"Seoul": (37.5665, 126.9780), "Busan": (35.1796, 129.0756), "Tokyo": (35.6762, 139.6503)}
+    for place, (lat, lon) in places.items():
+        place_cache.set("coord", place, [lat, lon])
+
+    ensure_schema()
+    warm_up(background=False)
+
+    # 기록 채우기
+    chart_data, ci = await create_chart("seed", "1990-05-05", "12:30", "Seoul")
+    db = SessionLocal()
+    try:
+        for start in range(0, args.records, 1000):
+            count = min(1000, args.records - start)
+            insert_records(
+                db,
+                [record_values(f"seed{start + i}", "Seoul", chart_data, ci) for i in range(count)],
+                [fact_values(chart_data) for _ in range(count)]
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    if args.fsync_ms and not (args.journal.upper() == "WAL" and args.synchronous.upper() == "NORMAL"):
+        @event.listens_for(engine, "commit")
+        def _slow_commit(conn):
+            time.sleep(args.fsync_ms / 1000)  # 실제 fsync 처럼 GIL 을 놓고 기다림
+
+    if args.inline_db:
+        # 이전 구현처럼 이벤트 루프 위에서 세션 작업 실행
+        from app.routers import pages, partials
+        from app.services import chart_cache
+
+        async def inline(func, *a, **k):
+            return func(*a, **k)
+        for module in (pages, partials, chart_cache):
+            module.run_db = inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await client.post("/ephe/login", data={"username": AUTH_USERNAME, "password": AUTH_PASSWORD})
+
+        # 1. 읽기만
+        stop = asyncio.Event()
+        idle = []
+        started = time.perf_counter()
+        readers = [asyncio.create_task(_reader(client, idle, stop)) for _ in range(args.readers)]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*readers)
+        _report("reads only", idle, time.perf_counter() - started)
+
+        # 2. 읽기 + 저장
+        stop = asyncio.Event()
+        busy = []
+        counts = [0] * args.writers
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(_reader(client, busy, stop)) for _ in range(args.readers)]
+        tasks += [asyncio.create_task(_writer(client, i, counts, stop, list(places))) for i in range(args.writers)]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - started
+        _report("reads during saves", busy, duration)
+        print(f"  saves         : {sum(counts)} ({sum(counts) / duration:.0f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000, help="미리 채울 기록 수")
+    parser.add_argument("--readers", type=int, default=20, help="동시 목록 조회 수")
+    parser.add_argument("--writers", type=int, default=4, help="동시 저장 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="구간별 측정 시간(초)")
+    parser.add_argument("--inline-db", action="store_true", help="세션 작업을 이벤트 루프에서 실행 (이전 방식)")
+    parser.add_argument("--journal", default="WAL", help="SQLite journal_mode")
+    parser.add_argument("--synchronous", default="NORMAL", help="SQLite synchronous")
+    parser.add_argument("--fsync-ms", type=float, default=0.0, help="커밋당 디스크 동기화 지연 흉내(ms)")
+    args = parser.parse_args()
+
+    # 실제 DB/캐시 파일을 건드리지 않도록 임시 경로 사용 (app import 전에 설정)
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'ephe.db')}"
+    os.environ["EPHE_GEOCACHE_PATH"] = os.path.join(tmp, "geocache.db")
+    os.environ["EPHE_RENDER_CACHE_PATH"] = os.path.join(tmp, "rendercache.db")
+    os.environ["EPHE_SQLITE_JOURNAL_MODE"] = args.journal
+    os.environ["EPHE_SQLITE_SYNCHRONOUS"] = args.synchronous
+    print(f"mode            : {'inline' if args.inline_db else 'db pool'}, journal={args.journal}, "
+          f"synchronous={args.synchronous}, fsync={args.fsync_ms}ms")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+기동(import) 시간 예산 검사
+새 프로세스에서 `python -X importtime -c "import app.main"` 을 여러 번 실행해 가장 빠른 누적 import 시간을 재고,
+예산을 넘거나 지연 로딩 대상(계산·지오코딩 스택)이 기동 시점에 import 되면 종료 코드 1 로 실패함.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 800 --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+TARGET = "app.main"
+
+# 첫 요청(계산, 지오코딩, 트랜짓 등)에서 불러와야 하는 모듈 - 기동 시 import 되면 실패
+LAZY_MODULES = ["numpy", "pytz", "geopy", "aiohttp", "timezonefinder", "app.services.transits",
+                "app.services.batch", "app.services.ephemeris_table"]
+
+DEFAULT_BUDGET_MS = float(os.getenv("EPHE_IMPORT_BUDGET_MS", "1200"))
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(target: str = TARGET) -> List[Tuple[str, int, int, int]]:
+    """(모듈, self µs, 누적 µs, 깊이) 목록 (import 순서)"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env=env, cwd=os.getcwd()
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def _total_us(rows) -> int:
+    return next((cum for name, _, cum, _ in rows if name == TARGET), 0)
+
+
+def check(budget_ms: float, top: int, runs: int = 3) -> bool:
+    # 디스크 캐시·CPU 경합 영향을 줄이기 위해 가장 빠른 실행 기준
+    rows = min((measure() for _ in range(max(runs, 1))), key=_total_us)
+    cumulative: Dict[str, int] = {name: cum for name, _, cum, _ in rows}
+    total_ms = _total_us(rows) / 1000
+
+    print(f"import {TARGET}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    print("top-level imports:")
+    top_level = sorted(((cum, name) for name, _, cum, depth in rows if depth == 1), reverse=True)
+    for cum, name in top_level[:top]:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+    ok = True
+    eager = [m for m in LAZY_MODULES if m in cumulative]
+    if eager:
+        ok = False
+        print(f"FAIL: imported at startup (should be lazy): {', '.join(eager)}")
+    if total_ms > budget_ms:
+        ok = False
+        print(f"FAIL: startup import time {total_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+    if ok:
+        print("OK")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="app.main 누적 import 시간 상한")
+    parser.add_argument("--top", type=int, default=10, help="출력할 상위 import 수")
+    parser.add_argument("--runs", type=int, default=3, help="측정 횟수 (가장 빠른 값 사용)")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.budget_ms, args.top, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+압축 저장 형식 회귀 테스트
+encode_chart → decode_chart 로 다시 만든 표시 필드가 compute_natal_chart + attach_metadata 결과와 같아야 함
+(저장된 모든 차트는 배치 계산 규칙으로 다시 만들어 표시하므로 두 경로가 어긋나면 화면이 바뀜)
+"""
+import json
+
+import pytest
+
+from app.services.chart import compute_natal_chart
+from app.services.chart_codec import decode_chart, decode_charts, encode_chart
+
+# (이름, 생년월일, 시각, 위도, 경도, 타임존) - 낮/밤, 남반구, 고위도, 날짜 변경선 부근 포함
+INPUTS = [
+    ("Seoul", "1990-05-01", "09:30", 37.5665, 126.9780, "Asia/Seoul"),
+    ("Seoul night", "1988-11-23", "23:45", 37.5665, 126.9780, "Asia/Seoul"),
+    ("London", "1975-01-15", "04:10", 51.5074, -0.1278, "Europe/London"),
+    ("New York", "2001-09-09", "14:00", 40.7128, -74.0060, "America/New_York"),
+    ("Sydney", "1969-07-21", "12:56", -33.8688, 151.2093, "Australia/Sydney"),
+    ("Buenos Aires", "2012-02-29", "18:20", -34.6037, -58.3816, "America/Argentina/Buenos_Aires"),
+    ("Reykjavik", "1995-06-21", "00:05", 64.1466, -21.9426, "Atlantic/Reykjavik"),
+    ("Tromso", "1983-12-21", "12:00", 69.6492, 18.9553, "Europe/Oslo"),
+    ("Auckland", "1950-03-03", "06:30", -36.8485, 174.7633, "Pacific/Auckland"),
+    ("Honolulu", "2024-10-17", "21:15", 21.3069, -157.8583, "Pacific/Honolulu"),
+]
+
+
+def _expected(name, birth_date, birth_time, lat, lon, tz_str) -> dict:
+    """저장 직전 형식 (compute_natal_chart + attach_metadata, JSON 왕복)"""
+    chart_data = compute_natal_chart(name, birth_date, birth_time, lat, lon, tz_str)
+    chart_data.update(_meta(name, birth_date, birth_time, lat, lon, tz_str))
+    return json.loads(json.dumps(chart_data, ensure_ascii=False))
+
+
+def _meta(name, birth_date, birth_time, lat, lon, tz_str) -> dict:
+    return {
+        "name": name,
+        "birth_date": birth_date,
+        "birth_time": birth_time,
+        "place_name": name,
+        "latitude": lat,
+        "longitude": lon,
+        "timezone": tz_str,
+    }
+
+
+@pytest.mark.parametrize("args", INPUTS, ids=[row[0] for row in INPUTS])
+def test_round_trip_matches_compute_natal_chart(args):
+    expected = _expected(*args)
+    decoded = decode_chart(encode_chart(expected), _meta(*args))
+    assert decoded == expected
+
+
+def test_decode_charts_matches_single_decode():
+    items = [(encode_chart(_expected(*args)), _meta(*args)) for args in INPUTS]
+    assert decode_charts(items) == [decode_chart(blob, meta) for blob, meta in items]
+
+
+def test_blob_is_fixed_size():
+    blob = encode_chart(_expected(*INPUTS[0]))
+    assert len(blob) == 132